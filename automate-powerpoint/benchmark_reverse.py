@@ -0,0 +1,76 @@
+"""
+Benchmark: python-pptx extraction vs streaming zip/iterparse extraction
+1. Checks both paths return identical records for every deck in the folder
+2. Builds a corpus of N copies of those decks in a temp folder
+3. Times python-pptx (sequential), streaming (sequential) and bulk streaming (process pool)
+
+Usage:
+    python benchmark_reverse.py --copies 200 --workers 4
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from reverse import bulk_extract, extract_slide_texts, extract_slide_texts_fast, find_decks
+
+def check_equivalence(decks):
+    mismatches = [deck for deck in decks if extract_slide_texts(deck) != extract_slide_texts_fast(deck)]
+    for deck in mismatches:
+        print(f"❌ Output differs for {deck}")
+    return not mismatches
+
+def time_sequential(extract, decks):
+    start = time.perf_counter()
+    slides = sum(len(extract(deck)) for deck in decks)
+    return time.perf_counter() - start, slides
+
+def run_benchmark(source_dir=".", copies=100, workers=None):
+    decks = find_decks([source_dir])
+    if not decks:
+        raise SystemExit(f"No .pptx files in {source_dir}")
+
+    print(f"🔍 Checking output equivalence on {len(decks)} decks...")
+    identical = check_equivalence(decks)
+    print("✅ Identical output" if identical else "⚠️ Outputs differ (see above)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(copies):
+            for deck in decks:
+                shutil.copyfile(deck, Path(tmp) / f"{deck.stem}_{i}.pptx")
+        corpus = find_decks([tmp])
+        print(f"📦 Corpus: {len(corpus)} decks")
+
+        pptx_s, slides = time_sequential(extract_slide_texts, corpus)
+        fast_s, _ = time_sequential(extract_slide_texts_fast, corpus)
+        bulk = bulk_extract([tmp], Path(tmp) / "slides.jsonl", workers=workers)
+
+    results = {
+        "decks": len(corpus),
+        "slides": slides,
+        "identical_output": identical,
+        "python_pptx_decks_per_sec": round(len(corpus) / pptx_s, 1),
+        "streaming_decks_per_sec": round(len(corpus) / fast_s, 1),
+        "bulk_decks_per_sec": bulk["files_per_sec"],
+        "workers": workers,
+    }
+    print(f"\n{'path':<28}{'seconds':>10}{'decks/s':>10}{'speedup':>10}")
+    for name, seconds in (("python-pptx", pptx_s), ("streaming", fast_s), ("streaming + process pool", bulk["seconds"])):
+        print(f"{name:<28}{seconds:>10.2f}{len(corpus) / seconds:>10.1f}{pptx_s / seconds:>9.1f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare python-pptx and streaming slide text extraction")
+    parser.add_argument("--source", default=".", help="folder with sample decks")
+    parser.add_argument("--copies", type=int, default=100)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--output", default="reverse_benchmark.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.source, args.copies, args.workers)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results: {args.output}")
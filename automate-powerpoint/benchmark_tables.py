@@ -0,0 +1,112 @@
+"""
+Benchmark: cell-by-cell table filling (notebook) vs the bulk table writer
+1. Builds a mixed-type DataFrame (ints, floats, text, dates, nullable Int64/boolean/Float64, missing values)
+2. Times the notebook loop: table.cell(r, c).text = str(df.iloc[r, c])
+3. Times table_writer (one table, then paginated across slides)
+4. Checks that every cell reads back with the same text
+
+Usage:
+    python benchmark_tables.py --rows 1000 --cols 12
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+from pptx import Presentation
+from pptx.util import Inches
+
+from table_writer import add_dataframe_table, add_table_slides
+
+def sample_frame(rows, cols, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for c in range(cols):
+        kind = c % 7
+        if kind == 0:
+            data[f"INT_{c}"] = rng.integers(0, 100000, rows)
+        elif kind == 1:
+            values = rng.normal(1000, 250, rows).round(2)
+            values[rng.random(rows) < 0.05] = np.nan
+            data[f"FLOAT_{c}"] = values
+        elif kind == 2:
+            data[f"TEXT_{c}"] = rng.choice(["MON", "TUE", "WED", "R&D <pilot>", "Ops", "line\rbreak"], rows)
+        elif kind == 3:
+            data[f"DATE_{c}"] = pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 365, rows), unit="D")
+        else:
+            # pandas nullable extension dtypes with <NA>
+            dtype = ["Int64", "boolean", "Float64"][kind - 4]
+            values = pd.array(rng.integers(0, 2 if dtype == "boolean" else 100000, rows), dtype="Int64").astype(dtype)
+            values[rng.random(rows) < 0.05] = pd.NA
+            data[f"{dtype.upper()}_{c}"] = values
+    return pd.DataFrame(data)
+
+def fill_cell_by_cell(prs, df):
+    """Notebook raw-data slide code"""
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    rows, cols = df.shape
+    table = slide.shapes.add_table(rows + 1, cols, Inches(1), Inches(1.5), Inches(8), Inches(5)).table
+    for col_idx, col_name in enumerate(df.columns):
+        table.cell(0, col_idx).text = str(col_name)
+    for row_idx in range(rows):
+        for col_idx in range(cols):
+            table.cell(row_idx + 1, col_idx).text = str(df.iloc[row_idx, col_idx])
+    return table
+
+def table_texts(table):
+    return [[cell.text for cell in row.cells] for row in table.rows]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def run_benchmark(rows=1000, cols=12):
+    df = sample_frame(rows, cols)
+    cells = rows * cols
+    print(f"📊 {rows} rows x {cols} cols = {cells:,} cells")
+
+    loop_s, loop_table = timed(fill_cell_by_cell, Presentation(), df)
+
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    bulk_s, frame = timed(add_dataframe_table, slide.shapes, df, Inches(1), Inches(1.5), Inches(8))
+
+    prs = Presentation()
+    paged_s, slides = timed(add_table_slides, prs, df, "Raw Data")
+
+    identical = table_texts(loop_table) == table_texts(frame.table)
+    paged_rows = sum(len(s.shapes[-1].table.rows) - 1 for s in slides)
+    print("✅ Identical cell text" if identical else "❌ Cell text differs")
+
+    results = {
+        "rows": rows,
+        "cols": cols,
+        "cells": cells,
+        "identical_text": identical,
+        "cell_by_cell_s": round(loop_s, 3),
+        "bulk_s": round(bulk_s, 3),
+        "bulk_paginated_s": round(paged_s, 3),
+        "slides": len(slides),
+        "paginated_rows": paged_rows,
+        "speedup": round(loop_s / bulk_s, 1),
+    }
+    print(f"\n{'path':<26}{'seconds':>10}{'cells/s':>12}")
+    for name, seconds in (("cell by cell (notebook)", loop_s), ("bulk writer", bulk_s), ("bulk + pagination", paged_s)):
+        print(f"{name:<26}{seconds:>10.3f}{cells / seconds:>12,.0f}")
+    print(f"⚡ {results['speedup']}x faster, {len(slides)} slides when paginated")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare cell-by-cell and bulk PPTX table writing")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--output", default="table_benchmark.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.rows, args.cols)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results: {args.output}")
@@ -0,0 +1,323 @@
+"""
+In-memory chart pipeline for PPTX slides
+- Figures are rendered straight to PNG bytes (BytesIO): no temp files, no add_picture from disk
+- Figures come from a pool of Agg figures (no pyplot registry), cleared and reused after each chart
+- Optional cache of PNG bytes by data hash (in memory, or mirrored to a folder across runs)
+
+Usage:
+    from chart_pipeline import ChartPipeline, add_chart
+
+    def draw_workload(fig, ax, df):
+        df.plot.bar(x='DAY', y=['ORDERS', 'LINES'], ax=ax)
+
+    pipeline = ChartPipeline(dpi=100)
+    png = pipeline.render(draw_workload, df_plot, size=(12, 6))
+    add_chart(slide, png, Inches(0.75), Inches(1.25), height=Inches(4.5))
+
+Memory check (pyplot figures never closed vs this pipeline):
+    python chart_pipeline.py --charts 300
+"""
+
+import argparse
+import hashlib
+import os
+import time
+import types
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# ==================== PNG BYTES ====================
+
+def figure_png(fig, dpi=None):
+    """Render a figure to PNG bytes in memory"""
+    buffer = BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi or fig.dpi)
+    return buffer.getvalue()
+
+def pyplot_png(fig, dpi=None):
+    """PNG bytes for a figure created with plt.subplots(), closing it so memory is released"""
+    import matplotlib.pyplot as plt
+
+    try:
+        return figure_png(fig, dpi)
+    finally:
+        plt.close(fig)
+
+def add_chart(slide, png, left, top, width=None, height=None):
+    """slide.shapes.add_picture() from PNG bytes"""
+    return slide.shapes.add_picture(BytesIO(png), left, top, width=width, height=height)
+
+# ==================== FIGURE POOL ====================
+
+SUBPLOT_PARAMS = ("left", "right", "top", "bottom", "wspace", "hspace")
+
+class FigurePool:
+    """
+    Reusable Agg figures keyed by (size, nrows, ncols).
+    Figures are not registered with pyplot, so nothing leaks when a caller forgets plt.close().
+    """
+
+    def __init__(self, max_per_shape=2):
+        self.max_per_shape = max_per_shape
+        self._free = {}
+        self.created = 0
+        self.reused = 0
+
+    def _new(self, size, nrows, ncols):
+        fig = Figure(figsize=size)
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows, ncols, squeeze=(nrows == ncols == 1))
+        fig.pool_subplotpars = {k: getattr(fig.subplotpars, k) for k in SUBPLOT_PARAMS}
+        self.created += 1
+        return fig, axes
+
+    @staticmethod
+    def _reset(fig, axes):
+        """Back to blank subplots: drop extra axes (twins, colorbars) and figure-level artists"""
+        owned = set(np.ravel(axes))
+        for ax in fig.axes:
+            if ax in owned:
+                ax.clear()
+            else:
+                ax.remove()
+        fig.legends.clear()
+        fig.texts.clear()
+        if fig.get_suptitle():
+            fig.suptitle("")
+        fig.subplots_adjust(**fig.pool_subplotpars)
+
+    @contextmanager
+    def figure(self, size=(9, 5), nrows=1, ncols=1):
+        """Yields (fig, axes); axes is one Axes for 1x1, otherwise a 2D array"""
+        key = (tuple(size), nrows, ncols)
+        free = self._free.setdefault(key, [])
+        if free:
+            fig, axes = free.pop()
+            self.reused += 1
+        else:
+            fig, axes = self._new(*key)
+        try:
+            yield fig, axes
+        finally:
+            self._reset(fig, axes)
+            if len(free) < self.max_per_shape:
+                free.append((fig, axes))
+            else:
+                fig.clear()
+
+# ==================== CACHE ====================
+
+def _global_names(code):
+    """Names a code object (and the functions/lambdas nested in it) looks up"""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+def _update_hash(h, obj, seen=()):
+    if isinstance(obj, pd.DataFrame):
+        h.update(b"df" + repr((list(obj.columns), obj.index.name)).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        h.update(b"s" + repr(obj.name).encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"nd{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        h.update(f"{{{len(obj)}".encode())
+        for key, value in obj.items():
+            _update_hash(h, key, seen)
+            _update_hash(h, value, seen)
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"[{len(obj)}".encode())
+        for value in obj:
+            _update_hash(h, value, seen)
+    elif isinstance(obj, types.CodeType):
+        h.update(obj.co_code)
+        for const in obj.co_consts:
+            _update_hash(h, const, seen)
+    elif callable(obj):
+        # Function identity + bytecode, so editing a draw function invalidates its charts
+        h.update(f"{obj.__module__}.{obj.__qualname__}".encode())
+        if hasattr(obj, "__code__") and id(obj) not in seen:
+            seen = (*seen, id(obj))
+            _update_hash(h, obj.__code__, seen)
+            # ...and the module-level values it reads (TREND_DAYS, COLS_IN), so editing those does too
+            namespace = getattr(obj, "__globals__", {})
+            for name in sorted(_global_names(obj.__code__)):
+                value = namespace.get(name)
+                if name in namespace and not isinstance(value, types.ModuleType) and not callable(value):
+                    h.update(f"g{name}".encode())
+                    _update_hash(h, value, seen)
+    else:
+        h.update(repr(obj).encode())
+
+def data_hash(*parts):
+    """Stable SHA-256 of DataFrames, arrays, dicts/lists and draw functions"""
+    h = hashlib.sha256()
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+class ChartCache:
+    """PNG bytes by data hash: LRU in memory, optionally mirrored to <directory>/<hash>.png"""
+
+    def __init__(self, directory=None, max_items=256):
+        self.directory = Path(directory) if directory else None
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key):
+        png = self._items.get(key)
+        if png is not None:
+            self._items.move_to_end(key)
+        elif self.directory and (self.directory / f"{key}.png").exists():
+            png = (self.directory / f"{key}.png").read_bytes()
+            self._remember(key, png)
+        if png is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return png
+
+    def put(self, key, png):
+        self._remember(key, png)
+        if self.directory:
+            tmp = self.directory / f"{key}.png.tmp"
+            tmp.write_bytes(png)
+            os.replace(tmp, self.directory / f"{key}.png")
+
+    def _remember(self, key, png):
+        self._items[key] = png
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+# ==================== PIPELINE ====================
+
+class ChartPipeline:
+    """
+    render(draw, *args) -> PNG bytes, where draw(fig, axes, *args, **kwargs) plots onto pooled axes.
+    With a cache, charts whose draw function and data are unchanged are not drawn again.
+    """
+
+    def __init__(self, dpi=150, cache=None, pool=None):
+        self.dpi = dpi
+        self.cache = cache
+        self.pool = pool or FigurePool()
+        self.rendered = 0
+
+    def chart_key(self, draw, *args, size=(9, 5), nrows=1, ncols=1, dpi=None, **kwargs):
+        return data_hash(draw, tuple(size), nrows, ncols, dpi or self.dpi, args, kwargs)
+
+    def render(self, draw, *args, size=(9, 5), nrows=1, ncols=1, dpi=None, **kwargs):
+        dpi = dpi or self.dpi
+        key = None
+        if self.cache is not None:
+            key = self.chart_key(draw, *args, size=size, nrows=nrows, ncols=ncols, dpi=dpi, **kwargs)
+            png = self.cache.get(key)
+            if png is not None:
+                return png
+
+        with self.pool.figure(size, nrows, ncols) as (fig, axes):
+            draw(fig, axes, *args, **kwargs)
+            png = figure_png(fig, dpi)
+        self.rendered += 1
+
+        if key is not None:
+            self.cache.put(key, png)
+        return png
+
+    def stats(self):
+        stats = {"rendered": self.rendered, "figures_created": self.pool.created, "figures_reused": self.pool.reused}
+        if self.cache is not None:
+            stats.update(cache_hits=self.cache.hits, cache_misses=self.cache.misses)
+        return stats
+
+# ==================== MEMORY CHECK ====================
+
+def _rss_mb():
+    """Resident memory in MB (psutil when installed, else /proc or resource)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1048576
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _draw_demo(fig, ax, df):
+    df.plot.bar(x="DAY", y=["ORDERS", "LINES"], color=["tab:blue", "tab:orange"], edgecolor="black", ax=ax)
+    ax.set_xlabel("DAY", fontsize=12)
+    ax.set_title("Workload per day (Lines/day)", fontsize=12)
+
+def run_memory_check(charts=300):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    rng = np.random.default_rng(0)
+    frames = [
+        pd.DataFrame({"DAY": ["MON", "TUE", "WED", "THU", "FRI"],
+                      "ORDERS": rng.integers(100, 500, 5), "LINES": rng.integers(500, 2000, 5)})
+        for _ in range(charts)
+    ]
+    results = {}
+
+    pipeline = ChartPipeline(dpi=100)
+    start, rss = time.perf_counter(), _rss_mb()
+    for df in frames:
+        pipeline.render(_draw_demo, df, size=(12, 6))
+    results["pipeline"] = {"seconds": time.perf_counter() - start, "rss_growth_mb": _rss_mb() - rss,
+                           **pipeline.stats()}
+
+    # Notebook pattern: plt.subplots() + savefig to disk, figure never closed
+    start, rss = time.perf_counter(), _rss_mb()
+    with plt.rc_context({"figure.max_open_warning": 0}):
+        for df in frames:
+            fig, ax = plt.subplots(figsize=(12, 6))
+            _draw_demo(fig, ax, df)
+            fig.savefig("_chart_check.png", dpi=fig.dpi)
+    results["savefig_unclosed"] = {"seconds": time.perf_counter() - start, "rss_growth_mb": _rss_mb() - rss}
+    plt.close("all")
+    os.remove("_chart_check.png")
+
+    cached = ChartPipeline(dpi=100, cache=ChartCache())
+    for df in frames[:10]:
+        cached.render(_draw_demo, df, size=(12, 6))
+    start = time.perf_counter()
+    for df in frames[:10]:
+        cached.render(_draw_demo, df, size=(12, 6))
+    results["cache_hit_ms"] = (time.perf_counter() - start) * 100
+
+    for name in ("pipeline", "savefig_unclosed"):
+        r = results[name]
+        print(f"{name:<18} {charts} charts in {r['seconds']:.1f}s, RSS +{r['rss_growth_mb']:.0f} MB")
+    print(f"cache hit          {results['cache_hit_ms']:.2f} ms per chart")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare savefig-to-disk charts with the in-memory pipeline")
+    parser.add_argument("--charts", type=int, default=300)
+    args = parser.parse_args()
+    run_memory_check(args.charts)
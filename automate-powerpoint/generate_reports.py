@@ -0,0 +1,450 @@
+"""
+Batch PowerPoint report generator for the data quality stats
+Builds the decks from the notebook (summary slide from content.json, one
+chart slide per category, burndown slide) for every day in
+stats_breakdown/*_stats.json and/or for every owner.
+
+- The template deck is read once; each worker opens it from memory
+- Charts are rendered in a process pool straight to PNG bytes (no files)
+- Decks are assembled in the same pool, many in parallel
+
+Usage:
+    python generate_reports.py --by day                    # one deck per stats day
+    python generate_reports.py --by owner --workers 4      # one deck per person
+    python generate_reports.py --by both --template sample_no_text.pptx
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pptx import Presentation
+from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.util import Inches, Pt
+
+from chart_pipeline import ChartCache, ChartPipeline, add_chart
+
+DARK_BLUE = RGBColor(0, 32, 96)
+WHITE = RGBColor(255, 255, 255)
+LINK_BLUE = RGBColor(135, 206, 250)
+HEADER_COLOR = RGBColor(155, 194, 230)
+TOTAL_COLOR = RGBColor(217, 217, 217)
+
+REPORT_TITLE = "Application Product Owner Not Active"
+TREND_DAYS = 5
+
+# ==================== DATA ====================
+
+def load_stats(stats_dir="stats_breakdown"):
+    """{YYYYMMDD: {category: {person: count}}} sorted by date"""
+    data_by_date = {}
+    for file in glob.glob(os.path.join(stats_dir, "*_stats.json")):
+        date = os.path.basename(file).split("_")[0]
+        with open(file, encoding="utf-8") as f:
+            data_by_date[date] = json.load(f)
+    return dict(sorted(data_by_date.items()))
+
+def load_content(path="content.json"):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def categories_and_people(stats):
+    categories, people = set(), set()
+    for date_data in stats.values():
+        for category, people_data in date_data.items():
+            categories.add(category)
+            people.update(people_data)
+    return sorted(categories), sorted(people)
+
+def category_series(stats, category, dates, people):
+    """{person: [count per date]} for one category (missing -> 0)"""
+    return {
+        person: [stats[date].get(category, {}).get(person, 0) for date in dates]
+        for person in people
+    }
+
+def with_totals(df):
+    """Add the 'Grand Total' row and column used by the notebook tables"""
+    df = df.copy()
+    df["Grand Total"] = df.sum(axis=1)
+    df.loc["Grand Total"] = df.sum(axis=0)
+    return df.astype(int)
+
+def slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_")
+
+# ==================== CHARTS (chart_pipeline) ====================
+
+def draw_category_chart(fig, ax, dates, series):
+    """Stacked bars per person by date plus the projected overall trend"""
+    labels = [f"{d[4:6]}-{d[6:]}" for d in dates]
+    x = np.arange(len(dates))
+    bottom = np.zeros(len(dates))
+    for person, values in series.items():
+        ax.bar(x, values, bottom=bottom, label=person, width=0.6)
+        bottom += values
+
+    # Overall trend for the next days (linear fit on the totals)
+    if len(dates) >= 2:
+        slope = np.polyfit(x, bottom, 1)[0]
+        trend_x = np.arange(len(dates) - 1, len(dates) + TREND_DAYS)
+        trend = bottom[-1] + slope * (trend_x - trend_x[0])
+        ax.plot(trend_x, np.maximum(trend, 0), "k--", linewidth=1.5, label="Projected Trend")
+    for xi, total in zip(x, bottom):
+        ax.text(xi, total, f"{int(total)}", ha="center", va="bottom", fontsize=7)
+
+    step = max(1, len(dates) // 15)  # a month of daily bars stays readable
+    ax.set_xticks(x[::step])
+    ax.set_xticklabels(labels[::step], rotation=45)
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Count")
+    ax.grid(axis="y", alpha=0.3)
+    ax.set_ylim(0, max(bottom.max(), 1) * 1.2)  # headroom for the legend row
+    ax.legend(loc="upper left", ncol=len(series) + 1, fontsize=8, frameon=False)
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.96, bottom=0.18)  # fixed margins: tight_layout costs an extra draw
+
+def burndown_grid(n_categories):
+    ncols = 2 if n_categories > 1 else 1
+    return -(-n_categories // ncols), ncols
+
+def draw_burndown_chart(fig, axes, dates, series_by_category):
+    """One figure with a stackplot per category (one draw/encode instead of one per category)"""
+    axes = np.atleast_2d(axes)
+    x = np.arange(len(dates))
+    labels = [f"{d[4:6]}-{d[6:]}" for d in dates]
+    step = max(1, len(dates) // 8)
+    for ax, (category, series) in zip(axes.flat, series_by_category.items()):
+        ax.stackplot(x, *series.values(), labels=list(series))
+        ax.set_xticks(x[::step])
+        ax.set_xticklabels(labels[::step], fontsize=6)
+        ax.tick_params(axis="y", labelsize=6)
+        ax.set_title(f"Burndown for {category[:40]}", fontsize=8, fontweight="bold")
+        ax.grid(True, alpha=0.2)
+    for ax in axes.flat[len(series_by_category):]:
+        ax.axis("off")
+    handles, names = axes.flat[0].get_legend_handles_labels()
+    fig.legend(handles, names, loc="lower center", ncol=len(names), fontsize=7, frameon=False)
+    fig.subplots_adjust(left=0.06, right=0.98, top=0.94, bottom=0.12, hspace=0.45, wspace=0.15)
+
+CHART_DRAWERS = {
+    "category": draw_category_chart,
+    "burndown": draw_burndown_chart,
+}
+
+def _render_chart(item):
+    """Worker: (key, (kind, kwargs)) -> (key, png bytes) using the worker's figure pool"""
+    key, (kind, kwargs) = item
+    return key, _PIPELINE.render(CHART_DRAWERS[kind], **kwargs)
+
+# ==================== SLIDES ====================
+
+def add_summary_slide(prs, run_date, content, table_df, table_label):
+    """Title, run date, objective box from content.json and the totals table (notebook layout)"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shapes = slide.shapes
+
+    title_box = shapes.add_textbox(Inches(0.5), Inches(0.2), Inches(9), Inches(1))
+    title = title_box.text_frame.paragraphs[0]
+    title.text = REPORT_TITLE
+    title.font.bold = True
+    title.font.size = Pt(20)
+    title.font.color.rgb = WHITE
+    title.alignment = PP_ALIGN.CENTER
+    title_box.fill.solid()
+    title_box.fill.fore_color.rgb = DARK_BLUE
+
+    run_date_box = shapes.add_textbox(Inches(7.5), Inches(0.3), Inches(2), Inches(0.5))
+    run_date_paragraph = run_date_box.text_frame.paragraphs[0]
+    run_date_paragraph.text = f"Run Date: {run_date}"
+    run_date_paragraph.font.size = Pt(12)
+    run_date_paragraph.font.color.rgb = WHITE
+
+    objective_box = shapes.add_textbox(Inches(0.5), Inches(1.1), Inches(9), Inches(1.5))
+    objective_box.fill.solid()
+    objective_box.fill.fore_color.rgb = RGBColor(20, 32, 96)
+    frame = objective_box.text_frame
+    frame.word_wrap = True
+    frame.vertical_anchor = MSO_ANCHOR.TOP
+    frame.clear()
+    first = True
+    for section in content["sections"]:
+        p_header = frame.paragraphs[0] if first else frame.add_paragraph()
+        first = False
+        p_header.text = section["header"]
+        p_header.font.bold = True
+        p_header.font.color.rgb = WHITE
+        p_header.font.size = Pt(section["header_font_size"])
+
+        p_content = frame.add_paragraph()
+        p_content.text = section["content"]
+        p_content.font.color.rgb = WHITE
+        if "hyperlink" in section:
+            run = p_content.add_run()
+            run.text = section["hyperlink"]["text"]
+            run.hyperlink.address = section["hyperlink"]["url"]
+            run.font.color.rgb = LINK_BLUE
+            run.font.underline = True
+            run = p_content.add_run()
+            run.text = section.get("content_suffix", "")
+            run.font.color.rgb = WHITE
+        p_content.font.size = Pt(section["content_font_size"])
+
+    add_totals_table(shapes, table_df, table_label, Inches(0.5), Inches(3), Inches(9), Inches(3))
+    return slide
+
+def add_totals_table(shapes, df, column_label, left, top, width, height):
+    """Pivot table with a spanning column label, headers and 'Grand Total' shading"""
+    rows, cols = df.shape
+    table = shapes.add_table(rows + 2, cols + 1, left, top, width, height).table
+
+    corner = table.cell(0, 0)
+    corner.text = df.index.name or ""
+    corner.merge(table.cell(1, 0))
+    corner.fill.solid()
+    corner.fill.fore_color.rgb = HEADER_COLOR
+
+    label = table.cell(0, 1)
+    label.text = column_label
+    label.merge(table.cell(0, cols))
+    label.fill.solid()
+    label.fill.fore_color.rgb = HEADER_COLOR
+    label.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+
+    for c, name in enumerate(df.columns, 1):
+        cell = table.cell(1, c)
+        cell.text = str(name)
+        cell.fill.solid()
+        cell.fill.fore_color.rgb = TOTAL_COLOR if name == "Grand Total" else HEADER_COLOR
+
+    values = df.to_numpy()
+    for r, name in enumerate(df.index):
+        cell = table.cell(r + 2, 0)
+        cell.text = str(name)
+        for c in range(cols):
+            cell = table.cell(r + 2, c + 1)
+            cell.text = str(values[r, c])
+            if c == cols - 1 or name == "Grand Total":
+                cell.fill.solid()
+                cell.fill.fore_color.rgb = TOTAL_COLOR
+
+    for row in table.rows:
+        for cell in row.cells:
+            cell.text_frame.paragraphs[0].font.size = Pt(10)
+    return table
+
+def add_chart_slide(prs, title_text, png):
+    """Grey banner + 'Data Quality - <category>' title + chart (notebook cell layout)"""
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    banner = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(0), Inches(0), prs.slide_width, Inches(0.8))
+    banner.fill.solid()
+    banner.fill.fore_color.rgb = RGBColor(230, 230, 230)
+    banner.line.fill.background()
+
+    title = slide.shapes.add_textbox(Inches(0.2), Inches(0.2), Inches(9), Inches(0.5))
+    paragraph = title.text_frame.paragraphs[0]
+    paragraph.text = title_text
+    paragraph.font.size = Pt(20)
+    paragraph.font.bold = True
+    paragraph.font.color.rgb = RGBColor(0, 0, 0)
+
+    add_chart(slide, png, Inches(0.5), Inches(1.2), width=Inches(9), height=Inches(5))
+    return slide
+
+def add_burndown_slide(prs, png):
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Burndown by Category"
+    add_chart(slide, png, Inches(0.5), Inches(1.6), width=Inches(9), height=Inches(5))
+    return slide
+
+# ==================== DECKS ====================
+
+_TEMPLATE = None
+_PIPELINE = None
+
+def _init_worker(template_bytes):
+    """Pool initializer: keep the template bytes and a figure pool in each worker"""
+    global _TEMPLATE, _PIPELINE
+    _TEMPLATE = template_bytes
+    _PIPELINE = ChartPipeline()
+
+def read_template(template_path=None):
+    """Template deck as bytes (python-pptx default template when no path is given)"""
+    if template_path:
+        return Path(template_path).read_bytes()
+    buffer = BytesIO()
+    Presentation().save(buffer)
+    return buffer.getvalue()
+
+def build_deck(spec, charts):
+    """Assemble one deck from its spec and the rendered chart bytes; returns the output path"""
+    prs = Presentation(BytesIO(_TEMPLATE))
+    table_df = pd.DataFrame(spec["table"]["data"], index=spec["table"]["index"], columns=spec["table"]["columns"])
+    table_df.index.name = spec["table"]["index_name"]
+    add_summary_slide(prs, spec["run_date"], spec["content"], table_df, spec["table"]["label"])
+    for category, key in spec["category_charts"]:
+        add_chart_slide(prs, f"Data Quality - {category}", charts[key])
+    if spec["burndown_chart"]:
+        add_burndown_slide(prs, charts[spec["burndown_chart"]])
+    prs.save(spec["output"])
+    return spec["output"]
+
+def _build_deck(item):
+    spec, charts = item
+    return build_deck(spec, charts)
+
+def deck_chart_keys(spec):
+    keys = [key for _, key in spec["category_charts"]]
+    return keys + [spec["burndown_chart"]] if spec["burndown_chart"] else keys
+
+def _table_spec(df, label):
+    return {
+        "data": df.to_numpy().tolist(),
+        "index": list(df.index),
+        "columns": list(df.columns),
+        "index_name": df.index.name,
+        "label": label,
+    }
+
+def plan_reports(stats, content, by="day", output_dir="reports", dpi=150):
+    """
+    Deck specs plus the unique chart jobs they need ({key: (kind, kwargs)}).
+    Daily decks show history up to that day; owner decks show one person over all days.
+    """
+    categories, people = categories_and_people(stats)
+    all_dates = list(stats)
+    charts, specs = {}, []
+
+    def chart(kind, key, **kwargs):
+        charts.setdefault(key, (kind, {**kwargs, "dpi": dpi}))
+        return key
+
+    if by in ("day", "both"):
+        Path(output_dir, "daily").mkdir(parents=True, exist_ok=True)
+        for i, date in enumerate(all_dates):
+            dates = all_dates[:i + 1]
+            day = pd.DataFrame(stats[date]).T.reindex(index=categories, columns=people).fillna(0)
+            day.index.name = "Category"
+            specs.append({
+                "output": str(Path(output_dir, "daily", f"report_{date}.pptx")),
+                "run_date": datetime.strptime(date, "%Y%m%d").strftime("%d-%m-%Y"),
+                "content": content,
+                "table": _table_spec(with_totals(day), "Owner"),
+                "category_charts": [
+                    (c, chart("category", ("category", c, date), dates=dates,
+                              series=category_series(stats, c, dates, people)))
+                    for c in categories
+                ],
+                "burndown_chart": chart(
+                    "burndown", ("burndown", date), dates=dates,
+                    series_by_category={c: category_series(stats, c, dates, people) for c in categories},
+                    **dict(zip(("nrows", "ncols"), burndown_grid(len(categories))))
+                ),
+            })
+
+    if by in ("owner", "both"):
+        Path(output_dir, "owners").mkdir(parents=True, exist_ok=True)
+        recent = all_dates[-7:]
+        for person in people:
+            owner = pd.DataFrame(
+                [[stats[d].get(c, {}).get(person, 0) for d in recent] for c in categories],
+                index=categories, columns=[f"{d[6:]}/{d[4:6]}" for d in recent]
+            )
+            owner.index.name = "Category"
+            specs.append({
+                "output": str(Path(output_dir, "owners", f"report_{slug(person)}.pptx")),
+                "run_date": datetime.strptime(all_dates[-1], "%Y%m%d").strftime("%d-%m-%Y"),
+                "content": content,
+                "table": _table_spec(with_totals(owner), f"{person} - last {len(recent)} days"),
+                "category_charts": [
+                    (c, chart("category", ("owner", c, person), dates=all_dates,
+                              series=category_series(stats, c, all_dates, [person])))
+                    for c in categories
+                ],
+                "burndown_chart": None,
+            })
+    return specs, charts
+
+def generate_reports(
+    stats_dir="stats_breakdown",
+    content_path="content.json",
+    template_path=None,
+    output_dir="reports",
+    by="day",
+    workers=None,
+    dpi=150,
+    chart_cache=None
+):
+    """
+    Render all charts, then all decks, in one process pool. Returns a stats dict.
+    chart_cache: folder of PNGs keyed by data hash; charts whose data did not change are not redrawn.
+    """
+    start = time.perf_counter()
+    stats = load_stats(stats_dir)
+    if not stats:
+        raise SystemExit(f"No *_stats.json files in {stats_dir}")
+    specs, chart_jobs = plan_reports(stats, load_content(content_path), by, output_dir, dpi)
+    template = read_template(template_path)
+    workers = workers or os.cpu_count() or 1
+    print(f"Planning: {len(specs)} decks, {len(chart_jobs)} charts, {workers} workers")
+
+    cache = ChartCache(chart_cache, max_items=len(chart_jobs)) if chart_cache else None
+    charts, hashes = {}, {}
+    if cache:
+        keys = ChartPipeline(dpi=dpi)
+        for key, (kind, kwargs) in chart_jobs.items():
+            hashes[key] = keys.chart_key(CHART_DRAWERS[kind], **kwargs)
+            png = cache.get(hashes[key])
+            if png is not None:
+                charts[key] = png
+    to_render = [(key, job) for key, job in chart_jobs.items() if key not in charts]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template,)) as pool:
+        chart_start = time.perf_counter()
+        for key, png in pool.map(_render_chart, to_render, chunksize=max(1, len(to_render) // (workers * 4))):
+            charts[key] = png
+            if cache:
+                cache.put(hashes[key], png)
+        chart_seconds = time.perf_counter() - chart_start
+
+        jobs = [(spec, {key: charts[key] for key in deck_chart_keys(spec)}) for spec in specs]
+        outputs = list(pool.map(_build_deck, jobs))
+
+    elapsed = time.perf_counter() - start
+    return {
+        "decks": len(outputs),
+        "charts": len(charts),
+        "rendered": len(to_render),
+        "chart_seconds": round(chart_seconds, 2),
+        "seconds": round(elapsed, 2),
+        "outputs": outputs,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate data quality decks per day and/or per owner")
+    parser.add_argument("--stats-dir", default="stats_breakdown")
+    parser.add_argument("--content", default="content.json")
+    parser.add_argument("--template", help="template .pptx (default: python-pptx blank template)")
+    parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--by", choices=["day", "owner", "both"], default="day")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--dpi", type=int, default=150, help="chart resolution (slides are ~9in wide)")
+    parser.add_argument("--chart-cache", help="folder of cached chart PNGs (by data hash), reused across runs")
+    args = parser.parse_args()
+
+    result = generate_reports(
+        args.stats_dir, args.content, args.template, args.output_dir,
+        by=args.by, workers=args.workers, dpi=args.dpi, chart_cache=args.chart_cache
+    )
+    print(f"Generated {result['decks']} decks with {result['charts']} charts ({result['rendered']} rendered) "
+          f"in {result['seconds']}s (charts {result['chart_seconds']}s) -> {args.output_dir}/")
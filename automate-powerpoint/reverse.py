@@ -1,5 +1,24 @@
 from pptx import Presentation
+import argparse
+import hashlib
 import json
+import os
+import posixpath
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.etree.ElementTree import iterparse, parse
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+A = "{%s}" % NS["a"]
+P = "{%s}" % NS["p"]
+R_ID = "{%s}id" % NS["r"]
 
 def extract_slide_texts(ppt_path):
     presentation = Presentation(ppt_path)
@@ -35,18 +54,299 @@ def extract_slide_texts(ppt_path):
     
     return content
 
-if __name__ == "__main__":
+# ==================== STREAMING EXTRACTION (no python-pptx) ====================
+# Reads the slide XML parts straight from the .pptx zip with iterparse.
+# Produces the same records as extract_slide_texts(): top-level text shapes
+# (p:sp) only, one entry per non-empty paragraph, run hyperlinks resolved
+# through the slide's relationships.
+
+def _rels_path(part_name):
+    folder, name = posixpath.split(part_name)
+    return posixpath.join(folder, "_rels", name + ".rels")
+
+def read_rels(zf, part_name):
+    """{rId: Target} for a part; empty if the part has no relationships"""
+    try:
+        with zf.open(_rels_path(part_name)) as f:
+            root = parse(f).getroot()
+    except KeyError:
+        return {}
+    return {rel.get("Id"): rel.get("Target") for rel in root.iter("{%s}Relationship" % NS["rel"])}
+
+def _resolve(part_name, target):
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+def slide_part_names(zf):
+    """Slide part names in presentation order (p:sldIdLst), e.g. ppt/slides/slide1.xml"""
+    rels = read_rels(zf, "ppt/presentation.xml")
+    with zf.open("ppt/presentation.xml") as f:
+        root = parse(f).getroot()
+    return [
+        _resolve("ppt/presentation.xml", rels[sld_id.get(R_ID)])
+        for sld_id in root.iterfind("p:sldIdLst/p:sldId", NS)
+    ]
+
+def _paragraph_text(p):
+    """Same as python-pptx paragraph.text: runs + fields, line breaks as \\v"""
+    parts = []
+    for child in p:
+        if child.tag in (A + "r", A + "fld"):
+            parts.append(child.findtext(A + "t") or "")
+        elif child.tag == A + "br":
+            parts.append("\v")
+    return "".join(parts)
+
+def _shape_paragraphs(sp, rels):
+    texts = []
+    tx_body = sp.find(P + "txBody")
+    if tx_body is None:
+        return texts
+    for p in tx_body.iterfind(A + "p"):
+        text_info = {"text": _paragraph_text(p).strip(), "hyperlinks": []}
+        for run in p.iterfind(A + "r"):
+            link = run.find(f"{A}rPr/{A}hlinkClick")
+            url = rels.get(link.get(R_ID)) if link is not None else None
+            if url:
+                text_info["hyperlinks"].append({"text": run.findtext(A + "t") or "", "url": url})
+        if text_info["text"]:
+            texts.append(text_info)
+    return texts
+
+def parse_slide(source, rels):
+    """
+    Text entries of one slide XML (file object or path), streamed:
+    each top-level shape is processed and freed as soon as it has been parsed.
+    """
+    texts = []
+    depth = 0
+    for event, elem in iterparse(source, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        # p:sld(0) / p:cSld(1) / p:spTree(2) / shape(3)
+        if depth == 3:
+            if elem.tag == P + "sp":
+                texts.extend(_shape_paragraphs(elem, rels))
+            elem.clear()
+    return texts
+
+def parse_slide_part(zf, part_name):
+    with zf.open(part_name) as f:
+        return parse_slide(f, read_rels(zf, part_name))
+
+def iter_deck_slides(ppt_path):
+    """Yield {"slide", "content"} for each slide with text, in presentation order"""
+    with zipfile.ZipFile(ppt_path) as zf:
+        for slide_number, part_name in enumerate(slide_part_names(zf), 1):
+            texts = parse_slide_part(zf, part_name)
+            if texts:
+                yield {"slide": slide_number, "content": texts}
+
+def extract_slide_texts_fast(ppt_path):
+    """Drop-in replacement for extract_slide_texts() without loading python-pptx's object model"""
+    return list(iter_deck_slides(ppt_path))
+
+def _extract_file(path):
+    """Worker: all slide records of one deck, or a single error record"""
+    try:
+        return [{"file": str(path), **record} for record in iter_deck_slides(path)]
+    except (zipfile.BadZipFile, KeyError, OSError, SyntaxError) as e:
+        return [{"file": str(path), "error": f"{type(e).__name__}: {e}"}]
+
+# ==================== INCREMENTAL CACHE ====================
+# One entry per deck (keyed by absolute path): size + mtime for the cheap
+# check, sha256 of the file to catch touched-but-identical decks, and per
+# slide part the CRC32 of the slide XML and its .rels (already stored in the
+# zip directory, so no decompression) with the extracted content.
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def save_cache(cache, cache_path):
+    """Write to a temp file and swap it in, so an interrupted run never leaves a broken cache"""
+    tmp = f"{cache_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, cache_path)
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def slide_part_key(zf, part_name):
+    """CRC32 of the slide part and its relationships (hyperlink targets live there)"""
+    try:
+        rels_crc = zf.getinfo(_rels_path(part_name)).CRC
+    except KeyError:
+        rels_crc = 0
+    return f"{zf.getinfo(part_name).CRC:08x}-{rels_crc:08x}"
+
+def entry_records(file, entry):
+    """Slide records for a cached deck entry, numbered in presentation order"""
+    return [
+        {"file": file, "slide": slide_number, "content": entry["slides"][part_name]["content"]}
+        for slide_number, part_name in enumerate(entry["order"], 1)
+        if entry["slides"][part_name]["content"]
+    ]
+
+def _extract_file_cached(job):
+    """
+    Worker: (path, cached entry or None) -> (new entry, status, slides parsed).
+    status is "touched" (same content hash), "changed"/"new" or "error".
+    Only slide parts whose CRC changed are parsed again.
+    """
+    path, entry = job
     try:
-        ppt_file = "sample.pptx"
-        content = extract_slide_texts(ppt_file)
+        stat = os.stat(path)
+        sha = file_sha256(path)
+        if entry and entry["sha256"] == sha:
+            return {**entry, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, "touched", 0
+
+        cached_slides = entry["slides"] if entry else {}
+        new_entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha, "order": [], "slides": {}}
+        parsed = 0
+        with zipfile.ZipFile(path) as zf:
+            for part_name in slide_part_names(zf):
+                key = slide_part_key(zf, part_name)
+                cached = cached_slides.get(part_name)
+                if cached is None or cached["key"] != key:
+                    cached = {"key": key, "content": parse_slide_part(zf, part_name)}
+                    parsed += 1
+                new_entry["order"].append(part_name)
+                new_entry["slides"][part_name] = cached
+        return new_entry, "changed" if entry else "new", parsed
+    except (zipfile.BadZipFile, KeyError, OSError, SyntaxError) as e:
+        return {"error": f"{type(e).__name__}: {e}"}, "error", 0
+
+def find_decks(paths):
+    """Expand files/folders to .pptx files (skipping Office '~$' lock files)"""
+    decks = []
+    for path in map(Path, paths):
+        candidates = sorted(path.rglob("*.pptx")) if path.is_dir() else [path]
+        decks.extend(p for p in candidates if not p.name.startswith("~$"))
+    return decks
+
+def _write_records(out, records, stats):
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if "error" in record:
+            stats["errors"] += 1
+            print(f"Skipped {record['file']}: {record['error']}")
+        else:
+            stats["slides"] += 1
+
+def _pool_map(func, jobs, workers, chunksize):
+    """Lazy results in job order: plain map for one worker, process pool otherwise"""
+    if workers == 1:
+        yield from map(func, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, jobs, chunksize=chunksize)
+
+def bulk_extract(paths, output_path="slides.jsonl", workers=None, chunksize=4, cache_path=None):
+    """
+    Extract every deck under paths into JSONL (one line per slide), written as
+    results arrive from the process pool. Returns a stats dict.
+
+    With cache_path, decks whose size/mtime (or content hash) are unchanged are
+    served from the cache, and in changed decks only modified slides are parsed;
+    the cache is updated and saved at the end.
+    """
+    decks = find_decks(paths)
+    workers = workers or os.cpu_count() or 1
+    stats = {"files": len(decks), "slides": 0, "errors": 0}
+
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        if cache_path is None:
+            for records in _pool_map(_extract_file, decks, workers, chunksize):
+                _write_records(out, records, stats)
+        else:
+            _bulk_extract_cached(decks, out, stats, cache_path, workers, chunksize)
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    stats["files_per_sec"] = round(len(decks) / stats["seconds"], 1) if stats["seconds"] else 0.0
+    return stats
+
+def _bulk_extract_cached(decks, out, stats, cache_path, workers, chunksize):
+    cache = load_cache(cache_path)
+    counts = dict.fromkeys(["unchanged", "touched", "changed", "new", "error"], 0)
+    slides_parsed = 0
+
+    # Cheap size/mtime check in the parent; everything else goes to the pool
+    plan, jobs = [], []
+    for deck in decks:
+        entry = cache.get(str(deck.resolve()))
+        stat = deck.stat()
+        unchanged = entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+        plan.append((deck, entry if unchanged else None))
+        if not unchanged:
+            jobs.append((deck, entry))
+
+    # Output stays in deck order: cached decks inline, the rest as the pool returns them
+    results = _pool_map(_extract_file_cached, jobs, workers, chunksize)
+    for deck, entry in plan:
+        if entry is not None:
+            counts["unchanged"] += 1
+        else:
+            entry, status, parsed = next(results)
+            counts[status] += 1
+            slides_parsed += parsed
+            if status == "error":
+                _write_records(out, [{"file": str(deck), "error": entry["error"]}], stats)
+                continue
+            cache[str(deck.resolve())] = entry
+        _write_records(out, entry_records(str(deck), entry), stats)
+
+    removed = [key for key in cache if not os.path.exists(key)]
+    for key in removed:
+        del cache[key]
+    save_cache(cache, cache_path)
+
+    stats.update({f"decks_{name}": count for name, count in counts.items()})
+    stats["decks_removed"] = len(removed)
+    stats["slides_parsed"] = slides_parsed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract slide texts and hyperlinks from PowerPoint decks")
+    parser.add_argument("paths", nargs="*", help="decks or folders for bulk mode (default: sample.pptx -> reversed_content.json)")
+    parser.add_argument("-o", "--output", default="slides.jsonl", help="JSONL output for bulk mode")
+    parser.add_argument("--workers", type=int, help="process pool size (default: CPU count)")
+    parser.add_argument("--cache", default="reverse_cache.json", help="incremental extraction cache for bulk mode")
+    parser.add_argument("--no-cache", action="store_true", help="re-extract every deck")
+    args = parser.parse_args()
+
+    if args.paths:
+        cache_path = None if args.no_cache else args.cache
+        stats = bulk_extract(args.paths, args.output, workers=args.workers, cache_path=cache_path)
+        print(f"Extracted {stats['slides']} slides from {stats['files']} decks "
+              f"in {stats['seconds']}s ({stats['files_per_sec']} decks/s, {stats['errors']} errors) to {args.output}")
+        if cache_path:
+            print(f"Cache: {stats['decks_unchanged']} unchanged, {stats['decks_touched']} touched, "
+                  f"{stats['decks_changed']} changed, {stats['decks_new']} new, {stats['decks_removed']} removed; "
+                  f"{stats['slides_parsed']} slides parsed")
+    else:
+        try:
+            ppt_file = "sample.pptx"
+            content = extract_slide_texts(ppt_file)
         
-        # Save to JSON file
-        with open("reversed_content.json", "w", encoding="utf-8") as f:
-            json.dump(content, f, indent=2, ensure_ascii=False)
+            # Save to JSON file
+            with open("reversed_content.json", "w", encoding="utf-8") as f:
+                json.dump(content, f, indent=2, ensure_ascii=False)
             
-        print("Successfully extracted content to reversed_content.json")
+            print("Successfully extracted content to reversed_content.json")
         
-    except FileNotFoundError:
-        print(f"PowerPoint file '{ppt_file}' not found")
-    except Exception as e:
-        print(f"An error occurred: {str(e)}")
\ No newline at end of file
+        except FileNotFoundError:
+            print(f"PowerPoint file '{ppt_file}' not found")
+        except Exception as e:
+            print(f"An error occurred: {str(e)}")
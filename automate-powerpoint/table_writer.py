@@ -0,0 +1,179 @@
+"""
+Bulk DataFrame -> PowerPoint table writer
+- Formats the whole DataFrame at once (per column, not per cell)
+- Builds the <a:tbl> XML in one pass and swaps it into the table shape
+  (no table.cell(r, c).text round trips through python-pptx objects)
+- Splits long tables across slides, repeating the header row
+
+Usage:
+    from table_writer import add_table_slides
+
+    add_table_slides(prs, df_lines, "Lines per day - Raw Data", layout=prs.slide_layouts[5])
+
+Benchmark against the cell-by-cell loop:
+    python benchmark_tables.py --rows 1000 --cols 12
+"""
+
+import math
+import re
+
+import numpy as np
+import pandas as pd
+from pptx.oxml import parse_xml
+from pptx.util import Emu, Inches, Pt
+
+NSMAP = 'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+TABLE_STYLE_ID = "{5C22544A-7EE6-4342-B048-85BDC9FD1C3A}"  # python-pptx default (Medium Style 2 - Accent 1)
+
+_XML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;"}
+# Escaped as _xHHHH_ like python-pptx: XML-invalid controls, and \r, which XML parsing would turn into \n
+_INVALID_XML = re.compile("[\x00-\x08\x0c\r\x0e-\x1f]")  # \t and \n are kept, \v becomes <a:br/>
+
+# ==================== FORMATTING ====================
+
+def format_frame(df, formats=None, na_rep=None, index=False):
+    """
+    All cells as strings, column by column. Default text matches str(df.iloc[r, c]).
+    formats: {column: "{:,.0f}" or callable}; na_rep: text for missing values (default str(nan))
+    """
+    if index:
+        df = df.reset_index()
+    formats = formats or {}
+    columns = []
+    for name in df.columns:
+        column = df[name]
+        fmt = formats.get(name)
+        if fmt is None:
+            # numpy str() conversion in C for plain numpy numbers; everything else goes through objects
+            # so that Timestamps/None/NA print like str(value) (pandas astype(str) keeps NaN and shortens
+            # dates, and nullable Int64/boolean/Float64 would become float64 '1.0'/'nan' instead of '1'/'<NA>')
+            numpy_number = column.dtype.kind in "iufb" and not isinstance(column.dtype, pd.api.extensions.ExtensionDtype)
+            values = column.to_numpy() if numpy_number else column.to_numpy(dtype=object)
+            text = values.astype(str).astype(object)
+        else:
+            text = column.map(fmt if callable(fmt) else fmt.format).to_numpy(dtype=object)
+        if na_rep is not None:
+            text = np.where(column.notna().to_numpy(), text, na_rep)
+        columns.append(text)
+    header = np.array([str(name) for name in df.columns], dtype=object)
+    body = np.column_stack(columns) if columns else np.empty((len(df), 0), dtype=object)
+    return header, body
+
+def _escape(text):
+    for char, entity in _XML_ESCAPES.items():
+        if char in text:
+            text = text.replace(char, entity)
+    if _INVALID_XML.search(text):
+        text = _INVALID_XML.sub(lambda m: f"_x{ord(m.group()):04X}_", text)
+    return text
+
+# ==================== XML ====================
+
+def _run_props(size, bold=False, color=None):
+    bold_attr = ' b="1"' if bold else ""
+    fill = f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>' if color else ""
+    return f'<a:rPr lang="en-US" sz="{size}"{bold_attr} dirty="0">{fill}</a:rPr>', f'<a:endParaRPr lang="en-US" sz="{size}" dirty="0"/>'
+
+def _paragraphs(text, rpr, end_rpr):
+    """python-pptx semantics: '\\n' starts a paragraph, '\\v' is a line break"""
+    if not text:
+        return f"<a:p>{end_rpr}</a:p>"
+    paragraphs = []
+    for line in text.split("\n"):
+        runs = "<a:br/>".join(f"<a:r>{rpr}<a:t>{part}</a:t></a:r>" if part else "" for part in line.split("\v"))
+        paragraphs.append(f"<a:p>{runs}</a:p>" if runs else f"<a:p>{end_rpr}</a:p>")
+    return "".join(paragraphs)
+
+def _cell(text, rpr, end_rpr, tc_pr):
+    if "\n" in text or "\v" in text or not text:
+        body = _paragraphs(text, rpr, end_rpr)
+    else:
+        body = f"<a:p><a:r>{rpr}<a:t>{text}</a:t></a:r></a:p>"
+    return f"<a:tc><a:txBody><a:bodyPr/><a:lstStyle/>{body}</a:txBody>{tc_pr}</a:tc>"
+
+def table_xml(header, body, col_widths, row_height, font_size=Pt(10), header_fill=None, header_font_color=None):
+    """<a:tbl> for one page: optional header row + body rows (2D array of strings)"""
+    size = int(font_size.pt * 100)
+    rpr, end_rpr = _run_props(size)
+    parts = [
+        f'<a:tbl {NSMAP}><a:tblPr firstRow="{int(header is not None)}" bandRow="1">'
+        f"<a:tableStyleId>{TABLE_STYLE_ID}</a:tableStyleId></a:tblPr><a:tblGrid>",
+        "".join(f'<a:gridCol w="{int(w)}"/>' for w in col_widths),
+        "</a:tblGrid>",
+    ]
+    tr = f'<a:tr h="{int(row_height)}">'
+    if header is not None:
+        header_rpr, header_end = _run_props(size, bold=True, color=header_font_color)
+        tc_pr = f'<a:tcPr><a:solidFill><a:srgbClr val="{header_fill}"/></a:solidFill></a:tcPr>' if header_fill else "<a:tcPr/>"
+        parts.append(tr + "".join(_cell(_escape(t), header_rpr, header_end, tc_pr) for t in header) + "</a:tr>")
+    for row in body:
+        parts.append(tr + "".join(_cell(_escape(t), rpr, end_rpr, "<a:tcPr/>") for t in row) + "</a:tr>")
+    parts.append("</a:tbl>")
+    return "".join(parts)
+
+def column_widths(header, body, width, auto=False):
+    """Equal widths (add_table default) or proportional to the longest text per column"""
+    cols = len(header)
+    if not auto or not cols:
+        return [width // cols] * (cols - 1) + [width - (width // cols) * (cols - 1)] if cols else []
+    lengths = np.array([len(t) for t in header], dtype=float)
+    if len(body):
+        lengths = np.maximum(lengths, np.vectorize(len, otypes=[int])(body).max(axis=0))
+    weights = np.clip(lengths, 4, 40)
+    widths = (weights / weights.sum() * width).astype(int)
+    widths[-1] += width - widths.sum()
+    return widths.tolist()
+
+def row_height_for(font_size):
+    """Minimum row height PowerPoint keeps for one line of text (font * 1.2 + default 0.05in margins)"""
+    return Emu(int(font_size * 1.2 + Inches(0.1)))
+
+# ==================== SHAPES / SLIDES ====================
+
+def write_table(shapes, header, body, left, top, width, font_size=Pt(10), row_height=None,
+                header_fill=None, header_font_color=None, auto_width=False):
+    """Add one table shape from already formatted strings; returns the graphic frame"""
+    row_height = row_height or row_height_for(font_size)
+    n_rows = len(body) + (header is not None)
+    cols = len(header) if header is not None else body.shape[1]
+    frame = shapes.add_table(1, max(cols, 1), left, top, width, row_height * n_rows)
+    widths = column_widths(header if header is not None else [""] * cols, body, width, auto_width)
+    tbl = parse_xml(table_xml(header, body, widths, row_height, font_size, header_fill, header_font_color))
+    graphic_data = frame._element.graphic.graphicData
+    graphic_data.replace(graphic_data.tbl, tbl)
+    return frame
+
+def add_dataframe_table(shapes, df, left, top, width, font_size=Pt(10), header=True, index=False,
+                        formats=None, na_rep=None, **style):
+    """Whole DataFrame as one table (no pagination)"""
+    head, body = format_frame(df, formats, na_rep, index)
+    return write_table(shapes, head if header else None, body, left, top, width, font_size, **style)
+
+def rows_per_page(slide_height, top, font_size=Pt(10), row_height=None, bottom_margin=Inches(0.4), header=True):
+    row_height = row_height or row_height_for(font_size)
+    return max(1, int((slide_height - top - bottom_margin) // row_height) - int(header))
+
+def add_table_slides(prs, df, title, layout=None, left=Inches(0.5), top=Inches(1.5), width=None,
+                     font_size=Pt(10), rows_per_slide=None, index=False, formats=None, na_rep=None,
+                     header_fill=None, header_font_color=None, auto_width=False):
+    """
+    One or more slides with df as a table, the header repeated on each page.
+    Titles get ' (i/n)' when the table spans several slides. Returns the slides.
+    """
+    layout = layout or prs.slide_layouts[5]
+    width = width or prs.slide_width - 2 * left
+    row_height = row_height_for(font_size)
+    rows_per_slide = rows_per_slide or rows_per_page(prs.slide_height, top, font_size, row_height)
+    header, body = format_frame(df, formats, na_rep, index)
+    pages = max(1, math.ceil(len(body) / rows_per_slide))
+
+    slides = []
+    for page in range(pages):
+        slide = prs.slides.add_slide(layout)
+        if slide.shapes.title is not None:
+            slide.shapes.title.text = title if pages == 1 else f"{title} ({page + 1}/{pages})"
+        chunk = body[page * rows_per_slide:(page + 1) * rows_per_slide]
+        write_table(slide.shapes, header, chunk, left, top, width, font_size, row_height,
+                    header_fill, header_font_color, auto_width)
+        slides.append(slide)
+    return slides
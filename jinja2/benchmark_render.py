@@ -0,0 +1,118 @@
+"""
+Benchmark: pages/second for the three generators' templates
+- per run (current): new Environment + compile for every output, as each generate.py does
+- fresh env + warm bytecode cache: a new process per output, but compiled code loaded from .jinja_cache
+- precompiled modules: a new process per output, templates imported from env.compile_templates output
+- batch, cold cache: one Environment, empty cache (compile once), then all contexts
+- batch, warm cache: one Environment, bytecode from a previous run, then all contexts
+Every path is checked to produce the same text as a plain Environment.
+
+Usage:
+    python benchmark_render.py --pages 2000
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader
+
+from render_engine import create_environment, precompile
+
+HERE = Path(__file__).resolve().parent
+
+def html_context(i):
+    return {
+        "page_title": f"Jinja2 HTML Demo {i}",
+        "items": [{"title": f"Feature {i}-{n}", "description": f"Generated feature {n} for page {i}."} for n in range(6)],
+        "show_promo": i % 2 == 0,
+    }
+
+def readme_context(i):
+    return {
+        "project_name": f"QR Greeting {i}",
+        "package_name": f"qr-greeting-{i}",
+        "description": "Beautiful QR code greeting cards",
+        "features": [{"title": f"Feature {n}", "description": "Generated", "icon": "✨"} for n in range(5)],
+        "usage_code": f"from qr_greeting import generate\n\nqr = generate(url='https://example.com/{i}')",
+    }
+
+def changelog_context(i):
+    return {
+        "title": f"QR Greeting {i} - Changelog",
+        "author": "Yang Li",
+        "versions": [
+            {"number": f"1.{v}.0", "date": "2026-02-10", "added": [f"Feature {v}.{n}" for n in range(3)],
+             "fixed": [f"Bug {v}"]}
+            for v in range(8)
+        ],
+    }
+
+TARGETS = [
+    ("html_demo", "page.html", html_context),
+    ("macros", "readme_with_macros.md", readme_context),
+    ("template_inheritance", "changelog.md", changelog_context),
+]
+
+def per_run(templates, name, contexts, **env_options):
+    """A new Environment for every output (the generate.py pattern)"""
+    return [create_environment(templates, **env_options).get_template(name).render(**c) for c in contexts]
+
+def batch(templates, name, contexts, cache_dir):
+    env = create_environment(templates, cache_dir=cache_dir)
+    template = env.get_template(name)
+    return [template.render(**c) for c in contexts]
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def run_benchmark(pages=2000, per_run_pages=200):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for folder, name, make_context in TARGETS:
+            templates = HERE / folder / "templates"
+            contexts = [make_context(i) for i in range(pages)]
+            few = contexts[:per_run_pages]
+            expected = [Environment(loader=FileSystemLoader(str(templates))).get_template(name).render(**c) for c in contexts]
+
+            cache = Path(tmp) / folder / "cache"
+            modules = Path(tmp) / folder / "modules"
+            precompile(templates, modules)
+
+            runs = {}
+            runs["per_run_no_cache"] = (timed(per_run, templates, name, few, cache_dir=False), len(few))
+            batch(templates, name, contexts[:1], cache)  # warm the bytecode cache
+            runs["per_run_warm_bytecode"] = (timed(per_run, templates, name, few, cache_dir=cache), len(few))
+            runs["per_run_precompiled"] = (timed(per_run, templates, name, few, cache_dir=False, precompiled_dir=modules), len(few))
+            shutil.rmtree(cache)
+            runs["batch_cold_cache"] = (timed(batch, templates, name, contexts, cache), pages)
+            runs["batch_warm_cache"] = (timed(batch, templates, name, contexts, cache), pages)
+
+            print(f"\n📄 {folder}/{name}")
+            print(f"   {'mode':<24}{'pages':>7}{'pages/s':>11}  identical")
+            results[name] = {}
+            for mode, ((seconds, output), count) in runs.items():
+                identical = output == expected[:count]
+                results[name][mode] = {"pages": count, "pages_per_sec": round(count / seconds, 1), "identical": identical}
+                print(f"   {mode:<24}{count:>7}{count / seconds:>11,.0f}  {'✅' if identical else '❌'}")
+            speedup = results[name]["batch_warm_cache"]["pages_per_sec"] / results[name]["per_run_no_cache"]["pages_per_sec"]
+            results[name]["batch_vs_per_run"] = round(speedup, 1)
+            print(f"   ⚡ batch (warm) vs per-run: {speedup:.0f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jinja2 pages/second: per-run environments vs cached batch rendering")
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--per-run-pages", type=int, default=200, help="pages for the slow per-run modes")
+    parser.add_argument("--output", default="render_benchmark.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.pages, args.per_run_pages)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results: {args.output}")
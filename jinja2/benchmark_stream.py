@@ -0,0 +1,87 @@
+"""
+Benchmark: peak memory of render() vs streaming for a growing CHANGELOG
+- render: template.render() builds the whole document string, then writes it
+- stream: template.stream().dump() to a buffered file, versions from a generator
+- async: generate_async() with versions from an async generator
+Peak Python memory (tracemalloc) should stay flat for the streaming modes.
+
+Usage:
+    python benchmark_stream.py --versions 1000 10000 100000
+"""
+
+import argparse
+import asyncio
+import filecmp
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from render_engine import render_to_file, stream_to_file, stream_to_file_async
+
+TEMPLATES = Path(__file__).resolve().parent / "template_inheritance" / "templates"
+
+def make_version(v):
+    return {
+        "number": f"{v // 100}.{v % 100}.0",
+        "date": "2026-02-10",
+        "added": [f"Feature {v}.{n} with a reasonably long description line" for n in range(4)],
+        "fixed": [f"Bug {v}.{n} fixed in the release" for n in range(2)],
+        "changed": [f"Dependency update {v}"],
+    }
+
+def iter_versions(count):
+    for v in range(count, 0, -1):
+        yield make_version(v)
+
+async def aiter_versions(count):
+    for v in range(count, 0, -1):
+        yield make_version(v)
+        if v % 1000 == 0:
+            await asyncio.sleep(0)  # e.g. waiting for the next page of an API
+
+def context(versions):
+    return {"title": "QR Greeting - Changelog", "author": "Yang Li", "versions": versions}
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 2), "peak_mb": round(peak / 1048576, 1)}
+
+def run_benchmark(sizes):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            out = {mode: Path(tmp) / f"{mode}_{count}.md" for mode in ("render", "stream", "async")}
+            row = {"versions": count}
+            # render() needs the full list in memory (it is what the generator scripts pass today)
+            row["render"] = measure(lambda: render_to_file(
+                "changelog.md", context([make_version(v) for v in range(count, 0, -1)]), out["render"], TEMPLATES))
+            row["stream"] = measure(lambda: stream_to_file(
+                "changelog.md", context(iter_versions(count)), out["stream"], TEMPLATES))
+            row["async"] = measure(lambda: asyncio.run(stream_to_file_async(
+                "changelog.md", context(aiter_versions(count)), out["async"], TEMPLATES)))
+            row["size_mb"] = round(out["render"].stat().st_size / 1048576, 1)
+            row["identical"] = filecmp.cmp(out["render"], out["stream"], shallow=False) and \
+                filecmp.cmp(out["render"], out["async"], shallow=False)
+            results.append(row)
+            print(f"{count:>9,} versions ({row['size_mb']:>6.1f} MB)  "
+                  + "  ".join(f"{m} {row[m]['peak_mb']:>7.1f} MB {row[m]['seconds']:>5.1f}s" for m in ("render", "stream", "async"))
+                  + f"  {'✅' if row['identical'] else '❌'}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Peak memory: render() vs streamed template output")
+    parser.add_argument("--versions", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--output", default="stream_benchmark.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.versions)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📝 Results: {args.output}")
@@ -0,0 +1,221 @@
+"""
+Incremental build for the Jinja2 generators in this folder
+- Reads TARGETS (template, data, output) from each generator script without rendering
+- Template dependency graph from extends/import/include (jinja2.meta.find_referenced_templates)
+- A target is rebuilt only when its output is missing, its data hash changed, or a template
+  it depends on (directly or through base.html / macros) changed
+- Stale targets are rendered in parallel across cores; the manifest (.build_manifest.json)
+  records what each output was built from
+
+Usage:
+    python build.py                 # rebuild stale outputs only
+    python build.py --explain       # ...and say why each one is stale
+    python build.py --graph         # print the dependency graph
+    python build.py --force         # rebuild everything
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import time
+import types
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import jinja2
+from jinja2 import meta
+
+from render_engine import get_environment, render_to_file, stream_to_file
+
+HERE = Path(__file__).resolve().parent
+MANIFEST = HERE / ".build_manifest.json"
+GENERATORS = [
+    "html_demo/generate_html.py",
+    "macros/generate.py",
+    "template_inheritance/generate.py",
+]
+
+# ==================== TARGETS ====================
+
+def load_targets(generators=GENERATORS):
+    """[{template, data, output, templates_dir, stream, generator}] from each generator's TARGETS"""
+    targets = []
+    for relative in generators:
+        path = HERE / relative
+        name = "_build_" + relative.replace("/", "_").removesuffix(".py")
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for target in module.TARGETS:
+            targets.append({
+                "generator": relative,
+                "template": target["template"],
+                "data": target["data"],
+                "output": Path(target["output"]),
+                "templates_dir": Path(target.get("templates_dir", path.parent / "templates")),
+                "stream": target.get("stream", False),
+            })
+    return targets
+
+def _json_default(value):
+    if isinstance(value, (types.GeneratorType, types.AsyncGeneratorType, Iterator)):
+        raise TypeError("lazy data cannot be hashed")
+    return str(value)
+
+def data_hash(data):
+    """SHA-256 of the data context; None (always rebuild) when it holds generators"""
+    try:
+        text = json.dumps(data, sort_keys=True, ensure_ascii=False, default=_json_default)
+    except TypeError:
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+# ==================== DEPENDENCY GRAPH ====================
+
+def template_dependencies(env, template_name, graph=None):
+    """
+    Direct edges {template: [referenced templates]} reachable from template_name.
+    A dynamic reference ({% include var %}) depends on every template of the folder.
+    """
+    graph = {} if graph is None else graph
+    if template_name in graph:
+        return graph
+    source = env.loader.get_source(env, template_name)[0]
+    references = list(meta.find_referenced_templates(env.parse(source)))
+    if None in references:
+        references = [name for name in env.list_templates() if name != template_name]
+    graph[template_name] = sorted(references)
+    for reference in graph[template_name]:
+        template_dependencies(env, reference, graph)
+    return graph
+
+_FILE_HASHES = {}
+
+def file_hash(path):
+    key = (str(path), os.stat(path).st_mtime_ns)
+    if key not in _FILE_HASHES:
+        _FILE_HASHES[key] = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    return _FILE_HASHES[key]
+
+def template_state(templates_dir, template_name):
+    """(dependency graph, {template: file hash}) for one root template"""
+    env = get_environment(templates_dir)
+    graph = template_dependencies(env, template_name)
+    hashes = {name: file_hash(Path(env.loader.get_source(env, name)[1])) for name in graph}
+    return graph, dict(sorted(hashes.items()))
+
+def target_state(target, templates_seen=None):
+    """Everything the output was built from: template file hashes, data hash, Jinja2 version"""
+    templates_seen = {} if templates_seen is None else templates_seen
+    key = (target["templates_dir"], target["template"])
+    if key not in templates_seen:
+        templates_seen[key] = template_state(*key)
+    graph, templates = templates_seen[key]
+    return {
+        "templates": templates,
+        "data": data_hash(target["data"]),
+        "jinja2": jinja2.__version__,
+    }, graph
+
+def stale_reasons(target, state, previous):
+    if previous is None:
+        return ["never built"]
+    reasons = []
+    if not target["output"].exists():
+        reasons.append("output missing")
+    if state["data"] is None:
+        reasons.append("data is not hashable (generator)")
+    elif state["data"] != previous.get("data"):
+        reasons.append("data changed")
+    old_templates = previous.get("templates", {})
+    for name, digest in state["templates"].items():
+        if old_templates.get(name) != digest:
+            reasons.append(f"{name} changed" if name in old_templates else f"{name} added")
+    if state["jinja2"] != previous.get("jinja2"):
+        reasons.append("Jinja2 upgraded")
+    return reasons
+
+# ==================== BUILD ====================
+
+def build_target(job):
+    """Worker: render one target (bytecode cache shared through .jinja_cache/)"""
+    template, data, output, templates_dir, stream = job
+    write = stream_to_file if stream else render_to_file
+    write(template, data, output, templates_dir)
+    return str(output)
+
+def load_manifest(path=MANIFEST):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(manifest, path=MANIFEST):
+    tmp = Path(f"{path}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def output_key(target):
+    return target["output"].relative_to(HERE).as_posix() if target["output"].is_relative_to(HERE) else str(target["output"])
+
+def build(force=False, workers=None, explain=False, show_graph=False, generators=GENERATORS):
+    start = time.perf_counter()
+    targets = load_targets(generators)
+    manifest = load_manifest()
+
+    stale, states, templates_seen = [], {}, {}
+    for target in targets:
+        key = output_key(target)
+        state, graph = target_state(target, templates_seen)  # templates parsed once per build
+        states[key] = state
+        if show_graph:
+            print(f"📄 {key} <- {target['generator']}")
+            for name, references in graph.items():
+                print(f"   {name} -> {', '.join(references) if references else '(no dependencies)'}")
+        reasons = ["forced"] if force else stale_reasons(target, state, manifest.get(key))
+        if reasons:
+            stale.append(target)
+            if explain:
+                print(f"🔄 {key}: {'; '.join(reasons)}")
+    plan_seconds = time.perf_counter() - start
+
+    jobs = [(t["template"], t["data"], t["output"], t["templates_dir"], t["stream"]) for t in stale]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(build_target, jobs))
+    else:
+        for job in jobs:
+            build_target(job)
+
+    for target in stale:
+        manifest[output_key(target)] = states[output_key(target)]
+    for key in set(manifest) - set(states):
+        del manifest[key]  # generator target removed
+    save_manifest(manifest)
+
+    result = {
+        "targets": len(targets),
+        "rebuilt": len(stale),
+        "up_to_date": len(targets) - len(stale),
+        "plan_ms": round(plan_seconds * 1000, 1),
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    print(f"✅ {result['rebuilt']} rebuilt, {result['up_to_date']} up to date "
+          f"in {result['seconds']}s (checks {result['plan_ms']} ms)")
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild only the stale Jinja2 outputs")
+    parser.add_argument("--force", action="store_true", help="rebuild every target")
+    parser.add_argument("--workers", type=int, help="parallel renders (default: CPU count)")
+    parser.add_argument("--explain", action="store_true", help="print why each target is rebuilt")
+    parser.add_argument("--graph", action="store_true", help="print the template dependency graph")
+    args = parser.parse_args()
+
+    build(args.force, args.workers, args.explain, args.graph)
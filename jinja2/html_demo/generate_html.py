@@ -1,12 +1,13 @@
-from jinja2 import Environment, FileSystemLoader
-import os
+import sys
+from pathlib import Path
 
-# Create output directory if it doesn't exist
-os.makedirs("output", exist_ok=True)
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))  # shared render_engine.py
 
-# 1. Setup Jinja2 environment
-env = Environment(loader=FileSystemLoader('templates/'))
-template = env.get_template('page.html')
+from render_engine import render_to_file
+
+# 1. Templates are compiled once and kept in the bytecode cache (.jinja_cache/)
+TEMPLATES = HERE / "templates"
 
 # 2. Data to inject
 data = {
@@ -19,13 +20,12 @@ data = {
     "show_promo": True
 }
 
-# 3. Render HTML
-output = template.render(**data)
+# Outputs of this generator (also read by ../build.py for incremental builds)
+TARGETS = [{"template": "page.html", "data": data, "output": HERE / "output" / "index.html"}]
 
-# 4. Save to file
-path = "output/index.html"
-with open(path, "w", encoding="utf-8") as f:
-    f.write(output)
+if __name__ == "__main__":
+    # 3. Render HTML and save to file (output/ is created if needed)
+    path = render_to_file("page.html", data, HERE / "output" / "index.html", TEMPLATES)
 
-print(f"✅ HTML generated at {path}")
-print("   Open it in your browser to see the result!")
+    print(f"✅ HTML generated at {path.relative_to(HERE)}")
+    print("   Open it in your browser to see the result!")
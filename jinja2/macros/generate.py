@@ -1,9 +1,12 @@
-from jinja2 import Environment, FileSystemLoader
+import sys
+from pathlib import Path
 
-env = Environment(loader=FileSystemLoader('templates/'))
-template = env.get_template('readme_with_macros.md')
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))  # shared render_engine.py
 
-output = template.render(
+from render_engine import render_to_file
+
+data = dict(
     project_name="QR Greeting",
     package_name="qr-greeting",
     description="Beautiful QR code greeting cards",
@@ -21,5 +24,8 @@ qr = generate(
 qr.save("output.png")"""
 )
 
-with open("output/README_WITH_MACROS.md", "w", encoding="utf-8") as f:
-    f.write(output)
\ No newline at end of file
+# Outputs of this generator (also read by ../build.py for incremental builds)
+TARGETS = [{"template": "readme_with_macros.md", "data": data, "output": HERE / "output" / "README_WITH_MACROS.md"}]
+
+if __name__ == "__main__":
+    render_to_file("readme_with_macros.md", data, HERE / "output" / "README_WITH_MACROS.md", HERE / "templates")
\ No newline at end of file
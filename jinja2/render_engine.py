@@ -0,0 +1,153 @@
+"""
+Shared Jinja2 render engine for the generators in this folder
+- One Environment per templates folder, reused for every render in the process
+- Compiled templates persisted with FileSystemBytecodeCache (.jinja_cache/ next to templates/),
+  so the next run loads bytecode instead of parsing and compiling the templates again
+- Batch API: one template load, many data contexts
+- Optional precompiled module templates (env.compile_templates) for deployments
+- Streaming output (template.stream / generate_async) written to disk chunk by chunk,
+  so memory does not grow with the size of the document
+
+Usage:
+    from render_engine import render_to_file, render_batch_to_files, stream_to_file
+
+    render_to_file("page.html", data, "output/index.html", templates_dir)
+    render_batch_to_files("page.html", [(f"output/{p['slug']}.html", p) for p in pages], templates_dir)
+    stream_to_file("changelog.md", {"versions": iter_versions()}, "output/CHANGELOG.md", templates_dir)
+
+Precompile the templates of a folder to Python modules:
+    python render_engine.py html_demo/templates --precompile html_demo/.jinja_modules
+"""
+
+import argparse
+import hashlib
+import os
+from pathlib import Path
+
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+
+CACHE_DIR_NAME = ".jinja_cache"
+STREAM_BUFFER = 64 * 1024  # bytes buffered by the output file between writes
+
+_ENVIRONMENTS = {}
+
+def default_cache_dir(templates_dir):
+    return Path(templates_dir).resolve().parent / CACHE_DIR_NAME
+
+def create_environment(templates_dir="templates", cache_dir=None, precompiled_dir=None, **options):
+    """
+    New Environment for a templates folder.
+    cache_dir: bytecode cache folder (default <templates>/../.jinja_cache, False to disable)
+    precompiled_dir: folder written by precompile(); checked before the template sources
+    """
+    loader = FileSystemLoader(str(templates_dir))
+    if precompiled_dir and Path(precompiled_dir).is_dir():
+        loader = ChoiceLoader([ModuleLoader(str(precompiled_dir)), loader])
+
+    if cache_dir is None:
+        cache_dir = default_cache_dir(templates_dir)
+    bytecode_cache = None
+    if cache_dir:
+        if options:
+            # Cache keys are only name + filename: enable_async/trim_blocks/... compile to different code
+            cache_dir = Path(cache_dir) / hashlib.sha1(repr(sorted(options.items())).encode()).hexdigest()[:12]
+        os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+
+    return Environment(loader=loader, bytecode_cache=bytecode_cache, **options)
+
+def get_environment(templates_dir="templates", cache_dir=None, precompiled_dir=None, **options):
+    """Environment shared by every render of this templates folder in the process"""
+    key = (str(Path(templates_dir).resolve()), str(cache_dir), str(precompiled_dir), tuple(sorted(options.items())))
+    env = _ENVIRONMENTS.get(key)
+    if env is None:
+        env = _ENVIRONMENTS[key] = create_environment(templates_dir, cache_dir, precompiled_dir, **options)
+    return env
+
+def get_template(template_name, templates_dir="templates", **env_options):
+    return get_environment(templates_dir, **env_options).get_template(template_name)
+
+# ==================== RENDER ====================
+
+def write_text(path, text):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+def render(template_name, data, templates_dir="templates", **env_options):
+    return get_template(template_name, templates_dir, **env_options).render(**data)
+
+def render_to_file(template_name, data, path, templates_dir="templates", **env_options):
+    write_text(path, render(template_name, data, templates_dir, **env_options))
+    return path
+
+def render_batch(template_name, contexts, templates_dir="templates", **env_options):
+    """Yields one rendered string per data context; the template is loaded once"""
+    template = get_template(template_name, templates_dir, **env_options)
+    for data in contexts:
+        yield template.render(**data)
+
+def render_batch_to_files(template_name, jobs, templates_dir="templates", stream=False, **env_options):
+    """jobs: iterable of (output path, data). Returns the number of files written."""
+    template = get_template(template_name, templates_dir, **env_options)
+    count = 0
+    for path, data in jobs:
+        if stream:
+            _dump(template, data, path)
+        else:
+            write_text(path, template.render(**data))
+        count += 1
+    return count
+
+# ==================== STREAMING ====================
+
+def _dump(template, data, path, buffer_size=STREAM_BUFFER):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", buffering=buffer_size) as f:
+        template.stream(**data).dump(f)
+
+def stream_to_file(template_name, data, path, templates_dir="templates", buffer_size=STREAM_BUFFER, **env_options):
+    """
+    Same output as render_to_file, but written chunk by chunk as the template runs.
+    Data values can be generators ({% for %} pulls them lazily), so neither the data
+    nor the document has to fit in memory.
+    """
+    _dump(get_template(template_name, templates_dir, **env_options), data, path, buffer_size)
+    return path
+
+async def stream_to_file_async(template_name, data, path, templates_dir="templates", buffer_size=STREAM_BUFFER,
+                               **env_options):
+    """
+    Async variant (enable_async Environment): data values can be async generators,
+    e.g. rows fetched page by page from an API, consumed by {% for %} as they arrive.
+    """
+    template = get_template(template_name, templates_dir, enable_async=True, **env_options)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", buffering=buffer_size) as f:
+        async for chunk in template.generate_async(**data):
+            f.write(chunk)
+    return path
+
+# ==================== PRECOMPILE ====================
+
+def precompile(templates_dir, target, **env_options):
+    """Compile every template of the folder to Python modules (load with precompiled_dir=target)"""
+    env = create_environment(templates_dir, cache_dir=False, **env_options)
+    env.compile_templates(str(target), zip=None, ignore_errors=False)
+    return sorted(os.listdir(target))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the bytecode cache or precompile a templates folder")
+    parser.add_argument("templates_dir")
+    parser.add_argument("--precompile", metavar="TARGET", help="write precompiled template modules to TARGET")
+    args = parser.parse_args()
+
+    if args.precompile:
+        modules = precompile(args.templates_dir, args.precompile)
+        print(f"✅ {len(modules)} templates compiled to {args.precompile}")
+    else:
+        env = get_environment(args.templates_dir)
+        names = env.list_templates()
+        for name in names:
+            env.get_template(name)
+        print(f"✅ {len(names)} templates cached in {default_cache_dir(args.templates_dir)}")
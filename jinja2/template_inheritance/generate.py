@@ -1,9 +1,12 @@
-from jinja2 import Environment, FileSystemLoader
+import sys
+from pathlib import Path
 
-env = Environment(loader=FileSystemLoader('templates/'))
-template = env.get_template('changelog.md')
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))  # shared render_engine.py
 
-output = template.render(
+from render_engine import stream_to_file
+
+data = dict(
     title="QR Greeting - Changelog",
     author="Yang Li",
     versions=[
@@ -33,7 +36,11 @@ output = template.render(
     ]
 )
 
-with open("output/CHANGELOG.md", "w", encoding="utf-8") as f:
-    f.write(output)
+# Outputs of this generator (also read by ../build.py for incremental builds)
+TARGETS = [{"template": "changelog.md", "data": data, "output": HERE / "output" / "CHANGELOG.md", "stream": True}]
+
+if __name__ == "__main__":
+    # Written chunk by chunk: memory stays flat however long the version history gets
+    stream_to_file("changelog.md", data, HERE / "output" / "CHANGELOG.md", HERE / "templates")
 
-print("✅ CHANGELOG.md generated!")
\ No newline at end of file
+    print("✅ CHANGELOG.md generated!")
\ No newline at end of file
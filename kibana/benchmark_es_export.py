@@ -0,0 +1,99 @@
+"""
+Benchmark: single-cursor vs sliced parallel Elasticsearch export
+Starts mock_es_server.py in a separate process (so the server does not share
+the client's GIL), exports the same index with increasing slice counts and
+reports rows/sec and speedup.
+
+Usage:
+    python benchmark_es_export.py --docs 200000 --slices 1 2 4 8 --latency-ms 50
+    python benchmark_es_export.py --es-url https://your-es:9200 --index logs-* --slices 1 4
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from kibana_csv_api import parallel_es_to_csv, stream_es_to_csv
+
+HERE = Path(__file__).resolve().parent
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextlib.contextmanager
+def mock_server(docs, latency_ms):
+    port = free_port()
+    proc = subprocess.Popen([
+        sys.executable, str(HERE / "mock_es_server.py"),
+        "--docs", str(docs), "--port", str(port), "--latency-ms", str(latency_ms)
+    ], stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(50):
+            try:
+                requests.get(f"{url}/_search", timeout=1)
+                break
+            except requests.exceptions.ConnectionError:
+                time.sleep(0.1)
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def run(es_url, index, slices, page_size):
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        if slices == 1:
+            _, rows, rate = stream_es_to_csv(es_url, index, output_dir=tmp, page_size=page_size)
+        else:
+            _, rows, rate = parallel_es_to_csv(es_url, index, output_dir=tmp, slices=slices, page_size=page_size)
+    return rows, rate
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sliced parallel ES export")
+    parser.add_argument("--es-url", help="benchmark a real cluster instead of the mock")
+    parser.add_argument("--index", default="logs")
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--latency-ms", type=float, default=50, help="mock per-request query latency")
+    parser.add_argument("--slices", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--output", default="es_export_benchmark.json")
+    args = parser.parse_args()
+
+    print("🚀 Elasticsearch Export Benchmark")
+    print("=" * 50)
+
+    context = contextlib.nullcontext(args.es_url) if args.es_url else mock_server(args.docs, args.latency_ms)
+    results = []
+    with context as es_url:
+        print(f"📊 Target: {es_url} ({args.index})")
+        for slices in args.slices:
+            rows, rate = run(es_url, args.index, slices, args.page_size)
+            speedup = rate / results[0]["rows_per_sec"] if results else 1.0
+            results.append({"slices": slices, "rows": rows, "rows_per_sec": round(rate, 1), "speedup": round(speedup, 2)})
+            print(f"   slices={slices:<3} {rows:,} rows  {rate:>10,.0f} rows/s  x{speedup:.2f}")
+
+    report = {
+        "es_url": args.es_url or "mock",
+        "index": args.index,
+        "docs": args.docs if not args.es_url else None,
+        "latency_ms": args.latency_ms if not args.es_url else None,
+        "page_size": args.page_size,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Saved benchmark: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Columnar / compressed export formats for Elasticsearch data
+Streams an index (PIT + search_after, see kibana_csv_api.py) into Parquet,
+Arrow IPC or zstd-compressed JSONL instead of CSV. Column types come from the
+index mapping, nested objects are flattened to dotted columns, and rows are
+written in row-group sized batches so memory stays bounded.
+
+Usage:
+    python es_export_formats.py --es-url http://127.0.0.1:9200 --index logs --format parquet
+    python es_export_formats.py --es-url http://127.0.0.1:9200 --index logs --format jsonl.zst
+"""
+
+import argparse
+import gzip
+import json
+import os
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import requests
+
+from kibana_csv_api import ES_HEADERS, iter_es_pages, stream_es_to_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("⚠️ pyarrow not installed (needed for parquet/arrow). Install with: pip install pyarrow")
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+FORMATS = ["csv", "parquet", "arrow", "jsonl.zst"]
+
+# Elasticsearch field type -> column kind (anything else is stored as a string)
+ES_TYPES = {
+    "long": "int64", "integer": "int64", "short": "int64", "byte": "int64", "unsigned_long": "uint64",
+    "double": "float64", "float": "float64", "half_float": "float64", "scaled_float": "float64",
+    "boolean": "bool",
+    "date": "timestamp", "date_nanos": "timestamp",
+}
+INT_RANGES = {"int64": (-2**63, 2**63 - 1), "uint64": (0, 2**64 - 1)}
+
+_INVALID = object()  # value that cannot be stored in its column type
+
+def fetch_mapping(es_url, index, session=None):
+    """
+    Flattened {dotted.field: es_type} from GET /{index}/_mapping.
+    Multiple indices (wildcards) are merged; sub-fields (multi-fields like
+    .keyword) are skipped since they are not present in _source.
+    """
+    response = (session or requests).get(f"{es_url}/{index}/_mapping", headers=ES_HEADERS)
+    response.raise_for_status()
+
+    fields = {}
+
+    def walk(properties, prefix=""):
+        for name, spec in properties.items():
+            if "properties" in spec:
+                walk(spec["properties"], f"{prefix}{name}.")
+            else:
+                fields.setdefault(f"{prefix}{name}", spec.get("type", "keyword"))
+
+    for body in response.json().values():
+        walk(body.get("mappings", {}).get("properties", {}))
+    return fields
+
+def arrow_schema(mapping, list_fields=()):
+    """Arrow schema for a flattened mapping; unknown types become strings, list_fields become list<type>"""
+    types = {
+        "int64": pa.int64(),
+        "uint64": pa.uint64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("ms", tz="UTC"),
+    }
+    fields = []
+    for name, es_type in mapping.items():
+        arrow_type = types.get(ES_TYPES.get(es_type), pa.string())
+        fields.append((name, pa.list_(arrow_type) if name in list_fields else arrow_type))
+    return pa.schema(fields)
+
+def _coerce(value, kind):
+    """Python value for one typed scalar; _INVALID when it does not fit the column (lists, unparsable, out of range)"""
+    if value is None:
+        return None
+    if kind == "string":
+        return json.dumps(value, ensure_ascii=False) if isinstance(value, (list, dict)) else str(value)
+    if isinstance(value, (list, dict)):
+        return _INVALID
+    try:
+        if kind in INT_RANGES:
+            low, high = INT_RANGES[kind]
+            number = int(value)
+            return number if low <= number <= high else _INVALID
+        if kind == "float64":
+            return float(value)
+        if kind == "bool":
+            return value if isinstance(value, bool) else str(value).lower() == "true"
+        if kind == "timestamp":
+            if isinstance(value, (int, float)):
+                return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (TypeError, ValueError, OverflowError):
+        return _INVALID
+    return str(value)
+
+class ColumnarSink:
+    """
+    Buffers flattened rows and writes one row group (Parquet) / record batch (Arrow) per row_group_size rows.
+    The mapping has no array type: typed fields holding multi-valued arrays become list columns. The schema
+    starts from the first batch; a field that turns multi-valued later is upgraded by rewriting what was
+    written so far, one batch at a time. Unparsable or out-of-range values are written as null and counted.
+    """
+    def __init__(self, path, mapping, fmt="parquet", row_group_size=100_000, compression="zstd"):
+        self.path = Path(path)
+        self.mapping = mapping
+        self.fmt = fmt
+        self.compression = compression
+        self.kinds = {name: ES_TYPES.get(es_type, "string") for name, es_type in mapping.items()}
+        self.row_group_size = row_group_size
+        self.columns = {name: [] for name in self.kinds}
+        self.buffered = 0
+        self.written = 0
+        self.dropped_fields = set()
+        self.dropped_values = Counter()
+        self.list_fields = set()
+        self.schema = None
+        self.writer = None
+
+    def _open(self):
+        self.schema = arrow_schema(self.mapping, self.list_fields)
+        if self.fmt == "parquet":
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(compression=self.compression)
+            self.writer = pa.ipc.new_file(str(self.path), self.schema, options=options)
+
+    def _write(self, batch):
+        if isinstance(self.writer, pq.ParquetWriter):
+            self.writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            self.writer.write_batch(batch)
+
+    def _written_batches(self, path):
+        if self.fmt == "parquet":
+            with pq.ParquetFile(path) as reader:
+                yield from reader.iter_batches(batch_size=self.row_group_size)
+        else:
+            with pa.memory_map(str(path)) as source:
+                reader = pa.ipc.open_file(source)
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+
+    def _upgrade(self, fields):
+        """Turn scalar columns into list columns, rewriting the rows written so far"""
+        print(f"\n📋 {', '.join(sorted(fields))} became multi-valued, rewriting {self.written:,} rows as lists")
+        self.writer.close()
+        previous = self.path.with_name(self.path.name + ".tmp")
+        os.replace(self.path, previous)
+        self.list_fields |= fields
+        self._open()
+        for batch in self._written_batches(previous):
+            arrays = []
+            for f in self.schema:
+                array = batch.column(f.name)
+                if f.name in fields:
+                    offsets = pa.array(range(len(array) + 1), type=pa.int32())
+                    array = pa.ListArray.from_arrays(offsets, array, mask=array.is_null())
+                arrays.append(array)
+            self._write(pa.record_batch(arrays, schema=self.schema))
+        previous.unlink()
+
+    def _scalar(self, name, value):
+        cell = _coerce(value, self.kinds[name])
+        if cell is _INVALID:
+            self.dropped_values[name] += 1
+            return None
+        return cell
+
+    def _cell(self, name, value):
+        if name in self.list_fields:
+            if value is None:
+                return None
+            return [self._scalar(name, v) for v in (value if isinstance(value, list) else [value])]
+        if isinstance(value, list) and self.kinds[name] != "string":
+            value = value[0] if value else None  # ES returns single values as one-element arrays too
+        return self._scalar(name, value)
+
+    def write_row(self, row):
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        if len(row) > len(self.columns):
+            self.dropped_fields.update(set(row) - self.columns.keys())
+        self.buffered += 1
+        if self.buffered >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        multi_valued = {
+            name for name, kind in self.kinds.items()
+            if kind != "string" and name not in self.list_fields
+            and any(isinstance(v, list) and len(v) > 1 for v in self.columns[name])
+        }
+        if self.writer is None:
+            self.list_fields = multi_valued
+            self._open()
+        elif multi_valued:
+            self._upgrade(multi_valued)
+        if not self.buffered:
+            return
+        arrays = [pa.array([self._cell(f.name, v) for v in self.columns[f.name]], type=f.type) for f in self.schema]
+        self._write(pa.record_batch(arrays, schema=self.schema))
+        self.written += self.buffered
+        self.columns = {name: [] for name in self.kinds}
+        self.buffered = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        if self.list_fields:
+            print(f"📋 Multi-valued fields stored as lists: {', '.join(sorted(self.list_fields))}")
+        if self.dropped_fields:
+            print(f"⚠️ Fields not in the mapping were skipped: {', '.join(sorted(self.dropped_fields)[:10])}")
+        if self.dropped_values:
+            counts = ", ".join(f"{name} ({n:,})" for name, n in self.dropped_values.most_common(10))
+            print(f"⚠️ Unparsable or out-of-range values were written as null: {counts}")
+
+class JsonlSink:
+    """Flattened rows as zstd-compressed JSONL (gzip when zstandard is not installed)"""
+    def __init__(self, path, level=3):
+        self.file = open(path, "wb")
+        if ZSTD_AVAILABLE:
+            self.stream = zstandard.ZstdCompressor(level=level).stream_writer(self.file)
+        else:
+            self.stream = gzip.GzipFile(fileobj=self.file, mode="wb", compresslevel=6)
+
+    def write_row(self, row):
+        self.stream.write((json.dumps(row, ensure_ascii=False, default=str) + "\n").encode("utf-8"))
+
+    def close(self):
+        self.stream.close()
+        if not self.file.closed:
+            self.file.close()
+
+def _flatten_keep_lists(doc, prefix=""):
+    """Like flatten_source but keeps lists as lists (JSONL and typed columns handle them)"""
+    flat = {}
+    for key, value in doc.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten_keep_lists(value, prefix=f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+def export_index(
+    es_url,
+    index,
+    fmt="parquet",
+    query=None,
+    output_dir="./downloads",
+    page_size=5000,
+    row_group_size=100_000,
+    session=None,
+    max_rows=None
+):
+    """Export an index in the given format (first max_rows rows when set); returns (path, rows, rows/sec)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {FORMATS}")
+    if fmt == "csv":
+        return stream_es_to_csv(es_url, index, query, output_dir=output_dir, page_size=page_size, session=session,
+                                max_rows=max_rows)
+    if fmt in ("parquet", "arrow") and not PYARROW_AVAILABLE:
+        raise RuntimeError("pyarrow is required for parquet/arrow export")
+
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    base = output_path / f"{index.replace('*', '_')}_export"
+    session = session or requests.Session()
+
+    if fmt == "jsonl.zst":
+        path = base.with_suffix(".jsonl.zst" if ZSTD_AVAILABLE else ".jsonl.gz")
+        if not ZSTD_AVAILABLE:
+            print("⚠️ zstandard not installed, writing gzip instead. Install with: pip install zstandard")
+        sink = JsonlSink(path)
+    else:
+        mapping = fetch_mapping(es_url, index, session)
+        print(f"📋 Mapping: {len(mapping)} fields")
+        path = base.with_suffix(".parquet" if fmt == "parquet" else ".arrow")
+        sink = ColumnarSink(path, mapping, fmt=fmt, row_group_size=row_group_size)
+
+    rows = 0
+    start = time.perf_counter()
+    try:
+        for page in iter_es_pages(es_url, index, query, page_size=page_size, session=session):
+            if max_rows is not None:
+                page = page[:max_rows - rows]
+            for hit in page:
+                sink.write_row(_flatten_keep_lists(hit.get("_source", {})))
+            rows += len(page)
+            elapsed = time.perf_counter() - start
+            print(f"   📦 {rows:,} rows ({rows / elapsed:,.0f} rows/s)", end="\r")
+            if max_rows is not None and rows >= max_rows:
+                break
+        print()
+    finally:
+        sink.close()
+
+    elapsed = time.perf_counter() - start
+    return path, rows, rows / elapsed if elapsed > 0 else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export an Elasticsearch index to Parquet/Arrow/JSONL")
+    parser.add_argument("--es-url", required=True)
+    parser.add_argument("--index", required=True)
+    parser.add_argument("--format", default="parquet", choices=FORMATS)
+    parser.add_argument("--output-dir", default="./downloads")
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--row-group-size", type=int, default=100_000)
+    parser.add_argument("--max-rows", type=int)
+    args = parser.parse_args()
+
+    print(f"🚀 Exporting {args.index} as {args.format}")
+    path, rows, rate = export_index(
+        args.es_url, args.index, args.format, output_dir=args.output_dir,
+        page_size=args.page_size, row_group_size=args.row_group_size, max_rows=args.max_rows
+    )
+    print(f"✅ Exported {rows:,} rows to: {path} ({path.stat().st_size / 1e6:.2f} MB)")
+    print(f"⚡ Throughput: {rate:,.0f} rows/s")
@@ -0,0 +1,194 @@
+"""
+Kibana CSV Download - Batch Orchestrator
+Exports many dashboard panels in one run from a JSON manifest.
+
+Instead of one browser launch (+ cookie dialog + fixed load wait) per panel:
+1. Launches ONE browser
+2. Accepts cookies / logs in once and persists the auth state to disk
+3. Runs exports in parallel browser contexts that reuse that state,
+   capped by a semaphore
+4. Retries failed exports and writes a JSON summary
+
+Usage:
+    python kibana_batch_export.py export_manifest.example.json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+
+from playwright.async_api import async_playwright
+
+from kibana_browser_profile import launch_browser_async, new_context_async
+from kibana_panels import PANEL_ATTR, index_panels_async, match_panel
+from kibana_waits import (
+    save_download_async, wait_for_dashboard_async, wait_for_network_idle_async, wait_for_visible_async
+)
+
+DEFAULT_TIME = {"from": "now-15m", "to": "now"}
+
+def slug(name):
+    """Filesystem-safe file stem from an export name"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "export"
+
+def dashboard_url(kibana_url, dashboard, time_range=None):
+    """Full dashboard URL from an id (or a URL, returned unchanged) and a time range"""
+    if dashboard.startswith("http"):
+        return dashboard
+    time_range = time_range or DEFAULT_TIME
+    return (
+        f"{kibana_url}/app/dashboards#/view/{dashboard}"
+        f"?_g=(filters:!(),refreshInterval:(pause:!t,value:60000),"
+        f"time:(from:{time_range['from']},to:{time_range['to']}))"
+    )
+
+def load_manifest(path):
+    """
+    Manifest format:
+    {
+      "kibana_url": "https://demo.elastic.co",
+      "concurrency": 4,
+      "storage_state": "kibana_state.json",
+      "output_dir": "downloads",
+      "exports": [
+        {"name": "services", "dashboard": "<id or url>", "panel": "Service Information",
+         "time": {"from": "now-24h", "to": "now"}, "output": "services.csv"}
+      ]
+    }
+    """
+    with open(path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    outputs = {}
+    for i, spec in enumerate(manifest["exports"]):
+        spec.setdefault("name", f"export_{i}")
+        output = spec.get("output") or f"{slug(spec['name'])}.csv"
+        if output in outputs:
+            raise ValueError(f"exports {outputs[output]!r} and {spec['name']!r} both write {output}")
+        outputs[output] = spec["name"]
+        spec.setdefault("time", manifest.get("time", DEFAULT_TIME))
+    return manifest
+
+async def ensure_storage_state(browser, kibana_url, state_path):
+    """Accept cookies (and any SSO redirects) once and persist cookies + localStorage"""
+    state_path = Path(state_path)
+    if state_path.exists():
+        print(f"✅ Reusing saved auth state: {state_path}")
+        return str(state_path)
+
+    print("🍪 First run: accepting cookies and saving auth state...")
+    context = await new_context_async(browser, state_path=None)
+    page = await context.new_page()
+    await page.goto(f"{kibana_url}/app/home")
+    try:
+        await page.click('button:has-text("Accept")', timeout=5000)
+        print("✅ Cookies accepted")
+    except Exception:
+        print("⏩ No cookie dialog")
+    await wait_for_network_idle_async(page)
+    await context.storage_state(path=str(state_path))
+    await context.close()
+    print(f"✅ Saved auth state: {state_path}")
+    return str(state_path)
+
+async def download_panel_csv(page, panel_title, dest):
+    """Open the panel's options menu and download its CSV (direct or via Inspector)"""
+    # Match on the panel title (one DOM query) rather than any text inside the panel
+    match = match_panel(await index_panels_async(page), panel_title)
+    if match is not None:
+        panel = page.locator(f'[{PANEL_ATTR}="{match["index"]}"]').first
+    else:
+        panel = page.locator('[data-test-subj="embeddablePanel"]').filter(has_text=panel_title).first
+    await panel.wait_for(state="attached", timeout=60000)
+    await panel.scroll_into_view_if_needed()
+    await panel.hover()
+
+    await panel.locator(
+        '[data-test-subj="embeddablePanelToggleMenuIcon"], button[aria-label*="Panel options"]'
+    ).first.click()
+
+    download_item = page.locator('button:has-text("Download CSV"), span:has-text("Download CSV")')
+    if not await wait_for_visible_async(page, 'button:has-text("Download CSV"), span:has-text("Download CSV")', timeout=2000):
+        await page.locator('button:has-text("Inspect"), span:has-text("Inspect")').first.click()
+        download_item = page.locator('[data-test-subj="inspectorDownloadCSV"], button:has-text("Download CSV")')
+        await download_item.first.wait_for(state="visible", timeout=10000)
+
+    async with page.expect_download(timeout=60000) as download_info:
+        await download_item.first.click()
+    download = await download_info.value
+    return await save_download_async(download, Path(dest))
+
+async def run_export(browser, semaphore, state, kibana_url, spec, output_dir, retries=1):
+    """One export in its own context (isolated dashboard state, shared auth)"""
+    async with semaphore:
+        dest = Path(output_dir) / (spec.get("output") or f"{slug(spec['name'])}.csv")
+        url = dashboard_url(kibana_url, spec["dashboard"], spec.get("time"))
+        for attempt in range(retries + 1):
+            start = time.perf_counter()
+            context = await new_context_async(browser, state_path=state)
+            page = await context.new_page()
+            try:
+                await page.goto(url)
+                await wait_for_dashboard_async(page)
+                path = await download_panel_csv(page, spec["panel"], dest)
+                elapsed = time.perf_counter() - start
+                print(f"✅ [{spec['name']}] {path} ({path.stat().st_size:,} bytes, {elapsed:.1f}s)")
+                return {"name": spec["name"], "status": "ok", "path": str(path), "seconds": round(elapsed, 2)}
+            except Exception as e:
+                print(f"❌ [{spec['name']}] attempt {attempt + 1}/{retries + 1}: {e}")
+                screenshot = Path(output_dir) / f"error_{slug(spec['name'])}.png"
+                try:
+                    await page.screenshot(path=str(screenshot))
+                except Exception:
+                    pass
+                error = str(e)
+            finally:
+                await context.close()
+        return {"name": spec["name"], "status": "failed", "error": error}
+
+async def run_batch(manifest, headless=None, concurrency=None, retries=1):
+    kibana_url = manifest["kibana_url"].rstrip("/")
+    output_dir = Path(manifest.get("output_dir", "downloads"))
+    output_dir.mkdir(exist_ok=True)
+    concurrency = concurrency or manifest.get("concurrency", 4)
+    exports = manifest["exports"]
+
+    print("🚀 Kibana Batch Export")
+    print("=" * 60)
+    print(f"📋 {len(exports)} exports, concurrency {concurrency}")
+
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await launch_browser_async(p, headless)
+        state = await ensure_storage_state(browser, kibana_url, manifest.get("storage_state", "kibana_state.json"))
+        semaphore = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(*(
+            run_export(browser, semaphore, state, kibana_url, spec, output_dir, retries)
+            for spec in exports
+        ))
+        await browser.close()
+
+    elapsed = time.perf_counter() - start
+    ok = sum(r["status"] == "ok" for r in results)
+    print("\n" + "=" * 60)
+    print(f"✅ {ok}/{len(results)} exports in {elapsed:.1f}s")
+    return {"seconds": round(elapsed, 2), "concurrency": concurrency, "results": results}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export many Kibana panels to CSV with one browser")
+    parser.add_argument("manifest")
+    parser.add_argument("--concurrency", type=int, help="override the manifest's concurrency")
+    parser.add_argument("--retries", type=int, default=1)
+    parser.add_argument("--headful", action="store_true", help="show the browser window (or set KIBANA_HEADFUL=1)")
+    parser.add_argument("--summary", default="batch_export_summary.json")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_batch(
+        load_manifest(args.manifest), headless=False if args.headful else None,
+        concurrency=args.concurrency, retries=args.retries
+    ))
+    with open(args.summary, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"📝 Summary: {args.summary}")
@@ -0,0 +1,252 @@
+"""
+Shared browser launch profile for the Kibana export scripts
+- Headless by default (set KIBANA_HEADFUL=1 to watch the browser)
+- Blocks images, fonts, media and analytics/telemetry requests
+- Reuses the saved cookie/auth state (kibana_state.json) and saves it back
+- Fixed viewport, prefers-reduced-motion and CSS that disables animations
+- Equivalent ChromeOptions for the Selenium script
+
+Usage:
+    from kibana_browser_profile import open_kibana_page, close_kibana_page
+
+    browser, context, page = open_kibana_page(p)
+    ...
+    close_kibana_page(browser, context)
+
+Measure page-load time and JS heap, current launch vs this profile:
+    python kibana_browser_profile.py --measure --runs 3
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from pathlib import Path
+
+STATE_PATH = "kibana_state.json"
+VIEWPORT = {"width": 1600, "height": 1000}
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_URL_PARTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "segment.io", "segment.com", "fullstory.com", "hotjar.com", "intercom.io",
+    "telemetry.elastic.co", "/api/ui_counters/", "/internal/telemetry/",
+)
+
+LAUNCH_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--disable-extensions", "--mute-audio"]
+
+DISABLE_ANIMATIONS_CSS = """
+*, *::before, *::after {
+    transition: none !important;
+    animation: none !important;
+    caret-color: transparent !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+# Injected before any page script runs; re-applied on every navigation
+DISABLE_ANIMATIONS_JS = f"""(() => {{
+    const add = () => {{
+        const style = document.createElement('style');
+        style.textContent = {json.dumps(DISABLE_ANIMATIONS_CSS)};
+        document.head.appendChild(style);
+    }};
+    if (document.head) add(); else document.addEventListener('DOMContentLoaded', add);
+}})();"""
+
+def headless_default():
+    """Headless unless KIBANA_HEADFUL is set to something other than 0/false"""
+    return os.environ.get("KIBANA_HEADFUL", "").lower() in ("", "0", "false", "no")
+
+def should_block(resource_type, url):
+    return resource_type in BLOCKED_RESOURCE_TYPES or any(part in url for part in BLOCKED_URL_PARTS)
+
+def context_options(state_path=STATE_PATH):
+    """Keyword arguments for browser.new_context()"""
+    options = {
+        "viewport": VIEWPORT,
+        "reduced_motion": "reduce",
+        "accept_downloads": True,
+        "service_workers": "block",
+    }
+    if state_path and Path(state_path).exists():
+        options["storage_state"] = str(state_path)
+    return options
+
+# ==================== PLAYWRIGHT (sync) ====================
+
+def launch_browser(p, headless=None):
+    headless = headless_default() if headless is None else headless
+    return p.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+
+def new_context(browser, state_path=STATE_PATH, block_resources=True):
+    """Context with the profile applied; context.blocked counts intercepted requests"""
+    context = browser.new_context(**context_options(state_path))
+    context.add_init_script(DISABLE_ANIMATIONS_JS)
+    context.blocked = 0
+    if block_resources:
+        def handle(route):
+            if should_block(route.request.resource_type, route.request.url):
+                context.blocked += 1
+                route.abort()
+            else:
+                route.continue_()
+        context.route("**/*", handle)
+    return context
+
+def open_kibana_page(p, headless=None, state_path=STATE_PATH, block_resources=True):
+    """Launch + context + page in one call; returns (browser, context, page)"""
+    browser = launch_browser(p, headless)
+    context = new_context(browser, state_path, block_resources)
+    return browser, context, context.new_page()
+
+def close_kibana_page(browser, context, state_path=STATE_PATH):
+    """Persist cookies/localStorage for the next run, then close the browser"""
+    if state_path:
+        try:
+            context.storage_state(path=str(state_path))
+        except Exception as e:
+            print(f"⚠️ Could not save browser state: {e}")
+    if context.blocked:
+        print(f"🚫 Blocked {context.blocked} non-essential requests")
+    browser.close()
+
+# ==================== PLAYWRIGHT (async) ====================
+
+async def launch_browser_async(p, headless=None):
+    headless = headless_default() if headless is None else headless
+    return await p.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+
+async def new_context_async(browser, state_path=STATE_PATH, block_resources=True):
+    context = await browser.new_context(**context_options(state_path))
+    await context.add_init_script(DISABLE_ANIMATIONS_JS)
+    context.blocked = 0
+    if block_resources:
+        async def handle(route):
+            if should_block(route.request.resource_type, route.request.url):
+                context.blocked += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        await context.route("**/*", handle)
+    return context
+
+# ==================== SELENIUM ====================
+
+def selenium_options(download_dir, headless=None):
+    """ChromeOptions matching the Playwright profile (images blocked via prefs, rest via CDP)"""
+    from selenium import webdriver
+
+    headless = headless_default() if headless is None else headless
+    options = webdriver.ChromeOptions()
+    options.add_experimental_option("prefs", {
+        "download.default_directory": str(download_dir),
+        "download.prompt_for_download": False,
+        "download.directory_upgrade": True,
+        "safebrowsing.enabled": True,
+        "profile.managed_default_content_settings.images": 2,
+    })
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={VIEWPORT['width']},{VIEWPORT['height']}")
+    options.add_argument("--force-prefers-reduced-motion")
+    for arg in LAUNCH_ARGS:
+        options.add_argument(arg)
+    return options
+
+def apply_selenium_profile(driver, download_dir):
+    """Block fonts/media/analytics and disable animations (Chrome DevTools Protocol)"""
+    patterns = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm"]
+    patterns += [f"*{part}*" for part in BLOCKED_URL_PARTS]
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_JS})
+    # Headless Chrome needs explicit permission to save downloads
+    driver.execute_cdp_cmd("Page.setDownloadBehavior", {"behavior": "allow", "downloadPath": str(download_dir)})
+
+# ==================== MEASURE ====================
+
+def page_metrics(page, context):
+    """Navigation timings (ms) and JS heap (MB) for the current page"""
+    timing = page.evaluate("""() => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        return {
+            dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+            load_ms: nav ? nav.loadEventEnd : null,
+            js_heap_mb: performance.memory ? performance.memory.usedJSHeapSize / 1048576 : null,
+            resources: performance.getEntriesByType('resource').length,
+        };
+    }""")
+    try:
+        cdp = context.new_cdp_session(page)
+        cdp.send("Performance.enable")
+        metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        timing["js_heap_mb"] = metrics.get("JSHeapUsedSize", 0) / 1048576
+        timing["dom_nodes"] = int(metrics.get("Nodes", 0))
+    except Exception:
+        pass
+    return timing
+
+def measure_once(p, url, profile, headless):
+    """One cold load of url until the dashboard is rendered"""
+    from kibana_waits import wait_for_dashboard
+
+    if profile:
+        browser, context, page = open_kibana_page(p, headless=headless)
+    else:
+        # Current flow: plain launch, every resource loaded, default viewport
+        browser = p.chromium.launch(headless=headless)
+        context = browser.new_context()
+        context.blocked = 0
+        page = context.new_page()
+
+    start = time.perf_counter()
+    page.goto(url)
+    wait_for_dashboard(page)
+    ready = time.perf_counter() - start
+
+    result = {"ready_s": round(ready, 2), "blocked": context.blocked, **page_metrics(page, context)}
+    browser.close()
+    return result
+
+def run_measure(url, runs=3, headless=True):
+    from playwright.sync_api import sync_playwright
+
+    results = {"url": url, "headless": headless, "baseline": [], "profile": []}
+    with sync_playwright() as p:
+        for i in range(runs):
+            for name, profile in (("baseline", False), ("profile", True)):
+                r = measure_once(p, url, profile, headless)
+                results[name].append(r)
+                print(f"   run {i + 1} {name:<8} ready {r['ready_s']:>5.1f}s  heap {r['js_heap_mb'] or 0:>6.1f} MB  "
+                      f"resources {r['resources']:>4}  blocked {r['blocked']:>4}")
+
+    print("\n📊 Median over runs:")
+    for name in ("baseline", "profile"):
+        ready = statistics.median(r["ready_s"] for r in results[name])
+        heap = statistics.median(r["js_heap_mb"] or 0 for r in results[name])
+        results[f"{name}_median"] = {"ready_s": ready, "js_heap_mb": round(heap, 1)}
+        print(f"   {name:<8} dashboard ready {ready:>5.1f}s, JS heap {heap:>6.1f} MB")
+    base, prof = results["baseline_median"], results["profile_median"]
+    if prof["ready_s"] > 0:
+        print(f"⚡ Load speedup: {base['ready_s'] / prof['ready_s']:.2f}x, "
+              f"heap {base['js_heap_mb'] - prof['js_heap_mb']:+.1f} MB saved")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kibana browser profile: measure load time and memory")
+    parser.add_argument("--measure", action="store_true", help="compare the current launch with this profile")
+    parser.add_argument("--url", default="https://demo.elastic.co/app/dashboards#/view/kubernetes-ff1b3850-bcb1-11ec-b64f-7dd6e8e82013?_g=(filters:!(),refreshInterval:(pause:!t,value:60000),time:(from:now-15m,to:now))")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", default="browser_profile_benchmark.json")
+    args = parser.parse_args()
+
+    if not args.measure:
+        parser.print_help()
+    else:
+        print(f"🚀 Measuring {args.runs} cold loads each (headless={headless_default()})")
+        results = run_measure(args.url, args.runs, headless=headless_default())
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"📝 Results: {args.output}")
@@ -6,54 +6,39 @@ This is the most robust approach as it bypasses the UI entirely.
 Requires authentication if your Kibana instance is secured.
 """
 
+import argparse
+import asyncio
+import csv
+import json
 import requests
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
+from kibana_report_client import ReportError, ReportJobClient, build_csv_payload
+
+ES_HEADERS = {"Content-Type": "application/json"}
+
 def download_csv_via_api(
     kibana_url="https://demo.elastic.co",
     index_pattern="kibana_sample_data_*",  # Adjust to your index
     query="*",
-    output_dir="./downloads"
+    output_dir="./downloads",
+    auth=None,
+    timeout=300
 ):
     """
     Download CSV from Kibana using the Reporting API.
+    Sync wrapper around ReportJobClient (kibana_report_client.py): the job is
+    polled with exponential backoff + jitter and the report is streamed to disk.
     
     Note: The demo.elastic.co site may not expose the API publicly.
     This approach works best with your own Kibana instance.
     """
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-    
-    # Kibana Reporting API endpoint
     # For CSV from saved search: POST /api/reporting/generate/csv_searchsource
     # For CSV from dashboard panel: POST /api/reporting/generate/csv
-    
-    api_endpoint = f"{kibana_url}/api/reporting/generate/csv_searchsource"
-    
-    # Headers - Kibana requires these
-    headers = {
-        "kbn-xsrf": "true",  # Required for Kibana API calls
-        "Content-Type": "application/json",
-    }
-    
-    # Request body - defines what to export
-    # This is a simplified example; actual structure depends on your data
-    payload = {
-        "browserTimezone": "UTC",
-        "objectType": "search",
-        "searchSource": {
-            "type": "search",
-            "query": {
-                "query": query,
-                "language": "kuery"
-            },
-            "index": index_pattern,
-            "filter": []
-        },
-        "columns": [],  # Empty = all columns
-        "title": "Exported Data"
-    }
+    payload = build_csv_payload(index_pattern, query)
+    filename = Path(output_dir) / "kibana_export.csv"
     
     print("🚀 Kibana Reporting API Approach")
     print("=" * 50)
@@ -61,48 +46,23 @@ def download_csv_via_api(
     print(f"📋 Index: {index_pattern}")
     
     try:
-        # Step 1: Request report generation
         print("\n⏳ Requesting CSV report generation...")
-        response = requests.post(api_endpoint, json=payload, headers=headers)
+        client = ReportJobClient(kibana_url, auth=auth, max_concurrency=1, timeout=timeout)
+        asyncio.run(client.export(payload, filename))
+        print(f"📊 Size: {filename.stat().st_size} bytes")
+        return str(filename)
         
-        if response.status_code == 200:
-            result = response.json()
-            job_path = result.get("path")
-            print(f"✅ Report job created: {job_path}")
-            
-            # Step 2: Poll for completion
-            print("⏳ Waiting for report to complete...")
-            download_url = f"{kibana_url}{job_path}"
-            
-            for attempt in range(30):  # Max 30 attempts (5 minutes)
-                time.sleep(10)  # Check every 10 seconds
-                
-                status_response = requests.get(download_url, headers=headers)
-                if status_response.status_code == 200:
-                    # Report ready - download it
-                    content_type = status_response.headers.get("Content-Type", "")
-                    if "text/csv" in content_type or "application/csv" in content_type:
-                        filename = output_path / "kibana_export.csv"
-                        with open(filename, "wb") as f:
-                            f.write(status_response.content)
-                        print(f"✅ Downloaded to: {filename}")
-                        print(f"📊 Size: {filename.stat().st_size} bytes")
-                        return str(filename)
-                    
-                print(f"   Attempt {attempt + 1}/30 - still processing...")
-            
-            print("❌ Timeout waiting for report")
-            
-        elif response.status_code == 401:
+    except ReportError as e:
+        if e.status == 401:
             print("❌ Authentication required. Please provide credentials.")
-            print("   For secured Kibana, add 'auth' parameter to requests.")
-            
-        elif response.status_code == 403:
+            print("   For secured Kibana, pass auth=(user, password).")
+        elif e.status == 403:
             print("❌ Access forbidden. Check your permissions.")
-            
+        elif e.status is None:
+            print(f"❌ Timeout waiting for report: {e}")
         else:
-            print(f"❌ API Error: {response.status_code}")
-            print(f"   Response: {response.text[:500]}")
+            print(f"❌ API Error: {e.status}")
+            print(f"   Response: {e.body[:500]}")
             
     except requests.exceptions.ConnectionError:
         print("❌ Could not connect to Kibana.")
@@ -114,65 +74,297 @@ def download_csv_via_api(
     return None
 
 
+def flatten_source(doc, prefix=""):
+    """
+    Flatten a nested _source into dotted keys ({"host": {"name": x}} -> {"host.name": x}).
+    Lists are kept as JSON strings so no values are lost in the CSV.
+    """
+    flat = {}
+    for key, value in doc.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_source(value, prefix=f"{name}."))
+        elif isinstance(value, list):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def open_pit(es_url, index, keep_alive="1m", session=None):
+    """Open a point-in-time on the index; None on clusters without PIT (pre-7.10)"""
+    session = session or requests.Session()
+    response = session.post(f"{es_url}/{index}/_pit", params={"keep_alive": keep_alive}, headers=ES_HEADERS)
+    if response.status_code != 200:
+        print(f"⚠️ Point-in-time not available ({response.status_code}), using scroll")
+        return None
+    return response.json()["id"]
+
+
+def close_pit(es_url, pit_id, session=None):
+    (session or requests).delete(f"{es_url}/_pit", json={"id": pit_id}, headers=ES_HEADERS)
+
+
+def _iter_pit_pages(es_url, pit_id, query, page_size, keep_alive, session, slice_=None):
+    search_after = None
+    while True:
+        body = {
+            "size": page_size,
+            "query": query,
+            "pit": {"id": pit_id, "keep_alive": keep_alive},
+            "sort": [{"_shard_doc": "asc"}],
+            "track_total_hits": False,
+        }
+        if slice_ is not None:
+            body["slice"] = slice_
+        if search_after is not None:
+            body["search_after"] = search_after
+        page = session.post(f"{es_url}/_search", json=body, headers=ES_HEADERS)
+        page.raise_for_status()
+        data = page.json()
+        pit_id = data.get("pit_id", pit_id)
+        hits = data["hits"]["hits"]
+        if not hits:
+            return
+        yield hits
+        search_after = hits[-1]["sort"]
+
+
+def _iter_scroll_pages(es_url, index, query, page_size, keep_alive, session, slice_=None):
+    body = {"size": page_size, "query": query, "sort": ["_doc"]}
+    if slice_ is not None:
+        body["slice"] = slice_
+    page = session.post(f"{es_url}/{index}/_search", params={"scroll": keep_alive}, json=body, headers=ES_HEADERS)
+    page.raise_for_status()
+    data = page.json()
+    scroll_id = data.get("_scroll_id")
+    try:
+        while data["hits"]["hits"]:
+            yield data["hits"]["hits"]
+            page = session.post(f"{es_url}/_search/scroll", json={"scroll": keep_alive, "scroll_id": scroll_id}, headers=ES_HEADERS)
+            page.raise_for_status()
+            data = page.json()
+            scroll_id = data.get("_scroll_id", scroll_id)
+    finally:
+        if scroll_id:
+            session.delete(f"{es_url}/_search/scroll", json={"scroll_id": [scroll_id]}, headers=ES_HEADERS)
+
+
+def iter_es_pages(es_url, index, query=None, page_size=5000, keep_alive="1m", session=None,
+                  pit_id=None, slice_=None):
+    """
+    Yield pages of hits from an index until it is exhausted.
+    Uses a point-in-time + search_after cursor (ES 7.10+) and falls back to
+    the scroll API on clusters without PIT support. Only one page is in
+    memory at a time, and the cursor is released at the end.
+    Pass pit_id to read from a PIT owned by the caller (left open), and
+    slice_={"id": i, "max": n} to read one slice of a sliced export.
+    """
+    session = session or requests.Session()
+    query = query or {"match_all": {}}
+
+    if pit_id is not None:
+        yield from _iter_pit_pages(es_url, pit_id, query, page_size, keep_alive, session, slice_)
+        return
+
+    pit_id = open_pit(es_url, index, keep_alive, session)
+    if pit_id is None:
+        yield from _iter_scroll_pages(es_url, index, query, page_size, keep_alive, session, slice_)
+        return
+    try:
+        yield from _iter_pit_pages(es_url, pit_id, query, page_size, keep_alive, session, slice_)
+    finally:
+        close_pit(es_url, pit_id, session)
+
+
+def _spool_pages(pages, spool, columns, max_rows=None, progress=None):
+    """Flatten hits into a JSONL spool, growing the column union; returns rows written"""
+    rows = 0
+    for page in pages:
+        if max_rows is not None:
+            page = page[:max_rows - rows]
+        for hit in page:
+            row = flatten_source(hit.get("_source", {}))
+            columns.update(dict.fromkeys(row))
+            spool.write(json.dumps(row, ensure_ascii=False) + "\n")
+        rows += len(page)
+        if progress:
+            progress(len(page))
+        if max_rows is not None and rows >= max_rows:
+            break
+    return rows
+
+
+def _write_csv_from_spools(filename, spool_paths, columns):
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns), restval="")
+        writer.writeheader()
+        for spool_path in spool_paths:
+            with open(spool_path, encoding="utf-8") as spool:
+                for line in spool:
+                    writer.writerow(json.loads(line))
+
+
+class _Progress:
+    """rows/sec counter printed on one line"""
+    def __init__(self):
+        self.rows = 0
+        self.start = time.perf_counter()
+
+    def __call__(self, n):
+        self.rows += n
+        elapsed = time.perf_counter() - self.start
+        print(f"   📦 {self.rows:,} rows ({self.rows / elapsed:,.0f} rows/s)", end="\r")
+
+
+def stream_es_to_csv(
+    es_url,
+    index,
+    query=None,
+    output_dir="./downloads",
+    page_size=5000,
+    max_rows=None,
+    session=None
+):
+    """
+    Export an index to CSV at constant memory.
+    Rows are flattened and spooled to a JSONL file as pages arrive while the
+    column union is tracked across every document; the CSV is then written
+    from the spool with the complete header. Returns (path, rows, rows/sec).
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    filename = output_path / f"{index.replace('*', '_')}_export.csv"
+    spool_path = filename.with_suffix(".jsonl.tmp")
+
+    columns = {}  # insertion-ordered set
+    start = time.perf_counter()
+    try:
+        with open(spool_path, "w", encoding="utf-8") as spool:
+            pages = iter_es_pages(es_url, index, query, page_size=page_size, session=session)
+            rows = _spool_pages(pages, spool, columns, max_rows=max_rows, progress=_Progress())
+            pages.close()
+        print()
+        _write_csv_from_spools(filename, [spool_path], columns)
+    finally:
+        spool_path.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    return filename, rows, rate
+
+
+def _export_slice(es_url, index, query, pit_id, slice_, page_size, keep_alive, part_path):
+    """Worker: read one slice into its own JSONL part file; returns (columns, rows)"""
+    session = requests.Session()
+    if pit_id is not None:
+        pages = _iter_pit_pages(es_url, pit_id, query, page_size, keep_alive, session, slice_)
+    else:
+        pages = _iter_scroll_pages(es_url, index, query, page_size, keep_alive, session, slice_)
+    columns = {}
+    with open(part_path, "w", encoding="utf-8") as spool:
+        rows = _spool_pages(pages, spool, columns)
+    return list(columns), rows
+
+
+def parallel_es_to_csv(
+    es_url,
+    index,
+    query=None,
+    output_dir="./downloads",
+    slices=4,
+    page_size=5000,
+    keep_alive="1m"
+):
+    """
+    Sliced parallel export: one shared PIT (or one sliced scroll per worker on
+    older clusters) split into `slices` disjoint slices, each read by its own
+    worker process into its own part file. Processes rather than threads, as
+    JSON decoding and flattening are CPU-bound. Parts are concatenated into
+    the final CSV under the union of every slice's columns.
+    Returns (path, rows, rows/sec).
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    filename = output_path / f"{index.replace('*', '_')}_export.csv"
+    query = query or {"match_all": {}}
+    part_paths = [filename.with_suffix(f".part{i:03d}.jsonl.tmp") for i in range(slices)]
+
+    start = time.perf_counter()
+    pit_id = open_pit(es_url, index, keep_alive)
+    try:
+        with ProcessPoolExecutor(max_workers=slices) as pool:
+            futures = [
+                pool.submit(_export_slice, es_url, index, query, pit_id,
+                            {"id": i, "max": slices}, page_size, keep_alive, part_paths[i])
+                for i in range(slices)
+            ]
+            results = []
+            for future in as_completed(futures):
+                results.append(future.result())
+                rows = sum(n for _, n in results)
+                elapsed = time.perf_counter() - start
+                print(f"   📦 {len(results)}/{slices} slices, {rows:,} rows ({rows / elapsed:,.0f} rows/s)", end="\r")
+        print()
+
+        columns = {}
+        for future in futures:
+            columns.update(dict.fromkeys(future.result()[0]))
+        rows = sum(n for _, n in results)
+        _write_csv_from_spools(filename, part_paths, columns)
+    finally:
+        if pit_id is not None:
+            close_pit(es_url, pit_id)
+        for part in part_paths:
+            part.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    return filename, rows, rate
+
+
 def download_csv_via_elasticsearch(
     es_url="https://demo.elastic.co:9243",  # Elasticsearch endpoint
     index="kibana_sample_data_logs",
     query={"match_all": {}},
     output_dir="./downloads",
-    max_rows=10000
+    max_rows=None,
+    page_size=5000,
+    slices=1
 ):
     """
     Alternative: Query Elasticsearch directly and convert to CSV.
-    Bypasses Kibana entirely.
+    Bypasses Kibana entirely. Streams the whole index (or max_rows) with
+    point-in-time pagination instead of a single size-limited search.
+    slices > 1 reads the index with that many parallel sliced cursors.
     """
-    import json
-    import csv
-    
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
-    
     print("\n🔍 Direct Elasticsearch Query Approach")
     print("=" * 50)
     
-    # Elasticsearch search endpoint
-    search_url = f"{es_url}/{index}/_search"
-    
-    headers = {"Content-Type": "application/json"}
-    payload = {
-        "query": query,
-        "size": max_rows
-    }
-    
     try:
-        print(f"📊 Querying: {index}")
-        response = requests.get(search_url, json=payload, headers=headers)
+        print(f"📊 Querying: {index}" + (f" ({slices} slices)" if slices > 1 else ""))
+        if slices > 1:
+            if max_rows is not None:
+                print("⚠️ max_rows is ignored for sliced exports")
+            filename, rows, rate = parallel_es_to_csv(
+                es_url, index, query, output_dir=output_dir, slices=slices, page_size=page_size
+            )
+        else:
+            filename, rows, rate = stream_es_to_csv(
+                es_url, index, query, output_dir=output_dir, page_size=page_size, max_rows=max_rows
+            )
         
-        if response.status_code == 200:
-            data = response.json()
-            hits = data.get("hits", {}).get("hits", [])
-            
-            if hits:
-                # Extract field names from first hit
-                first_doc = hits[0].get("_source", {})
-                fieldnames = list(first_doc.keys())
-                
-                # Write to CSV
-                filename = output_path / f"{index}_export.csv"
-                with open(filename, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    
-                    for hit in hits:
-                        writer.writerow(hit.get("_source", {}))
-                
-                print(f"✅ Exported {len(hits)} rows to: {filename}")
-                return str(filename)
-            else:
-                print("⚠️ No data found in index.")
-                
+        if rows:
+            print(f"✅ Exported {rows:,} rows to: {filename}")
+            print(f"⚡ Throughput: {rate:,.0f} rows/s")
+            return str(filename)
         else:
-            print(f"❌ Elasticsearch error: {response.status_code}")
-            print(f"   {response.text[:300]}")
+            filename.unlink(missing_ok=True)
+            print("⚠️ No data found in index.")
+            
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ Elasticsearch error: {e.response.status_code}")
+        print(f"   {e.response.text[:300]}")
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -181,21 +373,43 @@ def download_csv_via_elasticsearch(
 
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("Kibana CSV Export - API Approach")
-    print("=" * 60)
-    print()
-    print("⚠️  Note: The demo.elastic.co site may not expose APIs publicly.")
-    print("    This approach works best with your own Kibana/ES instance.")
-    print()
+    parser = argparse.ArgumentParser(description="Kibana/Elasticsearch CSV export")
+    parser.add_argument("--es-url", help="export straight from this Elasticsearch URL")
+    parser.add_argument("--index", default="kibana_sample_data_logs")
+    parser.add_argument("--max-rows", type=int)
+    parser.add_argument("--page-size", type=int, default=5000)
+    parser.add_argument("--slices", type=int, default=1, help="parallel sliced cursors (1 = single stream)")
+    parser.add_argument("--format", default="csv", choices=["csv", "parquet", "arrow", "jsonl.zst"])
+    args = parser.parse_args()
+    if args.format != "csv" and args.slices > 1:
+        parser.error("--slices is only supported with --format csv")
     
-    # Try the Kibana Reporting API
-    result = download_csv_via_api()
-    
-    if not result:
-        print("\n" + "-" * 50)
-        print("Trying direct Elasticsearch query as fallback...")
-        result = download_csv_via_elasticsearch()
-    
-    print("\n" + "=" * 60)
-    print("Done!")
+    if args.es_url and args.format != "csv":
+        from es_export_formats import export_index
+        path, rows, rate = export_index(
+            args.es_url, args.index, args.format, page_size=args.page_size, max_rows=args.max_rows
+        )
+        print(f"✅ Exported {rows:,} rows to: {path} ({rate:,.0f} rows/s)")
+    elif args.es_url:
+        download_csv_via_elasticsearch(
+            args.es_url, args.index, max_rows=args.max_rows, page_size=args.page_size, slices=args.slices
+        )
+    else:
+        print("=" * 60)
+        print("Kibana CSV Export - API Approach")
+        print("=" * 60)
+        print()
+        print("⚠️  Note: The demo.elastic.co site may not expose APIs publicly.")
+        print("    This approach works best with your own Kibana/ES instance.")
+        print()
+        
+        # Try the Kibana Reporting API
+        result = download_csv_via_api()
+        
+        if not result:
+            print("\n" + "-" * 50)
+            print("Trying direct Elasticsearch query as fallback...")
+            result = download_csv_via_elasticsearch()
+        
+        print("\n" + "=" * 60)
+        print("Done!")
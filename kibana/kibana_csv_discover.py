@@ -11,22 +11,24 @@ This approach:
 """
 
 from playwright.sync_api import sync_playwright
-import time
 from pathlib import Path
 
+from kibana_browser_profile import close_kibana_page, open_kibana_page
+from kibana_waits import StepTimer, save_download, wait_for_kibana_idle, wait_for_popover, wait_for_visible
+
 def download_csv_via_discover():
     """
     Download CSV by navigating to Kibana Discover section.
     The export UI in Discover is typically more accessible than dashboard panels.
     """
     Path("downloads").mkdir(exist_ok=True)
+    timer = StepTimer("discover export")
     
     with sync_playwright() as p:
         print("🚀 Kibana CSV Download - Discover/Saved Search Approach")
         print("=" * 60)
         
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        browser, context, page = open_kibana_page(p)  # headless unless KIBANA_HEADFUL=1
         
         # Navigate directly to Discover
         # For the demo site, we'll use their Discover page
@@ -44,8 +46,9 @@ def download_csv_via_discover():
             print("⏩ No cookie dialog")
         
         # Wait for page to load
-        print("⏳ Waiting for Discover to load (10s)...")
-        time.sleep(10)
+        print("⏳ Waiting for Discover to load...")
+        with timer.step("discover load", replaced_sleep=10):
+            wait_for_kibana_idle(page)
         
         # Check if we need to select a data view/index pattern
         print("🔍 Looking for data view selector...")
@@ -56,37 +59,41 @@ def download_csv_via_discover():
         if data_view_selector.count() > 0:
             print("   Found data view selector, clicking...")
             data_view_selector.first.click()
-            time.sleep(2)
+            with timer.step("data view popover", replaced_sleep=2):
+                wait_for_popover(page)
             
             # Look for a kubernetes-related data view
             kube_option = page.locator(':text("kubernetes"), :text("metrics"), :text("metricbeat")')
             if kube_option.count() > 0:
                 print("   Selecting kubernetes/metrics data view...")
                 kube_option.first.click()
-                time.sleep(3)
+                with timer.step("data view switch", replaced_sleep=3):
+                    wait_for_kibana_idle(page)
             else:
                 # Just select the first available one
                 first_option = page.locator('[data-test-subj="indexPattern-switch-link"]').first
                 if first_option.count() > 0:
                     first_option.click()
-                    time.sleep(3)
+                    with timer.step("data view switch", replaced_sleep=3):
+                        wait_for_kibana_idle(page)
         
         # Set time range to get data
         print("📅 Setting time range...")
         time_picker = page.locator('[data-test-subj="superDatePickerToggleQuickMenuButton"], [data-test-subj="querySubmitButton"]')
         if time_picker.count() > 0:
             time_picker.first.click()
-            time.sleep(1)
+            with timer.step("time picker popover", replaced_sleep=1):
+                wait_for_popover(page)
             
             # Select "Last 7 days" or similar
             last_7_days = page.locator(':text("Last 7 days")')
             if last_7_days.count() > 0:
                 last_7_days.first.click()
-                time.sleep(2)
         
         # Wait for data to load
-        print("⏳ Waiting for data to load (5s)...")
-        time.sleep(5)
+        print("⏳ Waiting for data to load...")
+        with timer.step("query results", replaced_sleep=7):
+            wait_for_kibana_idle(page)
         
         # Now try to share/export as CSV
         print("📤 Looking for Share/Export options...")
@@ -97,7 +104,8 @@ def download_csv_via_discover():
         if share_btn.count() > 0 and share_btn.is_visible():
             print("   Found 'Share' button, clicking...")
             share_btn.first.click()
-            time.sleep(2)
+            with timer.step("share menu", replaced_sleep=2):
+                wait_for_popover(page)
             
             # Look for CSV export option in the share menu
             csv_option = page.locator('[data-test-subj="sharePanel-CSVReports"], :text("CSV Reports"), :text("Generate CSV")')
@@ -105,10 +113,11 @@ def download_csv_via_discover():
             if csv_option.count() > 0 and csv_option.is_visible():
                 print("   Found 'CSV Reports' option, clicking...")
                 csv_option.first.click()
-                time.sleep(2)
                 
                 # Look for generate/download button
                 generate_btn = page.locator('[data-test-subj="generateReportButton"], button:has-text("Generate CSV"), button:has-text("Download")')
+                with timer.step("csv report panel", replaced_sleep=2):
+                    wait_for_visible(page, '[data-test-subj="generateReportButton"], button:has-text("Generate CSV"), button:has-text("Download")')
                 
                 if generate_btn.count() > 0:
                     print("   Clicking generate/download...")
@@ -117,7 +126,7 @@ def download_csv_via_discover():
                     
                     download = download_info.value
                     filepath = Path("downloads") / download.suggested_filename
-                    download.save_as(filepath)
+                    save_download(download, filepath)
                     
                     print(f"✅ SUCCESS! Downloaded to: {filepath}")
                     print(f"📊 File size: {filepath.stat().st_size} bytes")
@@ -138,7 +147,8 @@ def download_csv_via_discover():
             
             if export_btn.count() > 0:
                 export_btn.first.click()
-                time.sleep(1)
+                with timer.step("export popover", replaced_sleep=1):
+                    wait_for_popover(page)
                 
                 csv_link = page.locator(':text("Export CSV")')
                 if csv_link.count() > 0:
@@ -147,7 +157,7 @@ def download_csv_via_discover():
                     
                     download = download_info.value
                     filepath = Path("downloads") / download.suggested_filename
-                    download.save_as(filepath)
+                    save_download(download, filepath)
                     print(f"✅ Downloaded: {filepath}")
                 else:
                     print("❌ CSV export option not found.")
@@ -157,8 +167,8 @@ def download_csv_via_discover():
                 page.screenshot(path="error_discover_no_export.png")
         
         print("\n✅ Done!")
-        time.sleep(2)
-        browser.close()
+        timer.report()
+        close_kibana_page(browser, context)
 
 
 def download_csv_from_saved_search(saved_search_id=None):
@@ -167,14 +177,14 @@ def download_csv_from_saved_search(saved_search_id=None):
     Saved searches often have simpler export options.
     """
     Path("downloads").mkdir(exist_ok=True)
+    timer = StepTimer("saved search export")
     
     with sync_playwright() as p:
         print("\n" + "=" * 60)
         print("🔍 Saved Search Approach")
         print("=" * 60)
         
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        browser, context, page = open_kibana_page(p)  # headless unless KIBANA_HEADFUL=1
         
         # If we have a saved search ID, go directly to it
         if saved_search_id:
@@ -192,7 +202,8 @@ def download_csv_from_saved_search(saved_search_id=None):
         except:
             pass
         
-        time.sleep(5)
+        with timer.step("page load", replaced_sleep=5):
+            wait_for_kibana_idle(page)
         
         # If we're on the management page, filter for saved searches
         if "objects" in url:
@@ -202,31 +213,36 @@ def download_csv_from_saved_search(saved_search_id=None):
             type_filter = page.locator('[data-test-subj="savedObjectsTableTypeFilter"]')
             if type_filter.count() > 0:
                 type_filter.first.click()
-                time.sleep(1)
+                with timer.step("type filter popover", replaced_sleep=1):
+                    wait_for_popover(page)
                 
                 search_option = page.locator(':text("Search")')
                 if search_option.count() > 0:
                     search_option.first.click()
-                    time.sleep(2)
+                    with timer.step("filter saved objects", replaced_sleep=2):
+                        wait_for_kibana_idle(page)
             
             # Click on the first saved search
             first_search = page.locator('a[data-test-subj="savedObjectsTableObjectLink"]').first
             if first_search.count() > 0:
                 print("   Found a saved search, opening...")
                 first_search.click()
-                time.sleep(5)
+                with timer.step("saved search load", replaced_sleep=5):
+                    wait_for_kibana_idle(page)
                 
                 # Now we should be in Discover with the saved search loaded
                 # Try to export from here
                 share_btn = page.locator('[data-test-subj="shareTopNavButton"]')
                 if share_btn.count() > 0:
                     share_btn.first.click()
-                    time.sleep(2)
+                    with timer.step("share menu", replaced_sleep=2):
+                        wait_for_popover(page)
                     
                     csv_option = page.locator(':text("CSV Reports")')
                     if csv_option.count() > 0:
                         csv_option.first.click()
-                        time.sleep(2)
+                        with timer.step("csv report panel", replaced_sleep=2):
+                            wait_for_visible(page, 'button:has-text("Generate")')
                         
                         generate_btn = page.locator('button:has-text("Generate")')
                         if generate_btn.count() > 0:
@@ -235,14 +251,14 @@ def download_csv_from_saved_search(saved_search_id=None):
                             
                             download = download_info.value
                             filepath = Path("downloads") / download.suggested_filename
-                            download.save_as(filepath)
+                            save_download(download, filepath)
                             print(f"✅ Downloaded from saved search: {filepath}")
             else:
                 print("❌ No saved searches found.")
         
         print("\n✅ Done!")
-        time.sleep(2)
-        browser.close()
+        timer.report()
+        close_kibana_page(browser, context)
 
 
 if __name__ == "__main__":
@@ -4,31 +4,155 @@ Uses keyboard shortcuts to find the RIGHT hidden 3-dots menu.
 
 Strategy:
 1. Navigate to dashboard.
-2. Scroll to "Service Information" panel.
-3. Use TAB navigation to loop through ALL panel options buttons.
-4. For each button found:
-   - Open menu (Enter)
+2. Index all panels in ONE DOM query (kibana_panels.PanelIndex) and click the
+   "Service Information" options button directly.
+3. Fallback if the panel is not indexed: TAB navigation through ALL panel options buttons.
+4. For each menu opened:
    - Check if "Download CSV" is inside (handling strict mode)
+   - Else try Inspect -> Download CSV
    - If not, Close menu (Escape) and CONTINUE Searching
-5. Wait after download to ensure file is saved.
+5. Wait for readiness signals (render-complete, popovers, finished downloads)
+   instead of fixed sleeps; per-step timings are printed at the end.
 """
 
 from playwright.sync_api import sync_playwright
-import time
 from pathlib import Path
 
+from kibana_browser_profile import close_kibana_page, open_kibana_page
+from kibana_panels import PanelIndex
+from kibana_waits import (
+    INSPECTOR, StepTimer, save_download, wait_for_dashboard, wait_for_hidden,
+    wait_for_popover, wait_for_visible
+)
+
+def download_from_open_menu(page, timer):
+    """
+    With a panel options menu open: download via "Download CSV" or Inspect -> Download CSV.
+    Returns the saved path, or None after closing the menu/Inspector again.
+    """
+    # Check 1: Direct Download CSV
+    download_option = page.locator('button:has-text("Download CSV"), span:has-text("Download CSV")')
+    
+    # FIX: Check count AND use .first to avoid strict mode error
+    if download_option.count() > 0 and download_option.first.is_visible():
+        print("   🎉 Found visible 'Download CSV', clicking...")
+        with page.expect_download(timeout=30000) as download_info:
+            download_option.first.click()
+        download = download_info.value
+        filepath = Path("downloads") / download.suggested_filename
+        # save_as() returns once the file is complete
+        with timer.step("save download", replaced_sleep=5):
+            save_download(download, filepath)
+        print(f"✅ SUCCESS! Downloaded: {filepath}")
+        return filepath
+    
+    # Check 2: Inspect -> Download
+    inspect_option = page.locator('button:has-text("Inspect"), span:has-text("Inspect")')
+    if inspect_option.count() > 0 and inspect_option.first.is_visible():
+        print("   Found 'Inspect', clicking to check for CSV...")
+        inspect_option.first.click()
+        
+        download_btn = page.locator('button:has-text("Download CSV"), [data-test-subj="inspectorDownloadCSV"]')
+        with timer.step("open inspector", replaced_sleep=3):
+            wait_for_visible(page, 'button:has-text("Download CSV"), [data-test-subj="inspectorDownloadCSV"]', timeout=10000)
+        if download_btn.count() > 0 and download_btn.first.is_visible():
+            print("   🎉 Found 'Download CSV' in Inspector!")
+            with page.expect_download() as dl_info:
+                download_btn.first.click()
+            dl = dl_info.value
+            fp = Path("downloads") / dl.suggested_filename
+            with timer.step("save download", replaced_sleep=50):
+                save_download(dl, fp)
+            print(f"✅ SUCCESS! Downloaded: {fp}")
+            return fp
+        
+        print("   ❌ Download CSV not found in Inspector. Closing Inspector...")
+        page.keyboard.press("Escape")
+        wait_for_hidden(page, INSPECTOR)
+    else:
+        print("   ❌ Neither 'Download CSV' nor 'Inspect' found in this menu.")
+        # Close the menu to continue searching
+        print("   Closing menu (Pressing Escape)...")
+        page.keyboard.press("Escape")
+        wait_for_hidden(page, '.euiContextMenuPanel')
+    return None
+
+def tab_to_panel_menu(page, panel_title, timer, max_total_tabs=150):
+    """
+    Fallback when the panel index finds nothing: TAB through focusable elements
+    until a panel options button whose menu offers a CSV download.
+    One browser round-trip per tab stop, so only used as a last resort.
+    """
+    print("\n🎹 Falling back to keyboard (TAB) navigation...")
+    
+    # Strategy: Focus specifically on the target panel container first
+    print(f"   Clicking '{panel_title}' panel to focus it...")
+    try:
+         # Find panel by text and get its parent container
+         panel_header = page.locator(f'span:has-text("{panel_title}"), h3:has-text("{panel_title}")').first
+         
+         # CLicking the header sets accessibility focus roughly in the right area
+         if panel_header.count() > 0:
+             panel_header.scroll_into_view_if_needed()
+             panel_header.click()
+         else:
+             print(f"   ⚠️ Heading '{panel_title}' not found, clicking page body center...")
+             page.click("body")
+    except:
+         pass
+
+    print("⚠️ Starting TAB navigation loop to find relevant panel menu...")
+    
+    # Cycle through tab stops until we find a "Panel options" button
+    # AND verify it's the right one by checking its menu items.
+    for i in range(max_total_tabs): 
+        page.keyboard.press("Tab")
+        
+        # Get info about focused element
+        focused_meta = page.evaluate("""() => {
+            const el = document.activeElement;
+            return {
+                label: el.getAttribute('aria-label') || '',
+                test_subj: el.getAttribute('data-test-subj') || '',
+                text: el.innerText || ''
+            }
+        }""")
+        
+        focused_label = focused_meta['label'].lower()
+        focused_test_subj = focused_meta['test_subj']
+        
+        # Debug output to trace navigation occasionally
+        if i % 10 == 0: print(f"   [Tab {i}] Focused: label='{focused_label}' test_subj='{focused_test_subj}'")
+
+        # Check if we hit A panel options button
+        if (("panel options" in focused_label) or 
+            ("options for" in focused_label) or 
+            ("embeddablePanelToggleMenuIcon" in focused_test_subj)):
+            
+            print(f"✅ FOUND A Panel Options button at Tab {i}!")
+            print("   Pressing ENTER to open menu and check contents...")
+            page.keyboard.press("Enter")
+            with timer.step(f"open panel menu (tab {i})", replaced_sleep=1.5):
+                wait_for_popover(page)
+            
+            # Loop allows us to try the next panel if this isn't the one
+            if download_from_open_menu(page, timer) is not None:
+                return True
+    return False
+
 def download_csv_via_keyboard():
     """
     Use keyboard shortcuts to access the Inspector/Download CSV.
     """
     Path("downloads").mkdir(exist_ok=True)
+    timer = StepTimer("keyboard export")
+    panels = PanelIndex()
     
     with sync_playwright() as p:
         print("🚀 Kibana CSV Download - Keyboard Shortcut Shortcut (Improved v4)")
         print("=" * 60)
         
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        browser, context, page = open_kibana_page(p)  # headless unless KIBANA_HEADFUL=1
         
         # Navigate to the Services dashboard
         url = "https://demo.elastic.co/app/dashboards#/view/kubernetes-ff1b3850-bcb1-11ec-b64f-7dd6e8e82013?_g=(filters:!(),refreshInterval:(pause:!t,value:60000),time:(from:now-15m,to:now))"
@@ -43,14 +167,16 @@ def download_csv_via_keyboard():
             print("⏩ No cookie dialog")
         
         # Wait for dashboard to load
-        print("⏳ Waiting for dashboard (15s)...")
-        time.sleep(15)
+        print("⏳ Waiting for dashboard to render...")
+        with timer.step("dashboard load", replaced_sleep=15):
+            wait_for_dashboard(page)
         
         # Scroll to bottom and click Services link
         print("📜 Scrolling to find 'Services' link...")
-        for _ in range(5):
-            page.keyboard.press("PageDown")
-            time.sleep(0.5)
+        with timer.step("scroll to bottom", replaced_sleep=2.5):
+            for _ in range(5):
+                page.keyboard.press("PageDown")
+            wait_for_dashboard(page, timeout=10000)  # lazily loaded panels
         
         try:
             services_link = page.locator('a:has-text("[Metrics Kubernetes] Services"), button:has-text("[Metrics Kubernetes] Services"), :text("[Metrics Kubernetes] Services")').first
@@ -59,8 +185,9 @@ def download_csv_via_keyboard():
             print("✅ Clicked 'Services' link")
             
             # Wait for dashboard update
-            print("⏳ Waiting for dashboard to update (10s)...")
-            time.sleep(10)
+            print("⏳ Waiting for dashboard to update...")
+            with timer.step("services dashboard load", replaced_sleep=10):
+                wait_for_dashboard(page)
             
         except Exception as e:
             print(f"⚠️ Could not click Services link: {e}")
@@ -75,7 +202,6 @@ def download_csv_via_keyboard():
             if panel_title.count() > 0:
                 print("   Found panel 'Services Informations [Metrics Kubernetes]'")
                 panel_title.scroll_into_view_if_needed()
-                time.sleep(1)
             
             # Find the column header by text
             # The header cell contains the column name and a kebab menu button
@@ -86,7 +212,8 @@ def download_csv_via_keyboard():
                 print(f"   Found '{sort_column}' header cell.")
                 header_cell.scroll_into_view_if_needed()
                 header_cell.hover()  # This should reveal the kebab menu
-                time.sleep(0.5)
+                with timer.step("reveal column menu", replaced_sleep=0.5):
+                    wait_for_visible(page, f'th:has-text("{sort_column}") button, div[role="columnheader"]:has-text("{sort_column}") button', timeout=2000)
                 
                 # Look for the 3-dots button within or near the header
                 # Usually it's a button with aria-label mentioning column options or actions
@@ -96,7 +223,8 @@ def download_csv_via_keyboard():
                 if menu_button.count() > 0:
                     print("   Found 3-dots menu button. Clicking...")
                     menu_button.click()
-                    time.sleep(1)
+                    with timer.step("open column menu", replaced_sleep=1):
+                        wait_for_popover(page)
                     
                     # Find "Sort descending" option in the popup menu
                     sort_desc = page.locator('button, span').filter(has_text="Sort descending").first
@@ -104,7 +232,8 @@ def download_csv_via_keyboard():
                     if sort_desc.count() > 0 and sort_desc.is_visible():
                         print("   Found 'Sort descending'. Clicking...")
                         sort_desc.click()
-                        time.sleep(2)  # Wait for table to re-sort
+                        with timer.step("table re-sort", replaced_sleep=2):
+                            wait_for_dashboard(page, timeout=15000)
                         print("   ✅ Sorting complete!")
                     else:
                         print("   ⚠️ 'Sort descending' not found. Menu items:")
@@ -132,133 +261,34 @@ def download_csv_via_keyboard():
         # ==================== STEP 2: DOWNLOAD CSV ====================
         print("\n📥 STEP 2: Finding panel menu to Download CSV...")
         
-        # Now try keyboard shortcuts to access Inspector
-        print("\n🎹 Trying keyboard shortcuts to reach panel menu...")
-        
-        # Strategy: Focus specifically on the "Service Information" panel container first
-        print("   Step 1: Clicking 'Service Information' panel to focus it...")
-        try:
-             # Find panel by text and get its parent container
-             panel_header = page.locator('span:has-text("Service Information"), h3:has-text("Service Information")').first
-             
-             # CLicking the header sets accessibility focus roughly in the right area
-             if panel_header.count() > 0:
-                 panel_header.scroll_into_view_if_needed()
-                 panel_header.click()
-                 time.sleep(1)
-             else:
-                 print("   ⚠️ Heading 'Service Information' not found, clicking page body center...")
-                 page.click("body")
-        except:
-             pass
-
-        print("⚠️ Starting TAB navigation loop to find relevant panel menu...")
-        
-        # Strategy 3: Tab navigation loop to find the "Panel options" button
-        # We start from the panel header focus (which we likely missed or is far up)
-        # We need to cycle through tab stops until we find a "Panel options" button
-        # AND verify it's the right one by checking its menu items.
-        
-        max_total_tabs = 150
+        # Strategy 1: panel index - one DOM query maps every panel title to its options button
+        target_panel = "Service Information"
         found_final_csv = False
+        with timer.step("locate panel (index)"):
+            menu_button = panels.menu_button(page, target_panel)
         
-        for i in range(max_total_tabs): 
-            page.keyboard.press("Tab")
-            time.sleep(0.05) # Fast tabs
-            
-            # Get info about focused element
-            focused_meta = page.evaluate("""() => {
-                const el = document.activeElement;
-                return {
-                    label: el.getAttribute('aria-label') || '',
-                    test_subj: el.getAttribute('data-test-subj') || '',
-                    text: el.innerText || ''
-                }
-            }""")
-            
-            focused_label = focused_meta['label'].lower()
-            focused_test_subj = focused_meta['test_subj']
-            
-            # Debug output to trace navigation occasionally
-            if i % 10 == 0: print(f"   [Tab {i}] Focused: label='{focused_label}' test_subj='{focused_test_subj}'")
-
-            # Check if we hit A panel options button
-            if (("panel options" in focused_label) or 
-                ("options for" in focused_label) or 
-                ("embeddablePanelToggleMenuIcon" in focused_test_subj)):
-                
-                print(f"✅ FOUND A Panel Options button at Tab {i}!")
-                print("   Pressing ENTER to open menu and check contents...")
-                page.keyboard.press("Enter")
-                time.sleep(1.5) # Wait for animation
-                
-                # Check if this menu has what we want
-                # Loop allows us to try the next panel if this isn't the one
-                
-                # Check 1: Direct Download CSV
-                download_option = page.locator('button:has-text("Download CSV"), span:has-text("Download CSV")')
-                
-                # FIX: Check count AND use .first to avoid strict mode error
-                if download_option.count() > 0 and download_option.first.is_visible():
-                    print("   🎉 Found visible 'Download CSV', clicking...")
-                    with page.expect_download(timeout=30000) as download_info:
-                        download_option.first.click()
-                    download = download_info.value
-                    filepath = Path("downloads") / download.suggested_filename
-                    download.save_as(filepath)
-                    print(f"✅ SUCCESS! Downloaded: {filepath}")
-                    
-                    # Wait to ensure filesystem flush
-                    print("⏳ Waiting for file to save...")
-                    time.sleep(5)
-                    
-                    found_final_csv = True
-                    break
-                
-                # Check 2: Inspect -> Download
-                inspect_option = page.locator('button:has-text("Inspect"), span:has-text("Inspect")')
-                if inspect_option.count() > 0 and inspect_option.first.is_visible():
-                     print("   Found 'Inspect', clicking to check for CSV...")
-                     inspect_option.first.click()
-                     time.sleep(3)
-                     
-                     download_btn = page.locator('button:has-text("Download CSV"), [data-test-subj="inspectorDownloadCSV"]')
-                     if download_btn.count() > 0 and download_btn.first.is_visible():
-                         print("   🎉 Found 'Download CSV' in Inspector!")
-                         with page.expect_download() as dl_info:
-                             download_btn.first.click()
-                         dl = dl_info.value
-                         fp = Path("downloads") / dl.suggested_filename
-                         dl.save_as(fp)
-                         print(f"✅ SUCCESS! Downloaded: {fp}")
-                         
-                         # Wait to ensure filesystem flush
-                         print("⏳ Waiting for file to save...")
-                         time.sleep(50)
-                         
-                         found_final_csv = True
-                         break
-                     else:
-                         print("   ❌ Download CSV not found in Inspector. Closing Inspector...")
-                         # Close inspector to resume navigation? 
-                         # Usually inspector takes over context. Might need to close flyout.
-                         # Try pressing Escape
-                         page.keyboard.press("Escape")
-                         time.sleep(1)
-                else:
-                    print("   ❌ Neither 'Download CSV' nor 'Inspect' found in this menu.")
-                    # Close the menu to continue tabbing
-                    print("   Closing menu (Pressing Escape) and continuing search...")
-                    page.keyboard.press("Escape")
-                    time.sleep(1)
+        if menu_button is not None:
+            print(f"✅ Found '{target_panel}' options button via panel index ({panels.evaluations} DOM queries)")
+            menu_button.click()
+            with timer.step("open panel menu", replaced_sleep=1.5):
+                wait_for_popover(page)
+            found_final_csv = download_from_open_menu(page, timer) is not None
+        else:
+            print(f"⚠️ '{target_panel}' not in panel index. Panels found:")
+            for line in panels.summary(page):
+                print(f"      {line}")
+        
+        if not found_final_csv:
+            with timer.step("tab navigation fallback"):
+                found_final_csv = tab_to_panel_menu(page, target_panel, timer)
                     
         if not found_final_csv:
             print("❌ Exhausted all TAB attempts. Could not find a panel with CSV download.")
             # page.screenshot(path="error_tab_nav_exhausted.png") # commented out
         
         print("\n✅ Done!")
-        time.sleep(2)
-        browser.close()
+        timer.report()
+        close_kibana_page(browser, context)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@ from playwright.sync_api import sync_playwright
 import time
 from pathlib import Path
 
+from kibana_browser_profile import close_kibana_page, open_kibana_page
+
 def download_csv_via_keyboard():
     """
     Use keyboard shortcuts to access the Inspector/Download CSV.
@@ -27,8 +29,7 @@ def download_csv_via_keyboard():
         print("🚀 Kibana CSV Download - Keyboard Shortcut Shortcut (Improved v4)")
         print("=" * 60)
         
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        browser, context, page = open_kibana_page(p)  # headless unless KIBANA_HEADFUL=1
         
         # Navigate to the Services dashboard
         url = "https://demo.elastic.co/app/dashboards#/view/kubernetes-ff1b3850-bcb1-11ec-b64f-7dd6e8e82013?_g=(filters:!(),refreshInterval:(pause:!t,value:60000),time:(from:now-15m,to:now))"
@@ -282,7 +283,7 @@ def download_csv_via_keyboard():
         
         print("\n✅ Done!")
         time.sleep(2)
-        browser.close()
+        close_kibana_page(browser, context)
 
 
 if __name__ == "__main__":
@@ -17,6 +17,8 @@ from selenium.webdriver.common.action_chains import ActionChains
 from pathlib import Path
 import time
 
+from kibana_browser_profile import apply_selenium_profile, selenium_options
+
 def download_kibana_csv_selenium(download_dir="./downloads"):
     """
     Automate CSV download from Kibana using Selenium.
@@ -25,20 +27,12 @@ def download_kibana_csv_selenium(download_dir="./downloads"):
     download_path = Path(download_dir).absolute()
     download_path.mkdir(exist_ok=True)
     
-    # Configure Chrome options
-    chrome_options = webdriver.ChromeOptions()
-    prefs = {
-        "download.default_directory": str(download_path),
-        "download.prompt_for_download": False,
-        "download.directory_upgrade": True,
-        "safebrowsing.enabled": True
-    }
-    chrome_options.add_experimental_option("prefs", prefs)
-    # chrome_options.add_argument("--headless")
+    # Shared profile: headless unless KIBANA_HEADFUL=1, images/fonts/analytics blocked
+    chrome_options = selenium_options(download_path)
     
     print("🚀 Launching Chrome...")
     driver = webdriver.Chrome(options=chrome_options)
-    driver.maximize_window()
+    apply_selenium_profile(driver, download_path)
     wait = WebDriverWait(driver, 15) # Default wait
     
     try:
@@ -4,16 +4,20 @@ Minimal waits, maximum compatibility
 """
 
 from playwright.sync_api import sync_playwright
-import time
 from pathlib import Path
 
+from kibana_browser_profile import close_kibana_page, open_kibana_page
+from kibana_waits import (
+    StepTimer, save_download, wait_for_dashboard, wait_for_popover, wait_for_visible
+)
+
 def download_kibana_csv():
     Path("downloads").mkdir(exist_ok=True)
+    timer = StepTimer("ultra simple export")
     
     with sync_playwright() as p:
         print("🚀 Starting...")
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+        browser, context, page = open_kibana_page(p)  # headless unless KIBANA_HEADFUL=1
         
         # Navigate
         print("📊 Loading dashboard...")
@@ -26,15 +30,17 @@ def download_kibana_csv():
         except:
             print("⏩ No cookie dialog")
         
-        # Wait for load - intentionally long to ensure dashboard renders
-        print("⏳ Waiting for page load (15s)...")
-        time.sleep(15)
+        # Wait until every panel reports render-complete (was a fixed 15s)
+        print("⏳ Waiting for dashboard to render...")
+        with timer.step("dashboard load", replaced_sleep=15):
+            wait_for_dashboard(page)
         
         # Scroll to bottom to find "Services"
         print("📜 Scrolling to bottom...")
-        for _ in range(5):
-            page.keyboard.press("PageDown")
-            time.sleep(0.5)
+        with timer.step("scroll to bottom", replaced_sleep=2.5):
+            for _ in range(5):
+                page.keyboard.press("PageDown")
+            wait_for_dashboard(page, timeout=10000)  # lazily loaded panels
         
         # Click "Services" link
         try:
@@ -53,8 +59,9 @@ def download_kibana_csv():
             print("✅ Clicked 'Services' link")
             
             # Wait for new dashboard to load
-            print("⏳ Waiting for 'Services' dashboard (10s)...")
-            time.sleep(10)
+            print("⏳ Waiting for 'Services' dashboard...")
+            with timer.step("services dashboard load", replaced_sleep=10):
+                wait_for_dashboard(page)
             
         except Exception as e:
             print(f"❌ Failed to find/click 'Services': {e}")
@@ -71,35 +78,35 @@ def download_kibana_csv():
                 namespace_btn.first.scroll_into_view_if_needed()
                 namespace_btn.first.click()
                 print("   Opened Namespace Name dropdown")
-                time.sleep(1.5)
+                with timer.step("namespace dropdown", replaced_sleep=1.5):
+                    wait_for_popover(page)
                 
                 # We can find the search input "Starts with..."
                 search_input = page.get_by_placeholder("Starts with...", exact=False).first
                 
                 for option in ["green", "observe-green", "blue"]:
                     print(f"   Selecting '{option}'...")
-                    if search_input.is_visible():
-                        search_input.fill(option)
-                        time.sleep(1) # wait for list to filter
+                    with timer.step(f"select '{option}'", replaced_sleep=2.5):
+                        if search_input.is_visible():
+                            search_input.fill(option)
+                            
+                        # Find exact text in the UI. Popovers are appended to body, so last() usually hits the popover element.
+                        # click() waits for the filtered option to appear, so no sleep is needed
+                        try:
+                            option_el = page.get_by_text(option, exact=True).last
+                            option_el.click(timeout=3000)
+                            print(f"   ✅ Clicked '{option}'")
+                        except Exception as ex:
+                            print(f"   ❌ Could not find/click exact text '{option}': {ex}")
                         
-                    # Find exact text in the UI. Popovers are appended to body, so last() usually hits the popover element.
-                    try:
-                        option_el = page.get_by_text(option, exact=True).last
-                        option_el.click(timeout=3000)
-                        print(f"   ✅ Clicked '{option}'")
-                    except Exception as ex:
-                        print(f"   ❌ Could not find/click exact text '{option}': {ex}")
-                    
-                    time.sleep(1)
-                    
-                    if search_input.is_visible():
-                        search_input.fill("") # clear for next
-                        time.sleep(0.5)
+                        if search_input.is_visible():
+                            search_input.fill("") # clear for next
                         
                 # Close the dropdown
                 page.keyboard.press("Escape")
                 print("✅ Namespaces selected")
-                time.sleep(5)  # allow dashboard to refresh after changing filters
+                with timer.step("dashboard refresh after filter", replaced_sleep=5):
+                    wait_for_dashboard(page)
                 
             else:
                 print("❌ 'Namespace Name' button not found.")
@@ -130,7 +137,8 @@ def download_kibana_csv():
                 except:
                     print("   Could not hover over title, proceeding...")
                 
-                time.sleep(1)
+                with timer.step("reveal panel menu", replaced_sleep=1):
+                    wait_for_visible(page, '[data-test-subj="embeddablePanelToggleMenuIcon"], button[aria-label*="Panel options"]', timeout=2000)
                 
                 # 2. Look for the menu button specifically near this title
                 # The button is usually a sibling or cousin in the DOM.
@@ -163,7 +171,8 @@ def download_kibana_csv():
                 if menu_btn.is_visible():
                     print("   Clicking panel options button...")
                     menu_btn.click()
-                    time.sleep(1)
+                    with timer.step("open panel menu", replaced_sleep=1):
+                        wait_for_popover(page)
                     
                     # 3. Choose "Download CSV"
                     # Try "Inspect" -> "Download CSV" flow as it's often the default for tables
@@ -177,7 +186,8 @@ def download_kibana_csv():
                         if inspect_item.is_visible():
                             print("   Opening Inspector...")
                             inspect_item.click()
-                            time.sleep(3)
+                            with timer.step("open inspector", replaced_sleep=3):
+                                wait_for_visible(page, '[data-test-subj="inspectorDownloadCSV"], button:has-text("Download CSV")', timeout=10000)
                             download_item = page.locator('button:has-text("Download CSV"), span:has-text("Download CSV"), [data-test-subj="inspectorDownloadCSV"]')
                     
                     if download_item.is_visible():
@@ -187,7 +197,7 @@ def download_kibana_csv():
                          
                          download = download_info.value
                          filepath = Path("downloads") / download.suggested_filename
-                         download.save_as(filepath)
+                         save_download(download, filepath)
                          
                          print(f"✅ SUCCESS! Downloaded to: {filepath}")
                          print(f"📊 File size: {filepath.stat().st_size} bytes")
@@ -217,8 +227,8 @@ def download_kibana_csv():
             print("Screenshot saved: error_download.png")
         
         print("\n✅ Done!")
-        time.sleep(2)
-        browser.close()
+        timer.report()
+        close_kibana_page(browser, context)
 
 if __name__ == "__main__":
     download_kibana_csv()
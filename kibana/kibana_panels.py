@@ -0,0 +1,132 @@
+"""
+Kibana dashboard panel index for Playwright
+Finds every embeddable panel, its title and its "Panel options" button in a
+single page.evaluate() call, instead of pressing Tab and inspecting
+document.activeElement once per tab stop.
+
+Each panel (and its options button) is tagged with a data attribute so later
+lookups are a plain CSS selector. The title -> panel map is cached per
+dashboard, so repeat lookups on the same dashboard cost no extra evaluate
+round-trip; the cache is rebuilt automatically when the tags are gone
+(navigation, re-render).
+
+Usage:
+    from kibana_panels import PanelIndex
+
+    panels = PanelIndex()
+    menu_button = panels.menu_button(page, "Service Information")
+    if menu_button:
+        menu_button.click()
+"""
+
+from urllib.parse import urlsplit
+
+PANEL_ATTR = "data-kbn-panel-idx"
+MENU_ATTR = "data-kbn-panel-menu"
+
+PANEL_SELECTOR = '[data-test-subj="embeddablePanel"], [data-test-subj^="embeddablePanel "]'
+MENU_SELECTOR = '[data-test-subj="embeddablePanelToggleMenuIcon"], button[aria-label*="Panel options"], button[aria-label*="options for"]'
+TITLE_SELECTOR = '[data-test-subj="dashboardPanelTitle"], .embPanel__titleText, figcaption'
+
+# One round-trip: enumerate panels, read titles, tag panel + options button
+INDEX_PANELS_JS = """([panelSel, menuSel, titleSel, panelAttr, menuAttr]) => {
+    return Array.from(document.querySelectorAll(panelSel)).map((panel, i) => {
+        panel.setAttribute(panelAttr, String(i));
+        const titleEl = panel.querySelector(titleSel);
+        const menu = panel.querySelector(menuSel);
+        if (menu) menu.setAttribute(menuAttr, String(i));
+        const menuLabel = menu ? (menu.getAttribute('aria-label') || '') : '';
+        let title = titleEl ? titleEl.innerText.trim() : '';
+        if (!title && menuLabel.toLowerCase().includes('options for ')) {
+            title = menuLabel.slice(menuLabel.toLowerCase().indexOf('options for ') + 12).trim();
+        }
+        return {
+            index: i,
+            title: title || panel.getAttribute('aria-label') || '',
+            embeddable_id: panel.getAttribute('data-test-embeddable-id') || panel.closest('[data-test-embeddable-id]')?.getAttribute('data-test-embeddable-id') || '',
+            has_menu: !!menu,
+            render_complete: panel.closest('[data-render-complete]')?.getAttribute('data-render-complete') === 'true',
+        };
+    });
+}"""
+
+def dashboard_key(url):
+    """Cache key for a dashboard: path + hash route without the _g/_a state (time range, filters)"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}#{parts.fragment.split('?')[0]}"
+
+def index_panels(page):
+    """List of {index, title, embeddable_id, has_menu, render_complete} for every panel on the page"""
+    return page.evaluate(INDEX_PANELS_JS, [PANEL_SELECTOR, MENU_SELECTOR, TITLE_SELECTOR, PANEL_ATTR, MENU_ATTR])
+
+async def index_panels_async(page):
+    return await page.evaluate(INDEX_PANELS_JS, [PANEL_SELECTOR, MENU_SELECTOR, TITLE_SELECTOR, PANEL_ATTR, MENU_ATTR])
+
+def match_panel(panels, title):
+    """Exact (case-insensitive) title match first, then substring; None if nothing matches"""
+    wanted = title.strip().lower()
+    for panel in panels:
+        if panel["title"].lower() == wanted:
+            return panel
+    for panel in panels:
+        if wanted in panel["title"].lower():
+            return panel
+    return None
+
+class PanelIndex:
+    """Per-dashboard cache of the panel map built by index_panels()"""
+    def __init__(self):
+        self.cache = {}
+        self.evaluations = 0  # browser round-trips spent building the index
+
+    def panels(self, page, refresh=False):
+        key = dashboard_key(page.url)
+        if refresh or key not in self.cache:
+            self.cache[key] = index_panels(page)
+            self.evaluations += 1
+        return self.cache[key]
+
+    def find(self, page, title):
+        """Panel info for title, rebuilding the index once if the cached map has no match"""
+        panel = match_panel(self.panels(page), title)
+        if panel is None:
+            panel = match_panel(self.panels(page, refresh=True), title)
+        return panel
+
+    def _locate(self, page, title, attr):
+        panel = self.find(page, title)
+        if panel is None:
+            return None
+        locator = page.locator(f'[{attr}="{panel["index"]}"]')
+        if locator.count() == 0:
+            # Tags were lost (navigation / re-render): retag and try again
+            panel = match_panel(self.panels(page, refresh=True), title)
+            if panel is None:
+                return None
+            locator = page.locator(f'[{attr}="{panel["index"]}"]')
+        return locator.first if locator.count() > 0 else None
+
+    def panel(self, page, title):
+        """Locator for the panel container, or None"""
+        return self._locate(page, title, PANEL_ATTR)
+
+    def menu_button(self, page, title):
+        """
+        Locator for the panel's options button, or None.
+        The button is only shown on hover, so the panel is scrolled into view
+        and hovered first.
+        """
+        panel = self.panel(page, title)
+        if panel is None:
+            return None
+        panel.scroll_into_view_if_needed()
+        panel.hover()
+        button = panel.locator(f"[{MENU_ATTR}]")
+        return button.first if button.count() > 0 else None
+
+    def summary(self, page):
+        """Printable lines for every indexed panel (debugging)"""
+        return [
+            f"[{p['index']:>2}] {p['title'] or '(untitled)'}{'' if p['has_menu'] else '  (no options menu)'}"
+            for p in self.panels(page)
+        ]
@@ -0,0 +1,197 @@
+"""
+Kibana Reporting API client with adaptive polling and streamed downloads
+Report jobs are polled with exponential backoff + jitter (honouring
+Retry-After) instead of a fixed 10s sleep, finished reports are streamed to
+disk in chunks, and many jobs run concurrently through asyncio with a cap on
+in-flight requests.
+
+Usage:
+    python kibana_report_client.py --kibana-url https://kibana:5601 --jobs jobs.json --concurrency 8
+
+jobs.json:
+    [{"index_pattern": "logs-*", "query": "status:500", "title": "errors", "output": "errors.csv"}, ...]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+KIBANA_HEADERS = {
+    "kbn-xsrf": "true",  # Required for Kibana API calls
+    "Content-Type": "application/json",
+}
+
+class ReportError(Exception):
+    """Report generation or download failed; status is the HTTP status (None for timeouts)"""
+    def __init__(self, message, status=None, body=""):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+def build_csv_payload(index_pattern, query="*", title="Exported Data", columns=None):
+    """Request body for POST /api/reporting/generate/csv_searchsource"""
+    return {
+        "browserTimezone": "UTC",
+        "objectType": "search",
+        "searchSource": {
+            "type": "search",
+            "query": {
+                "query": query,
+                "language": "kuery"
+            },
+            "index": index_pattern,
+            "filter": []
+        },
+        "columns": columns or [],  # Empty = all columns
+        "title": title
+    }
+
+class ReportJobClient:
+    """
+    Asyncio front-end over requests.
+    Blocking HTTP calls run in worker threads (asyncio.to_thread) with one
+    requests.Session per thread; a semaphore caps concurrent report jobs.
+    """
+    def __init__(
+        self,
+        kibana_url,
+        auth=None,
+        headers=None,
+        max_concurrency=4,
+        initial_delay=1.0,
+        max_delay=30.0,
+        timeout=600,
+        chunk_size=1024 * 1024
+    ):
+        self.kibana_url = kibana_url.rstrip("/")
+        self.auth = auth
+        self.headers = {**KIBANA_HEADERS, **(headers or {})}
+        self.max_concurrency = max_concurrency
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._local = threading.local()
+        self._semaphore = None
+        self._loop = None
+
+    def _session(self):
+        if not hasattr(self._local, "session"):
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.auth = self.auth
+            self._local.session = session
+        return self._local.session
+
+    def _generate(self, payload, job_type):
+        response = self._session().post(f"{self.kibana_url}/api/reporting/generate/{job_type}", json=payload)
+        if response.status_code != 200:
+            raise ReportError(f"report request failed ({response.status_code})", response.status_code, response.text)
+        return response.json()["path"]
+
+    def _try_download(self, job_path, dest):
+        """
+        One poll. Streams the report to dest when ready and returns (True, None);
+        otherwise (False, retry_after_seconds or None).
+        """
+        with self._session().get(f"{self.kibana_url}{job_path}", stream=True) as response:
+            content_type = response.headers.get("Content-Type", "")
+            if response.status_code == 200 and ("text/csv" in content_type or "application/csv" in content_type):
+                partial = dest.with_suffix(dest.suffix + ".part")
+                with open(partial, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        f.write(chunk)
+                partial.replace(dest)
+                return True, None
+            if response.status_code in (200, 202, 503):
+                # Still pending/processing (Kibana answers 503 + Retry-After while the job runs)
+                retry_after = response.headers.get("Retry-After")
+                return False, float(retry_after) if retry_after and retry_after.isdigit() else None
+            raise ReportError(f"report job failed ({response.status_code})", response.status_code, response.text[:500])
+
+    def _limit(self):
+        """Concurrency semaphore for the running event loop (recreated per asyncio.run)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _next_delay(self, delay):
+        """Exponential backoff with full jitter"""
+        return min(self.max_delay, delay * 2), random.uniform(0, delay)
+
+    async def export(self, payload, dest, job_type="csv_searchsource"):
+        """Generate one report and stream it to dest; returns the Path"""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+
+        async with self._limit():
+            start = time.perf_counter()
+            job_path = await asyncio.to_thread(self._generate, payload, job_type)
+            print(f"✅ Report job created: {job_path}")
+
+            delay = self.initial_delay
+            polls = 0
+            while time.perf_counter() - start < self.timeout:
+                delay, wait = self._next_delay(delay)
+                await asyncio.sleep(wait)
+                polls += 1
+                done, retry_after = await asyncio.to_thread(self._try_download, job_path, dest)
+                if done:
+                    elapsed = time.perf_counter() - start
+                    print(f"✅ Downloaded {dest} ({dest.stat().st_size:,} bytes) after {polls} polls, {elapsed:.1f}s")
+                    return dest
+                if retry_after is not None:
+                    await asyncio.sleep(max(0.0, min(retry_after, self.max_delay) - wait))
+            raise ReportError(f"timed out after {self.timeout}s waiting for {job_path}")
+
+    async def export_many(self, jobs, job_type="csv_searchsource"):
+        """
+        Run (payload, dest) jobs concurrently (at most max_concurrency at once).
+        Returns one result per job: the Path, or the exception it raised.
+        """
+        return await asyncio.gather(
+            *(self.export(payload, dest, job_type) for payload, dest in jobs),
+            return_exceptions=True
+        )
+
+def export_reports(kibana_url, jobs, auth=None, concurrency=4):
+    """Sync entry point: jobs is a list of (payload, dest) tuples"""
+    client = ReportJobClient(kibana_url, auth=auth, max_concurrency=concurrency)
+    return asyncio.run(client.export_many(jobs))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export many Kibana CSV reports concurrently")
+    parser.add_argument("--kibana-url", required=True)
+    parser.add_argument("--jobs", required=True, help="JSON list of {index_pattern, query, title, output}")
+    parser.add_argument("--output-dir", default="./downloads")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--user")
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    with open(args.jobs, encoding="utf-8") as f:
+        specs = json.load(f)
+    jobs = [
+        (
+            build_csv_payload(spec["index_pattern"], spec.get("query", "*"), spec.get("title", "Exported Data")),
+            Path(args.output_dir) / spec.get("output", f"report_{i}.csv"),
+        )
+        for i, spec in enumerate(specs)
+    ]
+
+    print(f"🚀 Exporting {len(jobs)} reports (concurrency {args.concurrency})")
+    start = time.perf_counter()
+    auth = (args.user, args.password) if args.user else None
+    results = export_reports(args.kibana_url, jobs, auth=auth, concurrency=args.concurrency)
+    failed = [(dest, r) for (_, dest), r in zip(jobs, results) if isinstance(r, Exception)]
+    for dest, error in failed:
+        print(f"❌ {dest}: {error}")
+    print(f"\n✅ {len(jobs) - len(failed)}/{len(jobs)} reports in {time.perf_counter() - start:.1f}s")
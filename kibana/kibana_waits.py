@@ -0,0 +1,173 @@
+"""
+Kibana readiness waits for Playwright (sync + async)
+Replaces fixed time.sleep() calls with waits that return as soon as the
+page is actually ready:
+- network idle (no requests in flight for 500ms)
+- Kibana's global loading indicator gone
+- every dashboard panel reporting data-render-complete="true"
+- popovers / flyouts visible, downloads finished
+
+StepTimer records how long each step really took next to the fixed sleep
+it replaced and prints/logs the savings.
+
+Usage:
+    from kibana_waits import StepTimer, wait_for_dashboard
+
+    timer = StepTimer("keyboard export")
+    with timer.step("dashboard load", replaced_sleep=15):
+        wait_for_dashboard(page)
+    timer.report()
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+LOADING_INDICATOR = '[data-test-subj="globalLoadingIndicator"]'
+POPOVER = '.euiPopover__panel, .euiContextMenuPanel, [role="listbox"]'
+INSPECTOR = '[data-test-subj="inspectorPanel"]'
+
+# True when no loading indicator is shown and every shared item (dashboard panel)
+# has finished rendering. Pages without a dashboard only check the indicator.
+RENDER_COMPLETE_JS = """() => {
+    if (document.querySelector('[data-test-subj="globalLoadingIndicator"]')) return false;
+    const container = document.querySelector('[data-shared-items-count]');
+    if (!container) return true;
+    const expected = parseInt(container.getAttribute('data-shared-items-count'), 10) || 0;
+    const done = container.querySelectorAll('[data-shared-item][data-render-complete="true"]').length;
+    return done >= expected;
+}"""
+
+# ==================== SYNC (playwright.sync_api) ====================
+
+def wait_for_network_idle(page, timeout=15000):
+    """Wait for network idle; Kibana's background polling can prevent it, so time out quietly"""
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_for_kibana_idle(page, timeout=30000):
+    """Network idle + global loading indicator hidden (any Kibana app, e.g. Discover)"""
+    wait_for_network_idle(page, timeout=min(timeout, 15000))
+    try:
+        page.wait_for_selector(LOADING_INDICATOR, state="detached", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_for_dashboard(page, timeout=60000):
+    """Dashboard fully rendered: loading indicator gone and all panels render-complete"""
+    wait_for_network_idle(page, timeout=min(timeout, 15000))
+    try:
+        page.wait_for_function(RENDER_COMPLETE_JS, timeout=timeout, polling=250)
+        return True
+    except Exception:
+        return False
+
+def wait_for_visible(page, selector, timeout=5000):
+    """First match of selector visible (popover, menu item, flyout...); False on timeout"""
+    try:
+        page.locator(selector).first.wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def wait_for_popover(page, timeout=5000):
+    return wait_for_visible(page, POPOVER, timeout)
+
+def wait_for_hidden(page, selector, timeout=5000):
+    try:
+        page.locator(selector).first.wait_for(state="hidden", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+def save_download(download, dest):
+    """save_as() returns once the download has finished, so no post-download sleep is needed"""
+    download.save_as(dest)
+    failure = download.failure()
+    if failure:
+        raise RuntimeError(f"download failed: {failure}")
+    return dest
+
+# ==================== ASYNC (playwright.async_api) ====================
+
+async def wait_for_network_idle_async(page, timeout=15000):
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_for_kibana_idle_async(page, timeout=30000):
+    await wait_for_network_idle_async(page, timeout=min(timeout, 15000))
+    try:
+        await page.wait_for_selector(LOADING_INDICATOR, state="detached", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def wait_for_dashboard_async(page, timeout=60000):
+    await wait_for_network_idle_async(page, timeout=min(timeout, 15000))
+    try:
+        await page.wait_for_function(RENDER_COMPLETE_JS, timeout=timeout, polling=250)
+        return True
+    except Exception:
+        return False
+
+async def wait_for_visible_async(page, selector, timeout=5000):
+    try:
+        await page.locator(selector).first.wait_for(state="visible", timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+async def save_download_async(download, dest):
+    await download.save_as(dest)
+    failure = await download.failure()
+    if failure:
+        raise RuntimeError(f"download failed: {failure}")
+    return dest
+
+# ==================== TIMING ====================
+
+class StepTimer:
+    """Per-step wall time vs the fixed sleep each step used to take"""
+    def __init__(self, name):
+        self.name = name
+        self.steps = []
+
+    @contextmanager
+    def step(self, label, replaced_sleep=0.0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append({
+                "step": label,
+                "seconds": round(time.perf_counter() - start, 3),
+                "replaced_sleep": replaced_sleep,
+            })
+
+    def report(self, log_path="kibana_step_timings.jsonl"):
+        """Print the per-step table and append one JSON line per run to log_path"""
+        total = sum(s["seconds"] for s in self.steps)
+        baseline = sum(s["replaced_sleep"] for s in self.steps)
+        print(f"\n⏱️  Step timings ({self.name}):")
+        for s in self.steps:
+            saved = s["replaced_sleep"] - s["seconds"]
+            print(f"   {s['step']:<32} {s['seconds']:>6.1f}s  (fixed sleep {s['replaced_sleep']:>5.1f}s, saved {saved:+.1f}s)")
+        print(f"   {'TOTAL':<32} {total:>6.1f}s  (fixed sleeps {baseline:>5.1f}s, saved {baseline - total:+.1f}s)")
+
+        if log_path:
+            with open(log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({
+                    "run": self.name,
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                    "total_seconds": round(total, 3),
+                    "replaced_sleep_seconds": baseline,
+                    "steps": self.steps,
+                }) + "\n")
@@ -0,0 +1,198 @@
+"""
+Local Elasticsearch stand-in for testing the streaming exporters
+Serves a deterministic synthetic log index of any size (documents are
+generated from their ordinal, nothing is held in memory) and implements
+just enough of the API: mappings, point-in-time + search_after, scroll and
+sliced queries. --latency-ms adds a per-request delay so parallel exports can be
+benchmarked the way a real cluster's query threads behave.
+
+Usage:
+    python mock_es_server.py --docs 1000000 --port 9200
+    python kibana_csv_api.py --es-url http://127.0.0.1:9200 --index logs
+"""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+HOSTS = ["web-01", "web-02", "api-01", "db-01"]
+PATHS = ["/", "/login", "/cart", "/checkout", "/api/orders", "/static/app.js"]
+STATUS = [200, 200, 200, 200, 301, 404, 500, 503]
+
+# Index mapping matching make_doc (GET /{index}/_mapping)
+MAPPING = {
+    "properties": {
+        "@timestamp": {"type": "date"},
+        "host": {"properties": {"name": {"type": "keyword"}, "ip": {"type": "ip"}}},
+        "http": {"properties": {
+            "request": {"properties": {"method": {"type": "keyword"}}},
+            "response": {"properties": {"status_code": {"type": "long"}}},
+        }},
+        "url": {"properties": {"path": {"type": "text", "fields": {"keyword": {"type": "keyword"}}}}},
+        "bytes": {"type": "long"},
+        "tags": {"type": "keyword"},
+        "error": {"properties": {"message": {"type": "text"}, "code": {"type": "keyword"}}},
+        "user": {"properties": {"id": {"type": "keyword"}}},
+    }
+}
+
+def make_doc(i):
+    """Synthetic nested log document; some fields only appear on some docs"""
+    doc = {
+        "@timestamp": f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}Z",
+        "host": {"name": HOSTS[i % len(HOSTS)], "ip": f"10.0.{i % 256}.{(i * 13) % 256}"},
+        "http": {"request": {"method": "GET" if i % 5 else "POST"}, "response": {"status_code": STATUS[i % len(STATUS)]}},
+        "url": {"path": PATHS[i % len(PATHS)]},
+        "bytes": (i * 7919) % 50000,
+        "tags": ["synthetic", "web"] if i % 2 else ["synthetic"],
+    }
+    if doc["http"]["response"]["status_code"] >= 500:
+        doc["error"] = {"message": f"upstream failure #{i % 97}", "code": "E" + str(i % 9)}
+    if i % 11 == 0:
+        doc["user"] = {"id": f"user-{i % 1000}"}
+    return doc
+
+class MockES:
+    """In-memory cursor bookkeeping; documents are addressed by ordinal"""
+    def __init__(self, n_docs, pit=True, latency_ms=0):
+        self.n_docs = n_docs
+        self.pit = pit
+        self.latency = latency_ms / 1000
+        self.pits = set()
+        self.scrolls = {}
+        self.lock = threading.Lock()
+
+    def hits(self, start, size, slice_=None):
+        """Up to `size` docs from ordinal `start`; a slice owns the ordinals with i % max == id"""
+        if self.latency:
+            time.sleep(self.latency)
+        step = 1
+        if slice_:
+            step = slice_["max"]
+            start += (slice_["id"] - start) % step
+        stop = min(start + size * step, self.n_docs)
+        return [
+            {"_index": "logs", "_id": str(i), "_source": make_doc(i), "sort": [i]}
+            for i in range(start, stop, step)
+        ]
+
+    def open_pit(self):
+        pit_id = uuid.uuid4().hex
+        with self.lock:
+            self.pits.add(pit_id)
+        return {"id": pit_id}
+
+    def search(self, body):
+        pit = body.get("pit")
+        if pit and pit.get("id") not in self.pits:
+            return 404, {"error": {"type": "search_context_missing_exception"}}
+        size = body.get("size", 10)
+        after = body.get("search_after")
+        start = after[0] + 1 if after else body.get("from", 0)
+        response = {"took": 1, "hits": {"hits": self.hits(start, size, body.get("slice"))}}
+        if pit:
+            response["pit_id"] = pit["id"]
+        return 200, response
+
+    def open_scroll(self, body):
+        scroll_id = uuid.uuid4().hex
+        size = body.get("size", 10)
+        hits = self.hits(0, size, body.get("slice"))
+        with self.lock:
+            # Scroll state: next ordinal, page size, slice
+            self.scrolls[scroll_id] = [hits[-1]["sort"][0] + 1 if hits else self.n_docs, size, body.get("slice")]
+        return {"_scroll_id": scroll_id, "hits": {"hits": hits}}
+
+    def continue_scroll(self, scroll_id):
+        with self.lock:
+            state = self.scrolls.get(scroll_id)
+            if state is None:
+                return 404, {"error": {"type": "search_context_missing_exception"}}
+            start, size, slice_ = state
+        hits = self.hits(start, size, slice_)
+        with self.lock:
+            state[0] = hits[-1]["sort"][0] + 1 if hits else self.n_docs
+        return 200, {"_scroll_id": scroll_id, "hits": {"hits": hits}}
+
+def make_handler(es):
+    class Handler(BaseHTTPRequestHandler):
+        def _body(self):
+            length = int(self.headers.get("Content-Length", 0))
+            return json.loads(self.rfile.read(length) or b"{}") if length else {}
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self.do_POST()
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            parts = [p for p in url.path.split("/") if p]
+            body = self._body()
+
+            if parts[-1:] == ["_mapping"]:
+                self._send(200, {"logs": {"mappings": MAPPING}})
+            elif parts[-1:] == ["_pit"]:
+                if es.pit:
+                    self._send(200, es.open_pit())
+                else:
+                    # Pre-7.10 clusters reject the endpoint
+                    self._send(400, {"error": {"type": "illegal_argument_exception"}})
+            elif parts == ["_search", "scroll"]:
+                self._send(*es.continue_scroll(body.get("scroll_id")))
+            elif parts[-1:] == ["_search"] and "scroll" in params:
+                self._send(200, es.open_scroll(body))
+            elif parts[-1:] == ["_search"]:
+                self._send(*es.search(body))
+            else:
+                self._send(404, {"error": f"unsupported endpoint {url.path}"})
+
+        def do_DELETE(self):
+            body = self._body()
+            with es.lock:
+                es.pits.discard(body.get("id"))
+                for scroll_id in body.get("scroll_id", []) if isinstance(body.get("scroll_id"), list) else [body.get("scroll_id")]:
+                    es.scrolls.pop(scroll_id, None)
+            self._send(200, {"succeeded": True})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+class MockESServer(ThreadingHTTPServer):
+    request_queue_size = 128
+    daemon_threads = True
+
+def start_mock_server(n_docs=10000, host="127.0.0.1", port=0, pit=True, latency_ms=0):
+    """Start the mock in a background thread; returns (server, base_url)"""
+    server = MockESServer((host, port), make_handler(MockES(n_docs, pit=pit, latency_ms=latency_ms)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock Elasticsearch for export testing")
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--no-pit", action="store_true", help="behave like a pre-7.10 cluster (scroll only)")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every search/scroll request")
+    args = parser.parse_args()
+
+    server = MockESServer((args.host, args.port), make_handler(MockES(args.docs, pit=not args.no_pit, latency_ms=args.latency_ms)))
+    print(f"🚀 Mock Elasticsearch with {args.docs:,} docs on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✅ Stopped")
@@ -3,11 +3,20 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import logging
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest, NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+logger = logging.getLogger(__name__)
+
 
 class ScrapyCrawlerSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -101,3 +110,163 @@ class ScrapyCrawlerDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class _SlotWindow:
+    """AIMD state of one download slot (usually one domain)"""
+
+    def __init__(self, window, delay, samples=200):
+        self.window = window
+        self.base_delay = delay  # DOWNLOAD_DELAY, restored once a Retry-After pause is over
+        self.latency = None  # EWMA of page download latency
+        self.samples = deque(maxlen=samples)  # recent page latencies
+        self.baseline = None  # 10th percentile of the recent samples, so one fast response does not pin it
+        self.error_rate = 0.0  # EWMA of failed downloads
+        self.last_decrease = 0.0
+        self.paused_until = 0.0  # Retry-After deadline
+        self.ceiling = None  # window that was last throttled
+
+
+class AdaptiveConcurrencyMiddleware:
+    """
+    Per-domain concurrency tuned like TCP congestion control (AIMD):
+    - additive increase: +ADAPTIVE_CONCURRENCY_INCREASE per window of good responses, 10x slower
+      within one request of the window that was last throttled (probing the limit, like TCP CUBIC)
+    - multiplicative decrease (x ADAPTIVE_CONCURRENCY_DECREASE, at most once per latency period) on
+      429/503, an error rate above ADAPTIVE_CONCURRENCY_ERROR_RATE, or EWMA latency above
+      ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE x the domain's baseline latency (10th percentile of the last
+      ADAPTIVE_CONCURRENCY_BASELINE_SAMPLES page latencies, once ADAPTIVE_CONCURRENCY_MIN_SAMPLES were seen)
+    - only full page responses (2xx, not robots.txt) are latency samples: robots.txt, 304s and 4xx
+      answer much faster than pages and would make normal pages look congested
+    - Retry-After on 429/503 spaces the slot's requests by that many seconds (slot.delay) until it has passed
+    The window starts at CONCURRENT_REQUESTS_PER_DOMAIN and is written to the downloader slot,
+    so CONCURRENT_REQUESTS stays the global cap. Live values are in the crawl stats under
+    adaptive_concurrency/. Replaces AutoThrottle, which also owns slot.delay.
+
+    Must sit above HttpCacheMiddleware (900) to see raw responses before retries and the cache.
+    """
+
+    THROTTLE_CODES = (429, 503)
+
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool("ADAPTIVE_CONCURRENCY_ENABLED", True):
+            raise NotConfigured
+        if settings.getbool("AUTOTHROTTLE_ENABLED"):
+            raise NotConfigured("AdaptiveConcurrencyMiddleware and AutoThrottle both set slot.delay")
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.min_window = settings.getfloat("ADAPTIVE_CONCURRENCY_MIN", 1)
+        self.max_window = settings.getfloat("ADAPTIVE_CONCURRENCY_MAX", 32)
+        self.increase = settings.getfloat("ADAPTIVE_CONCURRENCY_INCREASE", 1.0)
+        self.decrease = settings.getfloat("ADAPTIVE_CONCURRENCY_DECREASE", 0.5)
+        self.latency_tolerance = settings.getfloat("ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE", 2.0)
+        self.max_error_rate = settings.getfloat("ADAPTIVE_CONCURRENCY_ERROR_RATE", 0.2)
+        self.alpha = settings.getfloat("ADAPTIVE_CONCURRENCY_EWMA", 0.2)
+        self.baseline_samples = settings.getint("ADAPTIVE_CONCURRENCY_BASELINE_SAMPLES", 200)
+        self.min_samples = settings.getint("ADAPTIVE_CONCURRENCY_MIN_SAMPLES", 20)
+        self.max_retry_after = settings.getfloat("ADAPTIVE_CONCURRENCY_MAX_RETRY_AFTER", 300)
+        self.debug = settings.getbool("ADAPTIVE_CONCURRENCY_DEBUG")
+        self.windows = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def process_response(self, request, response, spider):
+        if "cached" in response.flags or "download_latency" not in request.meta:
+            return response  # served by HttpCacheMiddleware, not a download
+        throttled = response.status in self.THROTTLE_CODES
+        failed = throttled or response.status >= 500
+        latency = request.meta["download_latency"] if self._is_page(request, response) else None
+        self._observe(request, spider, latency, failed, throttled,
+                      self._retry_after(response) if throttled else None)
+        return response
+
+    @staticmethod
+    def _is_page(request, response):
+        """Full page download, comparable with other pages of the domain"""
+        return 200 <= response.status < 300 and urlparse(request.url).path != "/robots.txt"
+
+    def process_exception(self, request, exception, spider):
+        if not isinstance(exception, IgnoreRequest):
+            self._observe(request, spider, None, failed=True)
+        return None
+
+    # ==================== CONTROLLER ====================
+
+    def _observe(self, request, spider, latency, failed, throttled=False, retry_after=None):
+        key = request.meta.get("download_slot")
+        slot = self.crawler.engine.downloader.slots.get(key)
+        if slot is None:
+            return
+        state = self.windows.get(key)
+        if state is None:
+            window = min(max(slot.concurrency, self.min_window), self.max_window)
+            state = self.windows[key] = _SlotWindow(window, slot.delay, self.baseline_samples)
+
+        now = time.time()
+        state.error_rate += self.alpha * (float(failed) - state.error_rate)
+        if latency is not None and not failed:
+            state.latency = latency if state.latency is None else state.latency + self.alpha * (latency - state.latency)
+            state.samples.append(latency)
+            state.baseline = sorted(state.samples)[len(state.samples) // 10]
+
+        slow = (len(state.samples) >= self.min_samples
+                and state.latency > self.latency_tolerance * state.baseline)
+        if throttled or slow or state.error_rate > self.max_error_rate:
+            # One cut per latency period: a burst of 429s from the same window counts once
+            if now - state.last_decrease > (state.latency or 1.0):
+                if throttled:
+                    state.ceiling = state.window
+                state.window = max(self.min_window, state.window * self.decrease)
+                state.last_decrease = now
+                self.stats.inc_value("adaptive_concurrency/decrease")
+                reason = "throttled" if throttled else "latency" if slow else "errors"
+                self.stats.inc_value(f"adaptive_concurrency/decrease/{reason}")
+                if self.debug:
+                    logger.debug("%s: window %.1f (%s)", key, state.window, reason, extra={"spider": spider})
+        elif not failed and state.window < self.max_window:
+            increase = self.increase / state.window
+            if state.ceiling is not None and state.window >= state.ceiling - 1:
+                increase /= 10
+                if state.window > state.ceiling:
+                    state.ceiling = None  # limit has moved up
+            state.window = min(self.max_window, state.window + increase)
+            self.stats.inc_value("adaptive_concurrency/increase")
+
+        if throttled:
+            self.stats.inc_value("adaptive_concurrency/throttled")
+        if retry_after:
+            slot.delay = max(slot.delay, retry_after)
+            state.paused_until = max(state.paused_until, now + retry_after)
+            self.stats.inc_value("adaptive_concurrency/retry_after")
+        elif now >= state.paused_until and slot.delay > state.base_delay:
+            slot.delay = state.base_delay
+
+        slot.concurrency = max(1, int(state.window))  # slots recreated by the downloader's GC get it back here
+        self._export(key, state, slot)
+
+    def _retry_after(self, response):
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        value = value.decode("latin-1").strip()
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.max_retry_after) or None
+
+    def _export(self, key, state, slot):
+        prefix = f"adaptive_concurrency/{key}"
+        self.stats.set_value(f"{prefix}/concurrency", slot.concurrency)
+        self.stats.max_value(f"{prefix}/max_concurrency", slot.concurrency)
+        self.stats.set_value(f"{prefix}/error_rate", round(state.error_rate, 3))
+        self.stats.set_value(f"{prefix}/delay", slot.delay)
+        if state.latency is not None:
+            self.stats.set_value(f"{prefix}/latency_ms", round(state.latency * 1000, 1))
+            self.stats.set_value(f"{prefix}/baseline_ms", round(state.baseline * 1000, 1))
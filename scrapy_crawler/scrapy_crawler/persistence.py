@@ -0,0 +1,193 @@
+# Persistence across crawl runs: request dedup and HTTP cache in SQLite
+#
+# - SqliteDupeFilter: fingerprints of downloaded leaf/item requests, one indexed table per spider.
+#   Only requests with meta["persist_seen"] or a URL matching DUPEFILTER_PERSIST_PATTERNS are
+#   remembered; those downloaded in an earlier run (less than DUPEFILTER_TTL ago) are not scheduled
+#   again. Listing/pagination pages are only deduplicated within a run, so every run walks them
+#   (through the HTTP cache, revalidated) and finds new items. Fingerprints are stored only once
+#   a request actually got a response, so an interrupted crawl resumes.
+# - SqliteCacheStorage: HTTPCACHE_STORAGE backend, zlib-compressed bodies in one file per spider,
+#   entries older than HTTPCACHE_EXPIRATION_SECS purged on open. With RFC2616Policy, stale pages
+#   are revalidated (If-None-Match / If-Modified-Since) and a 304 reuses the cached body.
+#
+# Enabled in settings.py (DUPEFILTER_CLASS, HTTPCACHE_STORAGE). Databases live in .scrapy/:
+#     .scrapy/dupefilter/<spider>.sqlite
+#     .scrapy/httpcache/<spider>.sqlite
+#
+# Start over for one spider by deleting its .sqlite files.
+
+import logging
+import re
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+
+from scrapy import signals
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.http import Headers
+from scrapy.responsetypes import responsetypes
+from scrapy.utils.project import data_path
+from w3lib.http import headers_dict_to_raw, headers_raw_to_dict
+
+logger = logging.getLogger(__name__)
+
+def connect(path):
+    """SQLite connection tuned for one writer: WAL journal, no fsync per commit"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(str(path), isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+# ==================== DUPEFILTER ====================
+
+class SqliteDupeFilter(RFPDupeFilter):
+    """
+    RFPDupeFilter that remembers downloaded leaf/item requests between runs.
+    A request is persisted when request.meta["persist_seen"] is true, or (no meta key) when its
+    URL matches one of DUPEFILTER_PERSIST_PATTERNS (regexes); anything else is deduplicated for
+    the current run only.
+    Settings: DUPEFILTER_PATH (folder, default .scrapy/dupefilter), DUPEFILTER_TTL
+    (seconds before a page is fetched again, 0 = never), DUPEFILTER_BATCH (rows per write).
+    """
+
+    def __init__(self, path, ttl=0, batch=500, persist_patterns=(), debug=False, stats=None, fingerprinter=None):
+        super().__init__(None, debug, fingerprinter=fingerprinter)
+        self.db_path = Path(path)
+        self.ttl = ttl
+        self.persist_patterns = [re.compile(pattern) for pattern in persist_patterns]
+        self.batch = batch
+        self.stats = stats
+        self.db = None
+        self._seen = set()  # this run
+        self._pending = []
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        spider_name = crawler.spider.name if getattr(crawler, "spider", None) else settings["BOT_NAME"]
+        folder = settings.get("DUPEFILTER_PATH") or data_path("dupefilter", createdir=True)
+        df = cls(
+            Path(folder) / f"{spider_name}.sqlite",
+            ttl=settings.getint("DUPEFILTER_TTL"),
+            batch=settings.getint("DUPEFILTER_BATCH", 500),
+            persist_patterns=settings.getlist("DUPEFILTER_PERSIST_PATTERNS"),
+            debug=settings.getbool("DUPEFILTER_DEBUG"),
+            stats=crawler.stats,
+            fingerprinter=crawler.request_fingerprinter,
+        )
+        crawler.signals.connect(df.response_received, signal=signals.response_received)
+        return df
+
+    def open(self):
+        self.db = connect(self.db_path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints (fp BLOB PRIMARY KEY, seen_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        if self.ttl:
+            expired = self.db.execute("DELETE FROM fingerprints WHERE seen_at < ?", (time.time() - self.ttl,)).rowcount
+            if expired:
+                logger.info("Dupefilter: %d fingerprints older than %ds dropped", expired, self.ttl)
+
+    def persists(self, request):
+        """Leaf/item request whose fingerprint is kept across runs"""
+        if "persist_seen" in request.meta:
+            return bool(request.meta["persist_seen"])
+        return any(pattern.search(request.url) for pattern in self.persist_patterns)
+
+    def request_seen(self, request):
+        fp = self.fingerprinter.fingerprint(request)
+        if fp in self._seen:
+            return True
+        self._seen.add(fp)
+        if not self.persists(request):
+            return False
+        row = self.db.execute("SELECT seen_at FROM fingerprints WHERE fp = ?", (fp,)).fetchone()
+        if row is not None and (not self.ttl or time.time() - row[0] < self.ttl):
+            if self.stats:
+                self.stats.inc_value("dupefilter/filtered_previous_run")
+            return True
+        return False
+
+    def response_received(self, response, request, spider):
+        """Remember a leaf request once it has a usable response (not 429 / 5xx, so those are retried next run)"""
+        if response.status == 429 or response.status >= 500 or not self.persists(request):
+            return
+        self._pending.append((self.fingerprinter.fingerprint(request), time.time()))
+        if len(self._pending) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if not self._pending or self.db is None:
+            return
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany("INSERT OR REPLACE INTO fingerprints VALUES (?, ?)", self._pending)
+        if self.stats:
+            self.stats.inc_value("dupefilter/persisted", len(self._pending))
+        self._pending.clear()
+
+    def close(self, reason):
+        self.flush()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+# ==================== HTTP CACHE ====================
+
+class SqliteCacheStorage:
+    """
+    HTTPCACHE_STORAGE backend: one SQLite file per spider in HTTPCACHE_DIR.
+    Bodies are zlib-compressed (HTTPCACHE_SQLITE_COMPRESSION level, 0 = off).
+    """
+
+    def __init__(self, settings):
+        self.cachedir = data_path(settings["HTTPCACHE_DIR"], createdir=True)
+        self.expiration_secs = settings.getint("HTTPCACHE_EXPIRATION_SECS")
+        self.compression = settings.getint("HTTPCACHE_SQLITE_COMPRESSION", 6)
+        self.db = None
+
+    def open_spider(self, spider):
+        path = Path(self.cachedir, f"{spider.name}.sqlite")
+        self.db = connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (fp BLOB PRIMARY KEY, url TEXT NOT NULL, status INTEGER NOT NULL,"
+            " headers BLOB NOT NULL, body BLOB NOT NULL, compressed INTEGER NOT NULL, stored_at REAL NOT NULL)"
+            " WITHOUT ROWID"
+        )
+        if self.expiration_secs > 0:
+            self.db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.expiration_secs,))
+        self._fingerprinter = spider.crawler.request_fingerprinter
+        logger.debug("Using SQLite cache storage in %(cachepath)s", {"cachepath": path}, extra={"spider": spider})
+
+    def close_spider(self, spider):
+        self.db.close()
+
+    def retrieve_response(self, spider, request):
+        """Return response if present in cache, or None otherwise."""
+        row = self.db.execute(
+            "SELECT url, status, headers, body, compressed, stored_at FROM responses WHERE fp = ?",
+            (self._fingerprinter.fingerprint(request),),
+        ).fetchone()
+        if row is None:
+            return None  # not cached
+        url, status, raw_headers, body, compressed, stored_at = row
+        if 0 < self.expiration_secs < time.time() - stored_at:
+            return None  # expired
+        body = zlib.decompress(body) if compressed else body
+        headers = Headers(headers_raw_to_dict(raw_headers))
+        respcls = responsetypes.from_args(headers=headers, url=url, body=body)
+        return respcls(url=url, headers=headers, status=status, body=body)
+
+    def store_response(self, spider, request, response):
+        """Store the given response in the cache."""
+        body = response.body
+        compressed = self.compression > 0 and len(body) > 256
+        if compressed:
+            body = zlib.compress(body, self.compression)
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (self._fingerprinter.fingerprint(request), response.url, response.status,
+             headers_dict_to_raw(response.headers), body, int(compressed), time.time()),
+        )
@@ -20,14 +20,15 @@ NEWSPIDER_MODULE = "scrapy_crawler.spiders"
 ROBOTSTXT_OBEY = True
 
 # Configure maximum concurrent requests performed by Scrapy (default: 16)
-#CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS = 64
 
 # Configure a delay for requests for the same website (default: 0)
 # See https://docs.scrapy.org/en/latest/topics/settings.html#download-delay
 # See also autothrottle settings and docs
 #DOWNLOAD_DELAY = 3
 # The download delay setting will honor only one of:
-#CONCURRENT_REQUESTS_PER_DOMAIN = 16
+# Starting window per domain; AdaptiveConcurrencyMiddleware moves it between MIN and MAX
+CONCURRENT_REQUESTS_PER_DOMAIN = 4
 #CONCURRENT_REQUESTS_PER_IP = 16
 
 # Disable cookies (enabled by default)
@@ -50,9 +51,23 @@ ROBOTSTXT_OBEY = True
 
 # Enable or disable downloader middlewares
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
-#DOWNLOADER_MIDDLEWARES = {
-#    "scrapy_crawler.middlewares.ScrapyCrawlerDownloaderMiddleware": 543,
-#}
+# AdaptiveConcurrencyMiddleware sits above HttpCacheMiddleware (900) and RetryMiddleware (550)
+# so it sees every real response, including the 429/503s that get retried
+DOWNLOADER_MIDDLEWARES = {
+    "scrapy_crawler.middlewares.AdaptiveConcurrencyMiddleware": 950,
+}
+
+# Per-domain AIMD concurrency (scrapy_crawler/middlewares.py), stats under adaptive_concurrency/
+ADAPTIVE_CONCURRENCY_MIN = 1
+ADAPTIVE_CONCURRENCY_MAX = 32
+ADAPTIVE_CONCURRENCY_INCREASE = 1.0  # +1 request per window of good responses
+ADAPTIVE_CONCURRENCY_DECREASE = 0.5  # window multiplier on 429/503, errors or latency growth
+ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE = 2.0  # EWMA latency / baseline latency that counts as congestion
+ADAPTIVE_CONCURRENCY_BASELINE_SAMPLES = 200  # baseline = 10th percentile of the last N page latencies
+ADAPTIVE_CONCURRENCY_MIN_SAMPLES = 20  # page responses before latency growth can cut the window
+ADAPTIVE_CONCURRENCY_ERROR_RATE = 0.2
+ADAPTIVE_CONCURRENCY_MAX_RETRY_AFTER = 300
+#ADAPTIVE_CONCURRENCY_DEBUG = True
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -67,6 +82,7 @@ ROBOTSTXT_OBEY = True
 #}
 
 # Enable and configure the AutoThrottle extension (disabled by default)
+# Leave it off while AdaptiveConcurrencyMiddleware is enabled: both adjust the slot delay
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 #AUTOTHROTTLE_ENABLED = True
 # The initial download delay
@@ -81,11 +97,26 @@ ROBOTSTXT_OBEY = True
 
 # Enable and configure HTTP caching (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
-#HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+# SQLite storage (scrapy_crawler/persistence.py): zlib-compressed bodies, one file per spider
+# in .scrapy/httpcache/. RFC2616Policy honours Cache-Control and revalidates stale pages with
+# If-None-Match / If-Modified-Since, so unchanged pages come back as a cheap 304.
+HTTPCACHE_ENABLED = True
+HTTPCACHE_POLICY = "scrapy.extensions.httpcache.RFC2616Policy"
+HTTPCACHE_STORAGE = "scrapy_crawler.persistence.SqliteCacheStorage"
+HTTPCACHE_DIR = "httpcache"
+HTTPCACHE_EXPIRATION_SECS = 30 * 24 * 3600  # entries purged after 30 days
+HTTPCACHE_IGNORE_HTTP_CODES = [429, 500, 502, 503, 504]
+HTTPCACHE_SQLITE_COMPRESSION = 6  # zlib level, 0 stores bodies uncompressed
+
+# Persistent request dedup across runs (scrapy_crawler/persistence.py)
+# Only leaf/item pages are remembered: requests with meta["persist_seen"] = True or a URL matching
+# DUPEFILTER_PERSIST_PATTERNS (regexes, usually set per spider in custom_settings). Those downloaded
+# less than DUPEFILTER_TTL ago are not requested again. Listing/pagination pages are fetched every
+# run through the HTTP cache above, so new items are still discovered.
+# Delete .scrapy/dupefilter/<spider>.sqlite to crawl everything again.
+DUPEFILTER_CLASS = "scrapy_crawler.persistence.SqliteDupeFilter"
+DUPEFILTER_TTL = 24 * 3600
+DUPEFILTER_PERSIST_PATTERNS = []
 
 # Set settings whose default value is deprecated to a future-proof value
 REQUEST_FINGERPRINTER_IMPLEMENTATION = "2.7"
@@ -5,4 +5,6 @@ class ImdbCrawler(CrawlSpider):
     name = 'amazon'
     allowed_domains = ['www.amazon.co.uk']
     start_urls = ['https://www.amazon.co.uk/s?k=ddr4+ram+32gb&i=warehouse-deals&crid=2OPZW6GTCC5QG&sprefix=ddr4%2Cwarehouse-deals%2C127&ref=nb_sb_ss_ts-doa-p_3_4']
+    # product pages are remembered across runs, /s?k= search result pages are revisited
+    custom_settings = {'DUPEFILTER_PERSIST_PATTERNS': [r'/(dp|gp/product)/[A-Z0-9]{10}(/|\?|$)']}
     rules = (Rule(LinkExtractor()),)
\ No newline at end of file
@@ -5,4 +5,6 @@ class ImdbCrawler(CrawlSpider):
     name = 'imdb'
     allowed_domains = ['www.imdb.com']
     start_urls = ['https://www.imdb.com/']
+    # title/name pages are remembered across runs, charts, lists and search results are revisited
+    custom_settings = {'DUPEFILTER_PERSIST_PATTERNS': [r'/(title/tt|name/nm)\d+/?(\?|$)']}
     rules = (Rule(LinkExtractor()),)
\ No newline at end of file
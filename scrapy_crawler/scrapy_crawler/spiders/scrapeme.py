@@ -5,4 +5,6 @@ class ImdbCrawler(CrawlSpider):
     name = 'scrapeme'
     allowed_domains = ['scrapeme.live']
     start_urls = ['https://scrapeme.live/shop/']
+    # product pages are remembered across runs, /shop/page/N/ listings are revisited
+    custom_settings = {'DUPEFILTER_PERSIST_PATTERNS': [r'/shop/(?!page/)[^/?]+/$']}
     rules = (Rule(LinkExtractor()),)
\ No newline at end of file
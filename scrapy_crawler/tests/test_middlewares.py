@@ -0,0 +1,57 @@
+import random
+from types import SimpleNamespace
+
+from scrapy.http import Request, Response
+from scrapy.settings import Settings
+from scrapy.statscollectors import MemoryStatsCollector
+
+from scrapy_crawler.middlewares import AdaptiveConcurrencyMiddleware
+
+SLOT = "example.com"
+
+
+def make_middleware(**settings):
+    crawler = SimpleNamespace(settings=Settings({"CONCURRENT_REQUESTS_PER_DOMAIN": 4, **settings}))
+    crawler.stats = MemoryStatsCollector(crawler)
+    slot = SimpleNamespace(concurrency=4, delay=0.0)
+    crawler.engine = SimpleNamespace(downloader=SimpleNamespace(slots={SLOT: slot}))
+    return AdaptiveConcurrencyMiddleware(crawler), crawler.stats, slot
+
+
+def respond(middleware, path, latency, status=200):
+    url = f"https://{SLOT}{path}"
+    request = Request(url, meta={"download_slot": SLOT, "download_latency": latency})
+    middleware.process_response(request, Response(url, status=status), None)
+
+
+def test_fast_robots_txt_and_304s_do_not_set_the_latency_baseline():
+    middleware, stats, slot = make_middleware()
+    rng = random.Random(0)
+    respond(middleware, "/robots.txt", 0.005)
+    for i in range(300):
+        respond(middleware, f"/page/{i}", rng.uniform(0.09, 0.11))
+        if i % 10 == 0:
+            respond(middleware, f"/page/{i}", 0.004, status=304)
+            respond(middleware, f"/missing/{i}", 0.004, status=404)
+    assert stats.get_value("adaptive_concurrency/decrease/latency") is None
+    assert slot.concurrency > 4
+    assert 0.09 <= stats.get_value(f"adaptive_concurrency/{SLOT}/baseline_ms") / 1000 <= 0.11
+
+
+def test_latency_rule_waits_for_min_samples():
+    middleware, stats, slot = make_middleware(ADAPTIVE_CONCURRENCY_MIN_SAMPLES=20)
+    respond(middleware, "/first", 0.01)
+    for i in range(10):
+        respond(middleware, f"/page/{i}", 0.1)
+    assert stats.get_value("adaptive_concurrency/decrease/latency") is None
+
+
+def test_sustained_latency_growth_cuts_the_window():
+    middleware, stats, slot = make_middleware()
+    for i in range(50):
+        respond(middleware, f"/page/{i}", 0.1)
+    window = slot.concurrency
+    for i in range(50):
+        respond(middleware, f"/slow/{i}", 0.5)
+    assert stats.get_value("adaptive_concurrency/decrease/latency")
+    assert slot.concurrency < window
@@ -3,10 +3,16 @@ Phase 2: Advanced Ticket Clustering with Sentence Transformers & BERTopic
 Uses state-of-the-art NLP to discover patterns from minimal data
 """
 import os
-os.environ['OMP_NUM_THREADS'] = '1'
-os.environ['OPENBLAS_NUM_THREADS'] = '1'
-os.environ['MKL_NUM_THREADS'] = '1'
+# Single-threaded BLAS by default (Windows stability); benchmark.py overrides per run
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
 
+import hashlib
+import json
+from pathlib import Path
+
+import joblib
 import pandas as pd
 import numpy as np
 import matplotlib
@@ -19,10 +25,14 @@ warnings.filterwarnings('ignore')
 
 # Advanced NLP libraries
 from sentence_transformers import SentenceTransformer
+from scipy import sparse
 from sklearn.cluster import HDBSCAN
+from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics import silhouette_score
 import umap.umap_ as umap
 
+from embedding_store import EmbeddingStore, open_store, save_embeddings
+
 # BERTopic
 try:
     from bertopic import BERTopic
@@ -35,6 +45,12 @@ except ImportError:
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 10)
 
+# Shared reduction stage outputs (reduced embeddings + fitted models) live here
+CACHE_DIR = Path(".cache")
+
+# Compact int8 copy of the embeddings (4x smaller than float32), memory-mapped on reuse
+EMBEDDING_STORE = Path("embeddings_int8")
+
 def load_data(filepath="support_tickets_advanced.csv"):
     """Load minimal ticket data"""
     df = pd.read_csv(filepath)
@@ -57,11 +73,52 @@ def generate_embeddings(texts, model_name='all-MiniLM-L6-v2'):
     print(f"[OK] Generated {embeddings.shape[0]} embeddings of dimension {embeddings.shape[1]}")
     return embeddings
 
+def load_or_generate_embeddings(texts, model_name='all-MiniLM-L6-v2', store_path=EMBEDDING_STORE, method="int8"):
+    """
+    Reuse the quantized embedding store when it was built from the same texts
+    and model, otherwise encode and write a new one. Returns
+    (store, embeddings, generated): the EmbeddingStore (codes stay memory-mapped
+    on disk), the float32 embeddings when freshly generated (None on reuse) and
+    whether they were generated in this run.
+    """
+    digest = hashlib.sha1(model_name.encode())
+    for text in texts:
+        digest.update(str(text).encode('utf-8', 'ignore'))
+        digest.update(b'\0')
+    fingerprint = digest.hexdigest()
+    
+    store = open_store(store_path)
+    if store is not None and store.meta.get('fingerprint') == fingerprint:
+        print(f"\n[STORE] Reusing {store.method} embedding store: {store_path} ({store.nbytes / 1e6:.1f} MB)")
+        return store, None, False
+    
+    embeddings = generate_embeddings(texts, model_name=model_name)
+    store = save_embeddings(embeddings, store_path, method=method, fingerprint=fingerprint)
+    print(f"[STORE] Saved {method} embedding store: {store_path} "
+          f"({store.nbytes / 1e6:.1f} MB vs {embeddings.nbytes / 1e6:.1f} MB float32)")
+    return store, embeddings, True
+
+def as_matrix(embeddings):
+    """float32 matrix for algorithms that need dense input (HDBSCAN, UMAP, BERTopic)"""
+    if isinstance(embeddings, EmbeddingStore):
+        return embeddings.decode()
+    return embeddings
+
+def similar_tickets(store, df, ticket_idx, k=5):
+    """Top-k most similar tickets to df row ticket_idx, scored directly on the quantized codes"""
+    indices, scores = store.search(store.decode([ticket_idx])[0], k=k + 1)
+    keep = indices != ticket_idx
+    result = df.iloc[indices[keep][:k]].copy()
+    result['similarity'] = scores[keep][:k]
+    return result
+
 def cluster_hdbscan(embeddings, min_cluster_size=3):
     """
     HDBSCAN: Density-based clustering that finds arbitrary shapes
     Automatically determines number of clusters
+    Accepts a float32 matrix or an EmbeddingStore
     """
+    embeddings = as_matrix(embeddings)
     print(f"\n[CLUSTER] Running HDBSCAN (min_cluster_size={min_cluster_size})...")
     
     clusterer = HDBSCAN(
@@ -83,43 +140,195 @@ def cluster_hdbscan(embeddings, min_cluster_size=3):
         # Only calculate silhouette if we have multiple clusters and not all noise
         valid_mask = labels != -1
         if valid_mask.sum() > 1:
-            score = silhouette_score(embeddings[valid_mask], labels[valid_mask])
+            score = silhouette_score(embeddings[valid_mask], labels[valid_mask],
+                                     sample_size=min(int(valid_mask.sum()), 10000), random_state=42)
             print(f"[METRIC] Silhouette score: {score:.3f}")
     
     return labels
 
-def reduce_dimensions(embeddings, n_components=2):
+def build_umap(n_components=2, min_dist=0.1, n_neighbors=15, precomputed_knn=None):
+    """UMAP configured the same way for the plot and for BERTopic"""
+    kwargs = {}
+    if precomputed_knn is not None:
+        # Reuse a kNN graph built once instead of searching neighbours again
+        kwargs['precomputed_knn'] = precomputed_knn
+        kwargs['force_approximation_algorithm'] = True
+    return umap.UMAP(
+        n_components=n_components,
+        n_neighbors=n_neighbors,
+        min_dist=min_dist,
+        metric='cosine',
+        random_state=42,
+        **kwargs
+    )
+
+def reduce_dimensions(embeddings, n_components=2, precomputed_knn=None):
     """
     UMAP: Better than PCA for preserving local structure
     """
     print(f"\n[REDUCE] Reducing to {n_components}D with UMAP...")
     
-    reducer = umap.UMAP(
-        n_components=n_components,
-        n_neighbors=15,
-        min_dist=0.1,
-        metric='cosine',
-        random_state=42
-    )
+    reducer = build_umap(n_components=n_components, precomputed_knn=precomputed_knn)
     
     reduced = reducer.fit_transform(embeddings)
     print(f"[OK] Reduced from {embeddings.shape[1]}D to {n_components}D")
     
     return reduced
 
-def bertopic_modeling(texts, embeddings):
+class PrecomputedReduction:
+    """
+    Hands an already fitted UMAP to BERTopic.
+    fit() is a no-op; transform() returns the cached projection for the
+    training embeddings and only runs UMAP for genuinely new documents.
+    """
+    def __init__(self, reducer, embeddings, reduced):
+        self.reducer = reducer
+        self.embeddings = embeddings
+        self.reduced = reduced
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        if X is self.embeddings or (X.shape == self.embeddings.shape and np.array_equal(X, self.embeddings)):
+            return self.reduced
+        return self.reducer.transform(X)
+
+class PrecomputedClusterer:
+    """
+    Hands already computed HDBSCAN labels to BERTopic.
+    New points are assigned to the nearest cluster centroid in reduced space, or to
+    -1 (outlier, as HDBSCAN would) when farther from it than any of its members.
+    """
+    def __init__(self, labels, reduced):
+        self.labels_ = labels
+        valid = labels != -1
+        self.cluster_ids_ = np.unique(labels[valid])
+        self.centroids_ = np.array([reduced[labels == c].mean(axis=0) for c in self.cluster_ids_])
+        # Squared distance of each cluster's farthest member to its centroid
+        self.radii_ = np.array([((reduced[labels == c] - centroid) ** 2).sum(axis=1).max()
+                                for c, centroid in zip(self.cluster_ids_, self.centroids_)])
+
+    def fit(self, X, y=None):
+        return self
+
+    def predict(self, X):
+        if len(self.cluster_ids_) == 0:
+            return np.full(len(X), -1)
+        distances = ((X[:, None, :] - self.centroids_[None, :, :]) ** 2).sum(axis=2)
+        nearest = distances.argmin(axis=1)
+        inside = distances[np.arange(len(X)), nearest] <= self.radii_[nearest]
+        return np.where(inside, self.cluster_ids_[nearest], -1)
+
+def shared_reduction(embeddings, n_neighbors=15, topic_components=5, min_topic_size=10, cache_dir=CACHE_DIR,
+                     topics=BERTOPIC_AVAILABLE, dense=None):
+    """
+    Shared UMAP/HDBSCAN stage for the 2D plot and BERTopic.
+    The cosine kNN graph is built once and reused by both UMAP fits, and
+    BERTopic's 5D reduction + HDBSCAN (its default pipeline) is computed here
+    instead of inside BERTopic. With topics=False (BERTopic not installed) only
+    the 2D projection is fitted and the topic entries are None.
+    Outputs are cached on disk keyed by a hash of the embeddings and parameters,
+    so re-runs skip the reductions entirely.
+    An EmbeddingStore is keyed by its fingerprint and only decoded on a cache miss
+    (pass its already decoded matrix as dense to skip that second copy).
+    """
+    params = {
+        'n_neighbors': n_neighbors,
+        'topic_components': topic_components,
+        'min_topic_size': min_topic_size,
+        'topics': bool(topics),
+    }
+    if isinstance(embeddings, EmbeddingStore) and embeddings.meta.get('fingerprint'):
+        digest = hashlib.sha1(f"{embeddings.method}:{embeddings.meta['fingerprint']}".encode())
+    else:
+        digest = hashlib.sha1(np.ascontiguousarray(as_matrix(embeddings)).tobytes())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    cache_path = Path(cache_dir) / f"reduction_{digest.hexdigest()[:16]}.joblib"
+    
+    if cache_path.exists():
+        try:
+            reduction = joblib.load(cache_path)
+            print(f"\n[CACHE] Loaded shared reduction: {cache_path}")
+            return reduction
+        except Exception as e:
+            print(f"[WARNING] Ignoring unreadable cache {cache_path}: {e}")
+    
+    embeddings = as_matrix(embeddings) if dense is None else dense
+    print(f"\n[REDUCE] Building shared {n_neighbors}-NN graph (cosine)...")
+    knn_indices, knn_dists, knn_index = umap.nearest_neighbors(
+        embeddings,
+        n_neighbors=n_neighbors,
+        metric='cosine',
+        metric_kwds={},
+        angular=False,
+        random_state=np.random.RandomState(42)
+    )
+    precomputed_knn = (knn_indices, knn_dists, knn_index)
+    
+    # 2D projection for plotting
+    print("[REDUCE] Fitting 2D UMAP for visualization...")
+    umap_2d = build_umap(n_components=2, min_dist=0.1, n_neighbors=n_neighbors, precomputed_knn=precomputed_knn)
+    embeddings_2d = umap_2d.fit_transform(embeddings)
+    
+    umap_topic = topic_reduced = topic_clusterer = topic_labels = None
+    if topics:
+        # BERTopic defaults: 5D UMAP (min_dist=0.0) + HDBSCAN(min_cluster_size=min_topic_size)
+        print(f"[REDUCE] Fitting {topic_components}D UMAP for topic modeling...")
+        umap_topic = build_umap(n_components=topic_components, min_dist=0.0, n_neighbors=n_neighbors, precomputed_knn=precomputed_knn)
+        topic_reduced = umap_topic.fit_transform(embeddings)
+        
+        print(f"[CLUSTER] Running HDBSCAN on {topic_components}D projection (min_cluster_size={min_topic_size})...")
+        topic_clusterer = HDBSCAN(
+            min_cluster_size=min_topic_size,
+            metric='euclidean',
+            cluster_selection_method='eom'
+        )
+        topic_labels = topic_clusterer.fit_predict(topic_reduced)
+    
+    reduction = {
+        'embeddings_2d': embeddings_2d,
+        'topic_reduced': topic_reduced,
+        'topic_labels': topic_labels,
+        'umap_2d': umap_2d,
+        'umap_topic': umap_topic,
+        'topic_clusterer': topic_clusterer,
+    }
+    
+    try:
+        cache_path.parent.mkdir(exist_ok=True)
+        joblib.dump(reduction, cache_path)
+        print(f"[CACHE] Saved shared reduction: {cache_path}")
+    except Exception as e:
+        print(f"[WARNING] Could not cache shared reduction: {e}")
+    
+    return reduction
+
+def bertopic_modeling(texts, embeddings, reduction=None):
     """
     BERTopic: Automatic topic modeling with coherent labels
+    Pass the output of shared_reduction() to skip BERTopic's own UMAP + HDBSCAN
     """
     if not BERTOPIC_AVAILABLE:
         return None, None
     
     print(f"\n[TOPIC] Running BERTopic modeling...")
     
+    model_kwargs = {}
+    if reduction is not None and reduction['umap_topic'] is not None:
+        model_kwargs['umap_model'] = PrecomputedReduction(
+            reduction['umap_topic'], embeddings, reduction['topic_reduced']
+        )
+        model_kwargs['hdbscan_model'] = PrecomputedClusterer(
+            reduction['topic_labels'], reduction['topic_reduced']
+        )
+        print("[INFO] Reusing shared UMAP projection and HDBSCAN labels")
+    
     topic_model = BERTopic(
         language="english",
         calculate_probabilities=False,
-        verbose=False
+        verbose=False,
+        **model_kwargs
     )
     
     topics, probs = topic_model.fit_transform(texts, embeddings)
@@ -130,9 +339,9 @@ def bertopic_modeling(texts, embeddings):
     # Get topic info
     topic_info = topic_model.get_topic_info()
     print(f"\n[TOPICS] Top discovered topics:")
-    for idx, row in topic_info.head(6).iterrows():
-        if row['Topic'] != -1:
-            print(f"  Topic {row['Topic']}: {row['Count']} tickets - {row['Name'][:60]}")
+    for row in topic_info.head(6).itertuples(index=False):
+        if row.Topic != -1:
+            print(f"  Topic {row.Topic}: {row.Count} tickets - {row.Name[:60]}")
     
     return topic_model, topics
 
@@ -276,68 +485,133 @@ def visualize_advanced(df, embeddings_2d, clusters, topics=None):
     plt.savefig('temporal_advanced.png', dpi=300, bbox_inches='tight')
     print("  [OK] Saved: temporal_advanced.png")
 
+def cluster_keywords(texts, labels, n_keywords=5, max_features=5000):
+    """
+    Top keywords per cluster in one sparse pass (class-based TF-IDF).
+    Term counts of all documents are summed per cluster with a single
+    cluster x document indicator product instead of filtering per cluster.
+    """
+    cluster_ids, codes = np.unique(labels, return_inverse=True)
+    vectorizer = CountVectorizer(stop_words='english', max_features=max_features)
+    try:
+        X = vectorizer.fit_transform(texts)
+    except ValueError:
+        # Only stop words / empty texts
+        return pd.Series([[] for _ in cluster_ids], index=cluster_ids)
+    
+    indicator = sparse.csr_matrix(
+        (np.ones(len(codes)), (codes, np.arange(len(codes)))),
+        shape=(len(cluster_ids), len(codes))
+    )
+    counts = (indicator @ X).toarray()
+    
+    # c-TF-IDF: term frequency within the cluster x rarity across clusters
+    tf = counts / np.maximum(counts.sum(axis=1, keepdims=True), 1)
+    avg_words = counts.sum() / len(cluster_ids)
+    idf = np.log1p(avg_words / np.maximum(counts.sum(axis=0), 1))
+    scores = tf * idf
+    
+    k = min(n_keywords, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top = np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+    terms = vectorizer.get_feature_names_out()
+    return pd.Series(
+        [[terms[j] for j in row if counts[i, j] > 0] for i, row in enumerate(top)],
+        index=cluster_ids
+    )
+
+def build_insights_table(df, n_samples=3, n_keywords=5):
+    """
+    Structured per-cluster insights from a single grouped aggregation pass.
+    One row per cluster: size, sample conversations, time span, peak hour
+    and top keywords. Noise (-1) is excluded.
+    """
+    valid = df.loc[df['cluster'] != -1, ['cluster', 'created_at', 'conversation']]
+    if len(valid) == 0:
+        return pd.DataFrame(columns=['size', 'first_seen', 'last_seen', 'active_days',
+                                     'peak_hour', 'peak_hour_tickets', 'samples', 'keywords'])
+    
+    grouped = valid.groupby('cluster', sort=True)
+    table = grouped.agg(
+        size=('conversation', 'size'),
+        first_seen=('created_at', 'min'),
+        last_seen=('created_at', 'max'),
+    )
+    table['active_days'] = (table['last_seen'].dt.normalize() - table['first_seen'].dt.normalize()).dt.days
+    
+    # Peak hour per cluster: count (cluster, hour) pairs once, keep the busiest hour
+    hourly = valid.groupby(['cluster', valid['created_at'].dt.hour.rename('hour')]).size()
+    peak = hourly.sort_index().groupby(level='cluster').idxmax()
+    table['peak_hour'] = [hour for _, hour in peak]
+    table['peak_hour_tickets'] = hourly.loc[peak.tolist()].to_numpy()
+    
+    table['samples'] = grouped.head(n_samples).groupby('cluster')['conversation'].agg(list)
+    table['keywords'] = cluster_keywords(valid['conversation'].tolist(), valid['cluster'].to_numpy(), n_keywords)
+    return table
+
 def generate_insights(df, topic_model=None):
-    """Generate insights from advanced clustering"""
+    """Generate insights from advanced clustering (rendered from build_insights_table)"""
     print("\n" + "="*70)
     print("[INSIGHTS] ADVANCED CLUSTERING DISCOVERIES")
     print("="*70)
     
-    valid_clusters = df[df['cluster'] != -1]
+    table = build_insights_table(df)
     
-    if len(valid_clusters) == 0:
+    if len(table) == 0:
         print("\n[WARNING] No clusters found - all tickets classified as noise")
         print("[TIP] Try collecting more data or reducing min_cluster_size")
-        return
+        return table
     
     # 1. Cluster characteristics
     print("\n1. [CLUSTERS] Discovered Patterns:")
-    for cluster_id in sorted(valid_clusters['cluster'].unique()):
-        cluster_tickets = valid_clusters[valid_clusters['cluster'] == cluster_id]
-        print(f"\n   Cluster {cluster_id}: {len(cluster_tickets)} tickets")
+    for cluster_id, row in zip(table.index, table.itertuples(index=False)):
+        print(f"\n   Cluster {cluster_id}: {row.size} tickets")
+        if row.keywords:
+            print(f"   Keywords: {', '.join(row.keywords)}")
         print(f"   Sample conversations:")
-        for conv in cluster_tickets['conversation'].head(3):
+        for conv in row.samples:
             print(f"   - {conv[:70]}...")
     
     # 2. Temporal insights
     print(f"\n2. [TIME] Temporal Patterns:")
-    peak_hour = df['hour'].mode()[0]
-    peak_count = (df['hour'] == peak_hour).sum()
+    hours = df['created_at'].dt.hour
+    hour_counts = hours.value_counts()
+    peak_hour = hour_counts[hour_counts == hour_counts.max()].index.min()
+    peak_count = hour_counts[peak_hour]
     print(f"   Peak hour: {peak_hour}:00 ({peak_count} tickets)")
     
-    df['date'] = df['created_at'].dt.date
-    daily = df.groupby('date').size()
+    daily = df.groupby(df['created_at'].dt.date).size()
     print(f"   Date range: {daily.index.min()} to {daily.index.max()}")
     print(f"   Daily avg: {daily.mean():.1f} tickets")
     
     # 3. Cluster stability
-    if len(valid_clusters) > 1:
-        cluster_spread = valid_clusters.groupby('cluster')['date'].apply(lambda x: (x.max() - x.min()).days)
+    if len(table) > 1:
         print(f"\n3. [STABILITY] Cluster Persistence:")
-        for cluster_id, days in cluster_spread.items():
-            print(f"   Cluster {cluster_id}: Active for {days} days")
+        for cluster_id, days, peak in zip(table.index, table['active_days'], table['peak_hour']):
+            print(f"   Cluster {cluster_id}: Active for {days} days (peak {peak}:00)")
     
     # 4. Topic insights (if BERTopic available)
     if topic_model is not None and 'topic' in df.columns:
         print(f"\n4. [TOPICS] Semantic Topics Discovered:")
-        topic_counts = df[df['topic'] != -1]['topic'].value_counts().head(5)
+        topic_counts = df.loc[df['topic'] != -1, 'topic'].value_counts().head(5)
+        topic_words = topic_model.get_topics()
         for topic_id, count in topic_counts.items():
             print(f"   Topic {topic_id}: {count} tickets")
-            try:
-                top_words = topic_model.get_topic(topic_id)[:5]
-                words = [word for word, score in top_words]
-                print(f"   Keywords: {', '.join(words)}")
-            except:
-                pass
+            top_words = topic_words.get(topic_id) or []
+            if top_words:
+                print(f"   Keywords: {', '.join(word for word, score in top_words[:5])}")
     
     # 5. Recommendations
+    n_noise = int((df['cluster'] == -1).sum())
     print(f"\n5. [NEXT] Recommended Actions:")
-    print(f"   - Review Cluster 0 samples for common patterns")
+    print(f"   - Review Cluster {table['size'].idxmax()} samples for common patterns (largest cluster)")
     print(f"   - Schedule more support during peak hour ({peak_hour}:00)")
-    if (df['cluster'] == -1).sum() > 0:
-        print(f"   - Investigate {(df['cluster'] == -1).sum()} unclustered tickets")
-    print(f"   - Build classifier to auto-tag new tickets")
+    if n_noise > 0:
+        print(f"   - Investigate {n_noise} unclustered tickets")
+    print(f"   - Auto-tag new tickets: python ticket_classifier.py train && python ticket_classifier.py serve")
     
     print("\n" + "="*70)
+    return table
 
 def main():
     """Run Phase 2: Advanced Clustering"""
@@ -349,20 +623,29 @@ def main():
     # Load data
     df = load_data("support_tickets_advanced.csv")
     
-    # Generate embeddings
-    embeddings = generate_embeddings(df['conversation'].tolist())
+    # Generate embeddings (or reuse the quantized store from a previous run)
+    store, embeddings, generated = load_or_generate_embeddings(df['conversation'].tolist())
+    # HDBSCAN and BERTopic need dense input: on reuse, decode the int8 codes once
+    # (lossy, so this matrix is never written back to embeddings.npy)
+    matrix = embeddings if generated else store.decode()
     
     # Cluster with HDBSCAN
-    clusters = cluster_hdbscan(embeddings, min_cluster_size=3)
+    clusters = cluster_hdbscan(matrix, min_cluster_size=3)
+    
+    # Nearest neighbours of one ticket, searched on the int8 codes
+    print(f"\n[SIMILAR] Tickets most similar to #0: {df['conversation'].iloc[0][:60]!r}")
+    for row in similar_tickets(store, df, 0, k=3).itertuples():
+        print(f"  #{row.Index} ({row.similarity:.3f}): {row.conversation[:60]!r}")
     
-    # Reduce to 2D for visualization
-    embeddings_2d = reduce_dimensions(embeddings, n_components=2)
+    # Shared UMAP/HDBSCAN stage: 2D plot projection + BERTopic reduction (cached)
+    reduction = shared_reduction(store, dense=matrix)
+    embeddings_2d = reduction['embeddings_2d']
     
     # BERTopic modeling (optional)
     topic_model = None
     topics = None
     if BERTOPIC_AVAILABLE:
-        topic_model, topics = bertopic_modeling(df['conversation'].tolist(), embeddings)
+        topic_model, topics = bertopic_modeling(df['conversation'].tolist(), matrix, reduction)
     
     # Visualize
     visualize_advanced(df, embeddings_2d, clusters, topics)
@@ -375,15 +658,20 @@ def main():
         df['topic'] = topics
     
     # Generate insights
-    generate_insights(df, topic_model)
+    insights = generate_insights(df, topic_model)
+    if len(insights) > 0:
+        insights.to_json('cluster_insights.json', orient='index', date_format='iso', indent=2)
+        print(f"\n[OK] Saved cluster insights table: cluster_insights.json")
     
     # Save results
     df.to_csv('tickets_advanced_clustered.csv', index=False)
     print(f"\n[OK] Saved enriched dataset: tickets_advanced_clustered.csv")
     
-    # Save embeddings for future use
-    np.save('embeddings.npy', embeddings)
-    print(f"[OK] Saved embeddings: embeddings.npy")
+    # Save float32 embeddings for future use, only when freshly encoded
+    # (ticket_classifier.py trains on them and embedding_store.py uses them as the float32 baseline)
+    if generated:
+        np.save('embeddings.npy', embeddings)
+        print(f"[OK] Saved embeddings: embeddings.npy")
     
     print("\n" + "="*70)
     print("[DONE] Phase 2 complete! Check PNG files for visualizations.")
@@ -7,17 +7,20 @@ os.environ['OMP_NUM_THREADS'] = '1'
 os.environ['OPENBLAS_NUM_THREADS'] = '1'
 os.environ['MKL_NUM_THREADS'] = '1'
 
+import argparse
 import pandas as pd
 import numpy as np
+from scipy import sparse
 import matplotlib
 matplotlib.use('Agg')  # Use non-GUI backend
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer
 from sklearn.cluster import MiniBatchKMeans, DBSCAN
-from sklearn.decomposition import PCA
+from sklearn.decomposition import PCA, TruncatedSVD
 from sklearn.metrics import silhouette_score
-from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import StandardScaler, normalize
+from joblib import Parallel, delayed
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,62 +35,228 @@ def load_data(filepath="support_tickets.csv"):
     print(f"[OK] Loaded {len(df)} tickets")
     return df
 
-def text_clustering(df, n_clusters=5):
-    """Cluster tickets based on conversation text"""
-    print("\n[CLUSTERING] Performing text-based clustering...")
-    
-    # TF-IDF vectorization
-    vectorizer = TfidfVectorizer(
-        max_features=100,
-        stop_words='english',
-        ngram_range=(1, 2)
+class StreamingTfidf:
+    """
+    TF-IDF over a stateless HashingVectorizer with incrementally accumulated IDF.
+    partial_fit() only updates document frequencies, so no vocabulary is held
+    in memory and the corpus can arrive in chunks. transform() applies the
+    IDF seen so far (smooth idf + l2 norm, same formula as TfidfVectorizer).
+    """
+    def __init__(self, n_features=2**18, ngram_range=(1, 2), stop_words='english'):
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=ngram_range,
+            stop_words=stop_words,
+            alternate_sign=False,
+            norm=None
+        )
+        self.n_features = n_features
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def partial_fit(self, texts):
+        counts = self.hasher.transform(texts)
+        # CSR column indices list every (document, feature) pair exactly once
+        self.doc_freq += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        return self
+
+    @property
+    def idf_(self):
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+
+    def transform(self, texts):
+        X = self.hasher.transform(texts).astype(np.float64)
+        X.data *= self.idf_[X.indices]
+        return normalize(X)
+
+    def feature_names(self, indices, sample_texts):
+        """
+        Recover readable terms for hashed feature indices from a text sample.
+        Each distinct n-gram of the sample is hashed once (one row per term).
+        """
+        analyzer = self.hasher.build_analyzer()
+        terms = sorted({term for text in sample_texts for term in analyzer(text)})
+        if not terms:
+            return {}
+        term_idx = HashingVectorizer(
+            n_features=self.n_features, analyzer=lambda term: [term],
+            alternate_sign=False, norm=None
+        ).transform(terms).indices
+        wanted = set(int(i) for i in indices)
+        names = {}
+        for term, idx in zip(terms, term_idx):
+            if idx in wanted and idx not in names:
+                names[int(idx)] = term
+        return names
+
+def featurize(texts, mode="tfidf", chunksize=50_000):
+    """
+    Vectorize the corpus once; the sparse matrix is shared by clustering and
+    the 2D projection. mode="hashing" uses StreamingTfidf (no vocabulary).
+    """
+    if mode == "hashing":
+        vectorizer = StreamingTfidf()
+        for start in range(0, len(texts), chunksize):
+            vectorizer.partial_fit(texts[start:start + chunksize])
+        X = sparse.vstack([
+            vectorizer.transform(texts[start:start + chunksize])
+            for start in range(0, len(texts), chunksize)
+        ]).tocsr()
+    else:
+        vectorizer = TfidfVectorizer(
+            max_features=100,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+        X = vectorizer.fit_transform(texts)
+    print(f"[FEATURES] {mode}: {X.shape[0]} docs x {X.shape[1]} features ({X.nnz} non-zeros)")
+    return X, vectorizer
+
+def top_terms(vectorizer, centers, texts, n_terms=5):
+    """Top n_terms feature names per centroid, for either featurization mode"""
+    order = np.argsort(-centers, axis=1)[:, :n_terms]
+    if isinstance(vectorizer, StreamingTfidf):
+        names = vectorizer.feature_names(np.unique(order), texts[:10_000])
+        return [[names.get(int(j), f"#{j}") for j in row] for row in order]
+    terms = vectorizer.get_feature_names_out()
+    return [[terms[j] for j in row] for row in order]
+
+def calinski_harabasz_sparse(X, kmeans):
+    """
+    Calinski-Harabasz index from a fitted k-means, without densifying X.
+    Within-cluster dispersion is the model's inertia; between-cluster
+    dispersion only needs the centroids, cluster sizes and the global mean.
+    """
+    n, k = X.shape[0], kmeans.n_clusters
+    sizes = np.bincount(kmeans.labels_, minlength=k)
+    overall_mean = np.asarray(X.mean(axis=0)).ravel()
+    between = (sizes * ((kmeans.cluster_centers_ - overall_mean) ** 2).sum(axis=1)).sum()
+    within = kmeans.inertia_
+    if within == 0 or k < 2:
+        return 0.0
+    return float(between * (n - k) / (within * (k - 1)))
+
+def fit_k_candidate(X, k, criterion="silhouette", sample_size=2000, n_init=3, batch_size=1024, random_state=42):
+    """Fit and score one candidate k (runs in a worker process)"""
+    kmeans = MiniBatchKMeans(n_clusters=k, random_state=random_state, n_init=n_init, batch_size=batch_size)
+    kmeans.fit(X)
+    if len(np.unique(kmeans.labels_)) < 2:
+        return k, -np.inf, kmeans
+    if criterion == "calinski_harabasz":
+        score = calinski_harabasz_sparse(X, kmeans)
+    else:
+        # Sampled silhouette: O(sample_size^2) instead of O(n^2), works on sparse X
+        score = silhouette_score(
+            X, kmeans.labels_,
+            sample_size=min(sample_size, X.shape[0]),
+            random_state=random_state
+        )
+    return k, score, kmeans
+
+def select_kmeans(X, K_range=range(3, 10), criterion="silhouette", sample_size=2000, n_init=3, n_jobs=-1):
+    """
+    Parallel model selection over K_range.
+    Every k is fitted in its own process; the winning fitted model is kept
+    (no refit). X may be a sparse matrix and is never densified.
+    Returns (model, {k: criterion score}); failed fits (one cluster) are left out.
+    """
+    results = Parallel(n_jobs=n_jobs)(
+        delayed(fit_k_candidate)(X, k, criterion=criterion, sample_size=sample_size, n_init=n_init)
+        for k in K_range
     )
+    results = sorted((r for r in results if np.isfinite(r[1])), key=lambda r: r[0])
+    if not results:
+        raise ValueError(f"no k in {list(K_range)} gave more than one cluster")
+    scores = {k: score for k, score, _ in results}
+    best_k, best_score, best_model = max(results, key=lambda r: r[1])
+    return best_model, scores
+
+def text_clustering(df, n_clusters=5, criterion="silhouette", X=None, vectorizer=None):
+    """Cluster tickets based on conversation text (pass X/vectorizer from featurize() to reuse features)"""
+    print("\n[CLUSTERING] Performing text-based clustering...")
     
-    X = vectorizer.fit_transform(df['conversation'])
+    texts = df['conversation'].tolist()
+    if X is None:
+        X, vectorizer = featurize(texts)
     
-    # Try different cluster numbers and find optimal
-    silhouette_scores = []
+    # Try different cluster numbers in parallel and keep the best fitted model
     K_range = range(3, 10)
+    kmeans, scores = select_kmeans(X, K_range, criterion=criterion)
+    for k, score in scores.items():
+        print(f"  k={k}: {criterion} = {score:.3f}")
+    optimal_k = kmeans.n_clusters
+    print(f"[RESULT] Optimal number of clusters: {optimal_k} ({criterion})")
     
-    for k in K_range:
-        kmeans = MiniBatchKMeans(n_clusters=k, random_state=42, n_init=10, batch_size=100)
-        labels = kmeans.fit_predict(X)
-        score = silhouette_score(X, labels)
-        silhouette_scores.append(score)
-    
-    # Use optimal k
-    optimal_k = K_range[np.argmax(silhouette_scores)]
-    print(f"[RESULT] Optimal number of clusters: {optimal_k}")
-    
-    # Final clustering
-    kmeans = MiniBatchKMeans(n_clusters=optimal_k, random_state=42, n_init=10, batch_size=100)
-    df['text_cluster'] = kmeans.fit_predict(X)
+    df['text_cluster'] = kmeans.labels_
     
     # Get top terms per cluster
-    order_centroids = kmeans.cluster_centers_.argsort()[:, ::-1]
-    terms = vectorizer.get_feature_names_out()
-    
     print("\n[PATTERNS] Discovered Patterns (Top Keywords per Cluster):")
     cluster_names = []
-    for i in range(optimal_k):
-        top_terms = [terms[ind] for ind in order_centroids[i, :5]]
-        cluster_name = " + ".join(top_terms[:2])
+    for i, terms in enumerate(top_terms(vectorizer, kmeans.cluster_centers_, texts)):
+        cluster_name = " + ".join(terms[:2])
         cluster_names.append(cluster_name)
-        print(f"  Cluster {i}: {', '.join(top_terms)}")
+        print(f"  Cluster {i}: {', '.join(terms)}")
+    
+    return df, scores, cluster_names
+
+def stream_text_clustering(filepath, n_clusters=8, chunksize=50_000,
+                           output_path="tickets_with_clusters_stream.csv"):
+    """
+    Out-of-core clustering for ticket files too big for RAM.
+    Pass 1 accumulates document frequencies, pass 2 partial-fits
+    MiniBatchKMeans on hashed TF-IDF chunks, pass 3 labels each chunk and
+    appends it to output_path. Memory is bounded by chunksize.
+    """
+    print(f"\n[STREAM] Clustering {filepath} in chunks of {chunksize}...")
+    vectorizer = StreamingTfidf()
+    for chunk in pd.read_csv(filepath, usecols=['conversation'], chunksize=chunksize):
+        vectorizer.partial_fit(chunk['conversation'].fillna('').tolist())
+    print(f"[STREAM] Pass 1: document frequencies from {vectorizer.n_docs} tickets")
+    
+    # The first partial_fit needs at least n_clusters rows: buffer small chunks until then
+    kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, batch_size=1024, n_init=3)
+    fitted, pending = False, []
+    for chunk in pd.read_csv(filepath, usecols=['conversation'], chunksize=chunksize):
+        pending.append(vectorizer.transform(chunk['conversation'].fillna('').tolist()))
+        if fitted or sum(X.shape[0] for X in pending) >= n_clusters:
+            kmeans.partial_fit(sparse.vstack(pending).tocsr())
+            fitted, pending = True, []
+    if not fitted:
+        raise ValueError(f"{filepath} has {vectorizer.n_docs} tickets, fewer than --clusters {n_clusters}")
+    print(f"[STREAM] Pass 2: partial-fit {n_clusters} clusters")
+    
+    sample = []
+    for i, chunk in enumerate(pd.read_csv(filepath, chunksize=chunksize)):
+        texts = chunk['conversation'].fillna('').tolist()
+        chunk['text_cluster'] = kmeans.predict(vectorizer.transform(texts))
+        chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        if len(sample) < 10_000:
+            sample.extend(texts[:10_000 - len(sample)])
+    print(f"[STREAM] Pass 3: labels written to {output_path}")
     
-    return df, silhouette_scores, cluster_names
+    print("\n[PATTERNS] Discovered Patterns (Top Keywords per Cluster):")
+    cluster_names = []
+    for i, terms in enumerate(top_terms(vectorizer, kmeans.cluster_centers_, sample)):
+        cluster_names.append(" + ".join(terms[:2]))
+        print(f"  Cluster {i}: {', '.join(terms)}")
+    return kmeans, vectorizer, cluster_names
 
-def visualize_clusters(df, cluster_names):
-    """Visualize clusters with PCA"""
+def visualize_clusters(df, cluster_names, X=None):
+    """Visualize clusters with PCA (reuses the clustering features when X is given)"""
     print("\n[VISUAL] Creating visualizations...")
     
     # Prepare features for PCA
-    vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-    X = vectorizer.fit_transform(df['conversation'])
+    if X is None:
+        X, _ = featurize(df['conversation'].tolist())
     
-    # PCA for 2D visualization
-    pca = PCA(n_components=2, random_state=42)
-    coords = pca.fit_transform(X.toarray())
+    # PCA for 2D visualization; wide hashed matrices use TruncatedSVD to stay sparse
+    if X.shape[1] <= 10_000:
+        pca = PCA(n_components=2, random_state=42)
+        coords = pca.fit_transform(X.toarray())
+    else:
+        svd = TruncatedSVD(n_components=2, random_state=42)
+        coords = svd.fit_transform(X)
     
     df['pca_x'] = coords[:, 0]
     df['pca_y'] = coords[:, 1]
@@ -247,18 +416,34 @@ def generate_insights(df):
 
 def main():
     """Run complete analysis"""
+    parser = argparse.ArgumentParser(description="Customer Support Ticket Analysis - POC")
+    parser.add_argument("--features", choices=["tfidf", "hashing"], default="tfidf",
+                        help="hashing = vocabulary-free TF-IDF with incremental IDF")
+    parser.add_argument("--stream", metavar="CSV",
+                        help="cluster a CSV too big for RAM chunk by chunk (hashing features)")
+    parser.add_argument("--clusters", type=int, default=8, help="cluster count for --stream")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("Customer Support Ticket Analysis - POC")
     print("=" * 60)
     
+    if args.stream:
+        stream_text_clustering(args.stream, n_clusters=args.clusters, chunksize=args.chunksize)
+        return
+    
     # Load data
     df = load_data()
     
+    # Vectorize once, shared by clustering and the PCA projection
+    X, vectorizer = featurize(df['conversation'].tolist(), mode=args.features, chunksize=args.chunksize)
+    
     # Perform clustering
-    df, silhouette_scores, cluster_names = text_clustering(df)
+    df, scores, cluster_names = text_clustering(df, X=X, vectorizer=vectorizer)
     
     # Visualize
-    visualize_clusters(df, cluster_names)
+    visualize_clusters(df, cluster_names, X=X)
     
     # Generate insights
     generate_insights(df)
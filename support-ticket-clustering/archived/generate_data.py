@@ -1,7 +1,9 @@
 """
 Generate synthetic customer support ticket data
 """
+import argparse
 import pandas as pd
+import numpy as np
 import random
 from datetime import datetime, timedelta
 
@@ -58,21 +60,38 @@ TICKET_TEMPLATES = {
     ],
 }
 
+# Weight topics to create realistic distribution
+TOPIC_WEIGHTS = [0.25, 0.20, 0.10, 0.15, 0.12, 0.10, 0.08]  # Login & Payment most common
+
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+PRIORITY_WEIGHTS = [0.3, 0.4, 0.25, 0.05]
+
+STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+STATUS_WEIGHTS = [0.15, 0.25, 0.40, 0.20]
+
+# Resolution time range (hours) per priority, same order as PRIORITIES
+RESOLUTION_HOURS = [(24, 120), (12, 48), (2, 12), (0.5, 4)]
+
+FOLLOW_UPS = [
+    " Urgent - this is blocking our business operations.",
+    " This has been happening for 3 days now.",
+    " Please escalate to senior support.",
+    " Tried all troubleshooting steps already.",
+    " Multiple users affected by this issue.",
+]
+
 def generate_tickets(num_tickets=100, num_days=5):
     """Generate synthetic support tickets"""
     
     tickets = []
     start_date = datetime.now() - timedelta(days=num_days)
     
-    # Weight topics to create realistic distribution
     topics = list(TICKET_TEMPLATES.keys())
-    weights = [0.25, 0.20, 0.10, 0.15, 0.12, 0.10, 0.08]  # Login & Payment most common
-    
-    priorities = ["Low", "Medium", "High", "Critical"]
-    priority_weights = [0.3, 0.4, 0.25, 0.05]
-    
-    statuses = ["Open", "In Progress", "Resolved", "Closed"]
-    status_weights = [0.15, 0.25, 0.40, 0.20]
+    weights = TOPIC_WEIGHTS
+    priorities = PRIORITIES
+    priority_weights = PRIORITY_WEIGHTS
+    statuses = STATUSES
+    status_weights = STATUS_WEIGHTS
     
     for i in range(num_tickets):
         # Random day within the 5-day period
@@ -90,14 +109,7 @@ def generate_tickets(num_tickets=100, num_days=5):
         
         # Add some variation to conversations
         if random.random() < 0.3:
-            follow_ups = [
-                " Urgent - this is blocking our business operations.",
-                " This has been happening for 3 days now.",
-                " Please escalate to senior support.",
-                " Tried all troubleshooting steps already.",
-                " Multiple users affected by this issue.",
-            ]
-            conversation += random.choice(follow_ups)
+            conversation += random.choice(FOLLOW_UPS)
         
         priority = random.choices(priorities, weights=priority_weights)[0]
         status = random.choices(statuses, weights=status_weights)[0]
@@ -137,13 +149,98 @@ def generate_tickets(num_tickets=100, num_days=5):
     
     return pd.DataFrame(tickets)
 
+def generate_tickets_vectorized(num_tickets=100_000, num_days=30, seed=None,
+                                datetime_format="%Y-%m-%d %H:%M:%S"):
+    """
+    Vectorized version of generate_tickets (same columns and distributions).
+    Every field is drawn with numpy in one shot, and strings are built by
+    indexing small lookup tables instead of formatting row by row, so
+    millions of tickets take seconds instead of minutes.
+    """
+    rng = np.random.default_rng(seed)
+    n = num_tickets
+    
+    # Conversations: flatten all (template, follow-up) combinations once
+    topics = np.array(list(TICKET_TEMPLATES.keys()))
+    templates = [t for topic in topics for t in TICKET_TEMPLATES[topic]]
+    lengths = np.array([len(TICKET_TEMPLATES[topic]) for topic in topics])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    suffixes = [""] + FOLLOW_UPS
+    conversations = np.array([t + suffix for t in templates for suffix in suffixes], dtype=object)
+    
+    topic_idx = rng.choice(len(topics), size=n, p=TOPIC_WEIGHTS)
+    template_idx = offsets[topic_idx] + (rng.random(n) * lengths[topic_idx]).astype(np.int64)
+    suffix_idx = np.where(rng.random(n) < 0.3, rng.integers(1, len(suffixes), size=n), 0)
+    conversation = conversations[template_idx * len(suffixes) + suffix_idx]
+    
+    # Timestamps: business hours 9am-6pm, formatted through a per-minute lookup table
+    start_date = (datetime.now() - timedelta(days=num_days)).replace(hour=9, minute=0, second=0, microsecond=0)
+    slots_per_day = 9 * 60
+    slot = rng.integers(0, num_days, size=n) * slots_per_day + rng.integers(0, slots_per_day, size=n)
+    all_slots = np.arange(num_days * slots_per_day)
+    slot_times = (pd.Timestamp(start_date)
+                  + pd.to_timedelta(all_slots // slots_per_day, unit="D")
+                  + pd.to_timedelta(all_slots % slots_per_day, unit="min"))
+    created_at = slot_times.strftime(datetime_format).to_numpy(dtype=object)[slot]
+    
+    priority_idx = rng.choice(len(PRIORITIES), size=n, p=PRIORITY_WEIGHTS)
+    status_idx = rng.choice(len(STATUSES), size=n, p=STATUS_WEIGHTS)
+    resolved = np.isin(status_idx, [STATUSES.index("Resolved"), STATUSES.index("Closed")])
+    
+    # Resolution time (in hours) - varies by priority
+    low = np.array([r[0] for r in RESOLUTION_HOURS])[priority_idx]
+    high = np.array([r[1] for r in RESOLUTION_HOURS])[priority_idx]
+    resolution_time = np.where(resolved, rng.uniform(low, high), np.nan)
+    
+    # Satisfaction correlates with resolution time
+    rated = resolved & (rng.random(n) < 0.8)
+    satisfaction = np.where(resolution_time < 24, rng.integers(4, 6, size=n), rng.integers(2, 5, size=n))
+    satisfaction = np.where(rated, satisfaction, np.nan)
+    
+    return pd.DataFrame({
+        "ticket_id": "TKT-" + pd.Series(np.arange(1000, 1000 + n)).astype(str),
+        "created_at": created_at,
+        "topic": topics[topic_idx],
+        "priority": np.array(PRIORITIES)[priority_idx],
+        "status": np.array(STATUSES)[status_idx],
+        "conversation": conversation,
+        "resolution_time_hours": resolution_time,
+        "customer_satisfaction": satisfaction,
+    })
+
+def generate_advanced_tickets(num_tickets=100_000, num_days=30, seed=None):
+    """Minimal 3-column format read by analyze_advanced.py (DD/MM/YYYY HH:MM)"""
+    df = generate_tickets_vectorized(num_tickets, num_days, seed=seed, datetime_format="%d/%m/%Y %H:%M")
+    return df[["ticket_id", "created_at", "conversation"]]
+
 if __name__ == "__main__":
-    df = generate_tickets(100, 5)
-    df.to_csv("support_tickets.csv", index=False)
-    print(f"[OK] Generated {len(df)} tickets")
-    print(f"\n[STATS] Topic Distribution:")
-    print(df['topic'].value_counts())
-    print(f"\n[STATS] Priority Distribution:")
-    print(df['priority'].value_counts())
-    print(f"\n[STATS] Status Distribution:")
-    print(df['status'].value_counts())
+    parser = argparse.ArgumentParser(description="Generate synthetic support tickets")
+    parser.add_argument("--num-tickets", type=int, default=100)
+    parser.add_argument("--num-days", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--vectorized", action="store_true",
+                        help="use the numpy generator (recommended above ~10k tickets)")
+    parser.add_argument("--advanced", action="store_true",
+                        help="write the 3-column format used by analyze_advanced.py")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+    
+    if args.advanced:
+        df = generate_advanced_tickets(args.num_tickets, args.num_days, seed=args.seed)
+        output = args.output or "support_tickets_advanced.csv"
+        df.to_csv(output, index=False)
+        print(f"[OK] Generated {len(df)} tickets -> {output}")
+    else:
+        if args.vectorized:
+            df = generate_tickets_vectorized(args.num_tickets, args.num_days, seed=args.seed)
+        else:
+            df = generate_tickets(args.num_tickets, args.num_days)
+        output = args.output or "support_tickets.csv"
+        df.to_csv(output, index=False)
+        print(f"[OK] Generated {len(df)} tickets")
+        print(f"\n[STATS] Topic Distribution:")
+        print(df['topic'].value_counts())
+        print(f"\n[STATS] Priority Distribution:")
+        print(df['priority'].value_counts())
+        print(f"\n[STATS] Status Distribution:")
+        print(df['status'].value_counts())
@@ -0,0 +1,198 @@
+"""
+Benchmark suite for the Phase 2 pipeline (analyze_advanced.py)
+Times every stage across dataset sizes and core counts on synthetic tickets
+and writes a machine-readable JSON report for regression tracking.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 100000 --cores 1 4
+    python benchmark.py --sizes 5000 --cores 1 --skip bertopic visualize
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE / "archived"))
+
+STAGES = ["load", "embed", "cluster", "umap", "bertopic", "visualize", "insights"]
+
+# Every library that spins up its own thread pool, set before the worker imports anything
+THREAD_ENV_VARS = [
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    "NUMBA_NUM_THREADS",
+]
+
+def peak_rss_mb():
+    """Peak resident memory of this process (None where unsupported, e.g. Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def run_stages(data_path, skip=(), model_name="all-MiniLM-L6-v2"):
+    """Run the pipeline stage by stage in the current process and time each one"""
+    import analyze_advanced as aa
+
+    timings = {}
+
+    @contextlib.contextmanager
+    def stage(name):
+        start = time.perf_counter()
+        yield
+        timings[name] = round(time.perf_counter() - start, 4)
+
+    workdir = Path(tempfile.mkdtemp(prefix="ticket_bench_"))
+    # Stage output (prints, PNGs, cache) stays out of the report and the repo
+    with contextlib.redirect_stdout(io.StringIO()):
+        with stage("load"):
+            df = aa.load_data(data_path)
+        texts = df['conversation'].tolist()
+
+        with stage("embed"):
+            embeddings = aa.generate_embeddings(texts, model_name=model_name)
+
+        with stage("cluster"):
+            clusters = aa.cluster_hdbscan(embeddings, min_cluster_size=3)
+
+        with stage("umap"):
+            reduction = aa.shared_reduction(embeddings, cache_dir=workdir / ".cache",
+                                            topics="bertopic" not in skip and aa.BERTOPIC_AVAILABLE)
+
+        topic_model, topics = None, None
+        if "bertopic" not in skip and aa.BERTOPIC_AVAILABLE:
+            with stage("bertopic"):
+                topic_model, topics = aa.bertopic_modeling(texts, embeddings, reduction)
+
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            if "visualize" not in skip:
+                with stage("visualize"):
+                    aa.visualize_advanced(df, reduction['embeddings_2d'], clusters, topics)
+                    aa.plt.close('all')
+
+            df['cluster'] = clusters
+            df['hour'] = df['created_at'].dt.hour
+            df['date'] = df['created_at'].dt.date
+            if topics is not None:
+                df['topic'] = topics
+            if "insights" not in skip:
+                with stage("insights"):
+                    aa.generate_insights(df, topic_model)
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "stages": timings,
+        "total": round(sum(timings.values()), 4),
+        "n_clusters": int(len(set(clusters)) - (1 if -1 in clusters else 0)),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def run_worker(data_path, cores, skip, model_name):
+    """Run one (size, cores) configuration in a fresh interpreter with pinned thread pools"""
+    env = os.environ.copy()
+    for var in THREAD_ENV_VARS:
+        env[var] = str(cores)
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", str(data_path),
+           "--model", model_name, "--skip", *skip]
+    proc = subprocess.run(cmd, env=env, capture_output=True, text=True, cwd=HERE)
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "worker failed"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def environment_info():
+    """Metadata needed to compare reports across machines and commits"""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": {},
+    }
+    for pkg in ["numpy", "pandas", "scikit-learn", "umap-learn", "bertopic", "sentence-transformers", "torch"]:
+        try:
+            from importlib.metadata import version
+            info["packages"][pkg] = version(pkg)
+        except Exception:
+            info["packages"][pkg] = None
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=HERE
+        ).stdout.strip() or None
+    except OSError:
+        info["git_commit"] = None
+    return info
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the advanced ticket clustering pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--cores", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--days", type=int, default=30, help="time span of the synthetic tickets")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["bertopic", "visualize", "insights"])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--worker", metavar="CSV", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_stages(args.worker, skip=args.skip, model_name=args.model)))
+        return
+
+    from generate_data import generate_advanced_tickets
+
+    print("=" * 70)
+    print("PHASE 2 BENCHMARK")
+    print(f"Sizes: {args.sizes} | Cores: {args.cores}")
+    print("=" * 70)
+
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="ticket_data_") as tmp:
+        for size in args.sizes:
+            start = time.perf_counter()
+            data_path = Path(tmp) / f"tickets_{size}.csv"
+            generate_advanced_tickets(size, args.days, seed=args.seed).to_csv(data_path, index=False)
+            print(f"\n[DATA] {size} tickets generated in {time.perf_counter() - start:.2f}s")
+
+            for cores in args.cores:
+                result = run_worker(data_path, cores, args.skip, args.model)
+                result.update({"size": size, "cores": cores})
+                runs.append(result)
+                if "error" in result:
+                    print(f"  [ERROR] cores={cores}: {result['error']}")
+                    continue
+                stages = ", ".join(f"{k}={v:.2f}s" for k, v in result["stages"].items())
+                print(f"  [RESULT] cores={cores}: total={result['total']:.2f}s ({stages})")
+
+    report = {
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "config": {"sizes": args.sizes, "cores": args.cores, "days": args.days,
+                   "skip": args.skip, "model": args.model, "seed": args.seed},
+        "stages": STAGES,
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n[OK] Saved benchmark report: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Compact embedding storage for ticket vectors
+float16 (2x smaller), int8 scalar quantization (4x) or product quantization
+(PQ, 32x for 384-dim vectors), read back through memory-mapped .npy files so
+millions of embeddings never have to sit in RAM as float32.
+
+Usage:
+    python embedding_store.py embeddings.npy --methods float16 int8 pq
+"""
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+METHODS = ["float16", "int8", "pq"]
+STORE_FILES = ["meta.json", "codes.npy", "norms.npy"]
+METHOD_FILES = {"float16": [], "int8": ["scale.npy"], "pq": ["codebooks.npy"]}
+BLOCK_SIZE = 65536
+
+def _write_codes(path, shape, dtype, encode_block, embeddings):
+    """Encode block by block straight into a memory-mapped .npy file"""
+    codes = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    for start in range(0, len(embeddings), BLOCK_SIZE):
+        block = np.asarray(embeddings[start:start + BLOCK_SIZE], dtype=np.float32)
+        codes[start:start + len(block)] = encode_block(block)
+    codes.flush()
+    del codes
+
+def train_pq(embeddings, n_subvectors=48, n_centroids=256, sample_size=20_000, seed=42):
+    """Train one k-means codebook per subspace on a sample of the embeddings"""
+    from sklearn.cluster import MiniBatchKMeans
+
+    n, dim = embeddings.shape
+    if dim % n_subvectors:
+        raise ValueError(f"dimension {dim} is not divisible by n_subvectors={n_subvectors}")
+    sub_dim = dim // n_subvectors
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(embeddings[np.sort(rng.choice(n, size=min(n, sample_size), replace=False))], dtype=np.float32)
+    n_centroids = min(n_centroids, len(sample))
+
+    codebooks = np.empty((n_subvectors, n_centroids, sub_dim), dtype=np.float32)
+    for m in range(n_subvectors):
+        kmeans = MiniBatchKMeans(n_clusters=n_centroids, random_state=seed, n_init=1, batch_size=4096)
+        kmeans.fit(sample[:, m * sub_dim:(m + 1) * sub_dim])
+        codebooks[m] = kmeans.cluster_centers_
+    return codebooks
+
+def _pq_encode(block, codebooks):
+    n_subvectors, _, sub_dim = codebooks.shape
+    codes = np.empty((len(block), n_subvectors), dtype=np.uint8)
+    for m in range(n_subvectors):
+        sub = block[:, m * sub_dim:(m + 1) * sub_dim]
+        distances = (sub ** 2).sum(axis=1)[:, None] - 2 * sub @ codebooks[m].T + (codebooks[m] ** 2).sum(axis=1)[None, :]
+        codes[:, m] = distances.argmin(axis=1)
+    return codes
+
+def save_embeddings(embeddings, path, method="int8", n_subvectors=48, fingerprint=None):
+    """
+    Write embeddings (array or memmap, n x dim) to a compact store directory.
+    fingerprint is an optional string (e.g. hash of the source texts) used to
+    decide later whether the store can be reused.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    # Drop a previous store (possibly another method) so no stale scale/codebooks are left behind
+    for name in STORE_FILES + [f for files in METHOD_FILES.values() for f in files]:
+        (path / name).unlink(missing_ok=True)
+    n, dim = embeddings.shape
+    meta = {"method": method, "count": int(n), "dim": int(dim), "fingerprint": fingerprint}
+
+    if method == "float16":
+        _write_codes(path / "codes.npy", (n, dim), np.float16, lambda b: b.astype(np.float16), embeddings)
+    elif method == "int8":
+        # Symmetric per-dimension scale: x ~= codes * scale
+        scale = np.zeros(dim, dtype=np.float32)
+        for start in range(0, n, BLOCK_SIZE):
+            block = np.abs(np.asarray(embeddings[start:start + BLOCK_SIZE], dtype=np.float32))
+            scale = np.maximum(scale, block.max(axis=0))
+        scale = np.where(scale > 0, scale / 127.0, 1.0).astype(np.float32)
+        np.save(path / "scale.npy", scale)
+        _write_codes(path / "codes.npy", (n, dim), np.int8,
+                     lambda b: np.clip(np.rint(b / scale), -127, 127).astype(np.int8), embeddings)
+    else:
+        codebooks = train_pq(embeddings, n_subvectors=n_subvectors)
+        np.save(path / "codebooks.npy", codebooks)
+        meta["n_subvectors"] = int(n_subvectors)
+        _write_codes(path / "codes.npy", (n, n_subvectors), np.uint8,
+                     lambda b: _pq_encode(b, codebooks), embeddings)
+
+    store = EmbeddingStore(path, meta=meta)
+    # Norms of the decoded vectors make cosine similarity a single dot product
+    norms = np.concatenate([np.linalg.norm(block, axis=1) for _, block in store.iter_blocks()])
+    np.save(path / "norms.npy", norms.astype(np.float32))
+    with open(path / "meta.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return EmbeddingStore(path)
+
+class EmbeddingStore:
+    """
+    Memory-mapped reader for a store written by save_embeddings().
+    Codes stay on disk; decode() and iter_blocks() materialise float32
+    only for the rows requested, and search() scores directly on the codes.
+    """
+    def __init__(self, path, meta=None):
+        self.path = Path(path)
+        if meta is None:
+            with open(self.path / "meta.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        self.meta = meta
+        self.method = meta["method"]
+        self.codes = np.load(self.path / "codes.npy", mmap_mode='r')
+        self.scale = np.load(self.path / "scale.npy") if self.method == "int8" else None
+        self.codebooks = np.load(self.path / "codebooks.npy") if self.method == "pq" else None
+        norms_path = self.path / "norms.npy"
+        self.norms = np.load(norms_path, mmap_mode='r') if norms_path.exists() else None
+
+    def __len__(self):
+        return self.meta["count"]
+
+    @property
+    def dim(self):
+        return self.meta["dim"]
+
+    @property
+    def nbytes(self):
+        files = [self.path / name for name in STORE_FILES + METHOD_FILES[self.method]]
+        return sum(f.stat().st_size for f in files if f.exists())
+
+    def decode(self, rows=slice(None)):
+        """float32 vectors for the selected rows (slice or index array)"""
+        codes = self.codes[rows]
+        if self.method == "float16":
+            return codes.astype(np.float32)
+        if self.method == "int8":
+            return codes.astype(np.float32) * self.scale
+        n_subvectors = self.codebooks.shape[0]
+        return np.concatenate([self.codebooks[m][codes[:, m]] for m in range(n_subvectors)], axis=1)
+
+    def iter_blocks(self, block_size=BLOCK_SIZE):
+        for start in range(0, len(self), block_size):
+            yield start, self.decode(slice(start, start + block_size))
+
+    def _block_scores(self, start, stop, query):
+        """Dot products of query with rows [start, stop) computed on the codes"""
+        codes = self.codes[start:stop]
+        if self.method == "float16":
+            return codes.astype(np.float32) @ query
+        if self.method == "int8":
+            # x . q = codes . (scale * q): one int8 -> float32 cast, no dequantized copy
+            return codes.astype(np.float32) @ (self.scale * query)
+        # PQ asymmetric distance: per-subspace lookup table of query . centroid
+        n_subvectors, _, sub_dim = self.codebooks.shape
+        table = np.einsum('mkd,md->mk', self.codebooks, query.reshape(n_subvectors, sub_dim))
+        return table[np.arange(n_subvectors), codes].sum(axis=1)
+
+    def search(self, query, k=10, block_size=BLOCK_SIZE):
+        """Top-k cosine neighbours of one query vector: (indices, scores)"""
+        query = np.asarray(query, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1.0)
+        best_idx = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(self), block_size):
+            stop = min(start + block_size, len(self))
+            scores = self._block_scores(start, stop, query)
+            if self.norms is not None:
+                scores = scores / np.maximum(self.norms[start:stop], 1e-12)
+            idx = np.concatenate([best_idx, np.arange(start, stop)])
+            scores = np.concatenate([best_scores, scores])
+            keep = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+            best_idx, best_scores = idx[keep], scores[keep]
+        order = np.argsort(-best_scores)
+        return best_idx[order], best_scores[order]
+
+def open_store(path):
+    """EmbeddingStore if path holds a store, otherwise None"""
+    path = Path(path)
+    return EmbeddingStore(path) if (path / "meta.json").exists() else None
+
+def recall_report(embeddings, stores, k=10, n_queries=200, seed=42):
+    """
+    Accuracy of each compact store against exact float32 cosine search.
+    recall@k = overlap of the top-k neighbour sets; also reports the mean
+    absolute cosine error of the reconstructed vectors and the size ratio.
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    normed = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(len(embeddings), size=min(n_queries, len(embeddings)), replace=False)
+
+    exact = {}
+    for q in queries:
+        scores = normed @ normed[q]
+        scores[q] = -np.inf  # the query itself, even when duplicates tie with it
+        exact[q] = set(np.argpartition(-scores, k - 1)[:k].tolist())
+
+    report = {"k": k, "n_queries": int(len(queries)), "float32_bytes": int(embeddings.nbytes), "stores": {}}
+    for name, store in stores.items():
+        start = time.perf_counter()
+        recalls = []
+        for q in queries:
+            found, _ = store.search(embeddings[q], k=k + 1)
+            found = set([i for i in found.tolist() if i != q][:k])
+            recalls.append(len(found & exact[q]) / max(len(exact[q]), 1))
+        search_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        sample = np.sort(queries)
+        decoded = store.decode(sample)
+        decoded /= np.maximum(np.linalg.norm(decoded, axis=1, keepdims=True), 1e-12)
+        cosine_error = float(np.mean(np.abs(1 - (decoded * normed[sample]).sum(axis=1))))
+
+        report["stores"][name] = {
+            "method": store.method,
+            "bytes": int(store.nbytes),
+            "compression": round(embeddings.nbytes / store.nbytes, 2),
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+            "mean_cosine_error": round(cosine_error, 6),
+            "search_ms_per_query": round(search_ms, 3),
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize embeddings and report accuracy vs float32")
+    parser.add_argument("embeddings", nargs="?", default="embeddings.npy")
+    parser.add_argument("--methods", nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--out-dir", default="embedding_stores")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--report", default="embedding_recall_report.json")
+    args = parser.parse_args()
+
+    embeddings = np.load(args.embeddings, mmap_mode='r')
+    print(f"[OK] Loaded {embeddings.shape[0]} embeddings of dimension {embeddings.shape[1]} (float32)")
+
+    stores = {}
+    for method in args.methods:
+        start = time.perf_counter()
+        stores[method] = save_embeddings(embeddings, Path(args.out_dir) / method, method=method)
+        print(f"[QUANT] {method}: {stores[method].nbytes / 1e6:.2f} MB in {time.perf_counter() - start:.1f}s")
+
+    report = recall_report(embeddings, stores, k=args.k, n_queries=args.queries)
+    print(f"\n[REPORT] recall@{args.k} vs float32 ({report['float32_bytes'] / 1e6:.2f} MB):")
+    for name, row in report["stores"].items():
+        print(f"   {name:8s} {row['compression']:6.1f}x smaller  recall={row[f'recall@{args.k}']:.3f}  "
+              f"cos_err={row['mean_cosine_error']:.5f}  {row['search_ms_per_query']:.2f} ms/query")
+
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] Saved report: {args.report}")
+
+if __name__ == "__main__":
+    main()
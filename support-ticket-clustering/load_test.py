@@ -0,0 +1,107 @@
+"""
+Load test for the ticket classification service (ticket_classifier.py serve)
+Fires concurrent POST /predict requests and reports throughput and latency
+percentiles against the targets.
+
+Usage:
+    python ticket_classifier.py serve          # in another terminal
+    python load_test.py --requests 2000 --concurrency 32 --target-rps 200 --target-p99-ms 250
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+def post(url, payload, timeout=30):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode('utf-8'), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def run_load_test(url, texts, n_requests=1000, concurrency=16, batch=1):
+    """Send n_requests (each carrying `batch` texts) from `concurrency` threads; return latencies in ms"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def one(i):
+        chunk = [texts[(i * batch + j) % len(texts)] for j in range(batch)]
+        payload = {"text": chunk[0]} if batch == 1 else {"texts": chunk}
+        start = time.perf_counter()
+        try:
+            post(url, payload)
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(n_requests)))
+    wall = time.perf_counter() - start
+    return np.array(latencies), errors, wall
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the ticket classification service")
+    parser.add_argument("--url", default="http://127.0.0.1:8765/predict")
+    parser.add_argument("--data", default="support_tickets_advanced.csv")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1, help="texts per request")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--target-rps", type=float, default=100, help="tickets/sec")
+    parser.add_argument("--target-p99-ms", type=float, default=250)
+    parser.add_argument("--output", default="load_test_report.json")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.data)['conversation'].astype(str).tolist()
+    print(f"[OK] Loaded {len(texts)} ticket texts from {args.data}")
+
+    run_load_test(args.url, texts, n_requests=args.warmup, concurrency=min(args.concurrency, args.warmup))
+    print(f"[LOAD] {args.requests} requests x {args.batch} tickets, concurrency={args.concurrency}...")
+    latencies, errors, wall = run_load_test(args.url, texts, args.requests, args.concurrency, args.batch)
+
+    if len(latencies) == 0:
+        print(f"[ERROR] All requests failed, e.g. {errors[0] if errors else 'unknown'}")
+        sys.exit(1)
+
+    throughput = len(latencies) * args.batch / wall
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    report = {
+        "url": args.url,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "batch": args.batch,
+        "errors": len(errors),
+        "wall_seconds": round(wall, 3),
+        "tickets_per_second": round(throughput, 1),
+        "latency_ms": {"p50": round(p50, 2), "p95": round(p95, 2), "p99": round(p99, 2),
+                       "max": round(float(latencies.max()), 2)},
+        "targets": {"tickets_per_second": args.target_rps, "p99_ms": args.target_p99_ms},
+        "passed": bool(throughput >= args.target_rps and p99 <= args.target_p99_ms and not errors),
+    }
+
+    print(f"[RESULT] Throughput: {throughput:.1f} tickets/s (target {args.target_rps})")
+    print(f"[RESULT] Latency p50={p50:.1f}ms p95={p95:.1f}ms p99={p99:.1f}ms (target p99 {args.target_p99_ms}ms)")
+    if errors:
+        print(f"[WARNING] {len(errors)} failed requests, e.g. {errors[0]}")
+    print(f"[{'PASS' if report['passed'] else 'FAIL'}] Targets {'met' if report['passed'] else 'missed'}")
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[OK] Saved load test report: {args.output}")
+    if not report["passed"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Phase 3: Ticket auto-tagging service
+Trains a fast classifier on the clusters/topics discovered by analyze_advanced.py
+and serves batched predictions with a warm embedding model.
+
+Usage:
+    python ticket_classifier.py train --label cluster --kind centroid
+    python ticket_classifier.py serve --port 8765
+    type new_tickets.jsonl | python ticket_classifier.py stdin > tagged.jsonl
+"""
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = "ticket_classifier.joblib"
+
+def load_training_data(csv_path="tickets_advanced_clustered.csv", embeddings_path="embeddings.npy", label="cluster"):
+    """Embeddings + labels from the Phase 2 output, noise (-1) removed"""
+    df = pd.read_csv(csv_path)
+    embeddings = np.load(embeddings_path)
+    if len(df) != len(embeddings):
+        raise ValueError(f"{csv_path} has {len(df)} rows but {embeddings_path} has {len(embeddings)} vectors")
+    if label not in df.columns:
+        raise ValueError(f"column '{label}' not found in {csv_path}")
+
+    y = df[label].to_numpy()
+    keep = y != -1
+    print(f"[OK] Loaded {keep.sum()} labelled tickets ({(~keep).sum()} noise dropped), {len(np.unique(y[keep]))} classes")
+    return embeddings[keep].astype(np.float32), y[keep]
+
+class CentroidClassifier:
+    """Nearest class centroid under cosine similarity: one matrix product per batch"""
+    def fit(self, X, y):
+        self.classes_ = np.unique(y)
+        centroids = np.array([X[y == c].mean(axis=0) for c in self.classes_])
+        self.centroids_ = centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        return self
+
+    def decision_function(self, X):
+        X = X / np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+        return X @ self.centroids_.T
+
+    def predict(self, X):
+        return self.classes_[self.decision_function(X).argmax(axis=1)]
+
+def train_classifier(X, y, kind="centroid", test_size=0.2, seed=42):
+    """Fit a centroid or linear (logistic regression) classifier and report holdout accuracy"""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+
+    def build():
+        if kind == "linear":
+            return LogisticRegression(max_iter=1000)
+        return CentroidClassifier()
+
+    counts = pd.Series(y).value_counts()
+    n_test = int(np.ceil(test_size * len(y)))
+    if counts.min() >= 2 and len(counts) <= n_test <= len(y) - len(counts):
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=seed, stratify=y)
+        accuracy = float((build().fit(X_train, y_train).predict(X_test) == y_test).mean())
+        print(f"[METRIC] Holdout accuracy ({kind}): {accuracy:.3f}")
+    else:
+        print("[INFO] Too few tickets per class for a holdout split, skipping evaluation")
+
+    start = time.perf_counter()
+    classifier = build().fit(X, y)
+    print(f"[OK] Trained {kind} classifier on {len(y)} tickets in {time.perf_counter() - start:.2f}s")
+    return classifier
+
+class TicketClassifier:
+    """Loaded classifier + embedding model, kept warm for the lifetime of the process"""
+    def __init__(self, model_path=MODEL_PATH):
+        from sentence_transformers import SentenceTransformer
+
+        bundle = joblib.load(model_path)
+        self.classifier = bundle['classifier']
+        self.label = bundle['label']
+        self.model_name = bundle['model_name']
+        print(f"[LOAD] {bundle['kind']} classifier on '{self.label}' ({len(self.classifier.classes_)} classes)")
+        self.encoder = SentenceTransformer(self.model_name)
+        # Warm-up pass so the first real request doesn't pay for lazy initialisation
+        self.encoder.encode(["warm up"], show_progress_bar=False)
+        print(f"[OK] Embedding model ready: {self.model_name}")
+
+    def predict_batch(self, texts):
+        embeddings = self.encoder.encode(texts, batch_size=64, show_progress_bar=False)
+        scores = self.classifier.decision_function(embeddings)
+        if scores.ndim == 1:
+            # Binary linear model: one margin per sample
+            scores = np.column_stack([-scores, scores])
+        best = scores.argmax(axis=1)
+        return [
+            {self.label: self.classifier.classes_[i].item(), "score": round(float(s[i]), 4)}
+            for i, s in zip(best, scores)
+        ]
+
+class MicroBatcher:
+    """
+    Collects concurrent requests into one encode call.
+    A batch is flushed when it reaches max_batch texts or the oldest
+    text has waited max_wait_ms, whichever comes first.
+    """
+    def __init__(self, predict_batch, max_batch=64, max_wait_ms=5):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def submit(self, texts):
+        futures = []
+        for text in texts:
+            future = Future()
+            self.queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = self.predict_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+def make_handler(batcher, timeout=30):
+    class PredictHandler(BaseHTTPRequestHandler):
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                avg = batcher.items / batcher.batches if batcher.batches else 0
+                self._send(200, {"status": "ok", "batches": batcher.batches, "avg_batch_size": round(avg, 2)})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._send(404, {"error": "not found"})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                texts = payload["texts"] if "texts" in payload else [payload["text"]]
+            except (ValueError, KeyError, TypeError):
+                self._send(400, {"error": "expected JSON body with 'text' or 'texts'"})
+                return
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                self._send(400, {"error": "'text' must be a string and 'texts' a list of strings"})
+                return
+            try:
+                results = [f.result(timeout=timeout) for f in batcher.submit(texts)]
+            except Exception as e:
+                self._send(500, {"error": str(e)})
+                return
+            self._send(200, {"predictions": results} if "texts" in payload else results[0])
+
+        def log_message(self, format, *args):
+            pass
+
+    return PredictHandler
+
+class TicketHTTPServer(ThreadingHTTPServer):
+    # The default listen backlog (5) turns bursts of concurrent connects into 1s SYN retries
+    request_queue_size = 128
+    daemon_threads = True
+
+def serve(model_path=MODEL_PATH, host="127.0.0.1", port=8765, max_batch=64, max_wait_ms=5):
+    """HTTP service: POST /predict {"text": ...} or {"texts": [...]}, GET /health"""
+    service = TicketClassifier(model_path)
+    batcher = MicroBatcher(service.predict_batch, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    server = TicketHTTPServer((host, port), make_handler(batcher))
+    print(f"[SERVE] Listening on http://{host}:{port}/predict (max_batch={max_batch}, max_wait={max_wait_ms}ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INFO] Shutting down")
+    finally:
+        server.server_close()
+
+def tag_stream(model_path=MODEL_PATH, batch_size=64, infile=sys.stdin, outfile=sys.stdout):
+    """JSONL in ({"text": ...} per line, or plain text lines), JSONL out with the prediction merged in"""
+    service = TicketClassifier(model_path)
+    records = []
+
+    def flush():
+        for record, result in zip(records, service.predict_batch([r["text"] for r in records])):
+            outfile.write(json.dumps({**record, **result}) + "\n")
+        outfile.flush()
+        records.clear()
+
+    for line in infile:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        records.append(record if isinstance(record, dict) and "text" in record else {"text": line})
+        if len(records) >= batch_size:
+            flush()
+    if records:
+        flush()
+
+def main():
+    parser = argparse.ArgumentParser(description="Auto-tag support tickets with the discovered clusters/topics")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    train = sub.add_parser("train", help="train on tickets_advanced_clustered.csv + embeddings.npy")
+    train.add_argument("--csv", default="tickets_advanced_clustered.csv")
+    train.add_argument("--embeddings", default="embeddings.npy")
+    train.add_argument("--label", default="cluster", choices=["cluster", "topic"])
+    train.add_argument("--kind", default="centroid", choices=["centroid", "linear"])
+    train.add_argument("--embedding-model", default="all-MiniLM-L6-v2",
+                       help="must match the model that produced embeddings.npy")
+
+    srv = sub.add_parser("serve", help="local HTTP prediction service")
+    srv.add_argument("--host", default="127.0.0.1")
+    srv.add_argument("--port", type=int, default=8765)
+    srv.add_argument("--max-batch", type=int, default=64)
+    srv.add_argument("--max-wait-ms", type=float, default=5)
+
+    stream = sub.add_parser("stdin", help="tag JSONL from stdin to stdout")
+    stream.add_argument("--batch-size", type=int, default=64)
+
+    for p in (train, srv, stream):
+        p.add_argument("--model", default=MODEL_PATH, help="classifier file")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        # Train via the importable module so the pickled classifier isn't bound to __main__
+        import ticket_classifier
+        X, y = load_training_data(args.csv, args.embeddings, args.label)
+        classifier = ticket_classifier.train_classifier(X, y, kind=args.kind)
+        joblib.dump({
+            'classifier': classifier,
+            'kind': args.kind,
+            'label': args.label,
+            'model_name': args.embedding_model,
+        }, args.model)
+        print(f"[OK] Saved classifier: {args.model}")
+    elif args.command == "serve":
+        serve(args.model, args.host, args.port, args.max_batch, args.max_wait_ms)
+    else:
+        # Progress output goes to stderr so stdout stays valid JSONL
+        sys.stdout, stdout = sys.stderr, sys.stdout
+        tag_stream(args.model, args.batch_size, outfile=stdout)
+
+if __name__ == "__main__":
+    main()